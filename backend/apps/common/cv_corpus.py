@@ -0,0 +1,478 @@
+"""
+Synthetic CV text corpus for benchmarking and regression-checking CV extraction.
+
+CVs are generated deterministically from a seed, so a corpus can be recreated
+anywhere from its seed and size instead of being checked in. Header spelling,
+section order and entry formats vary between CVs to exercise the different
+patterns the extractors understand.
+
+Usage:
+    from apps.common.cv_corpus import generate_cv_texts
+    texts = generate_cv_texts(count=100, seed=42)
+
+``docx_bytes`` and ``pdf_bytes`` render a text as a DOCX or a plain text PDF,
+``docx_layout_bytes`` as a DOCX with page headers and tables,
+``scanned_pdf_bytes`` as an image-only PDF and ``partly_scanned_pdf_bytes``
+as a scanned cover page followed by text pages, so the file parsing and OCR
+paths can be exercised too. ``page_images`` renders the scanned pages
+themselves and ``phone_photo`` turns one into what a phone camera delivers.
+``decompression_bomb_pdf_bytes`` and ``slow_text_pdf_bytes`` are hostile
+PDFs, small files that take a lot of memory or CPU time to read.
+
+``generate_labelled_cvs`` also returns the facts each CV states (name, jobs,
+licenses, flight hours, ...), and ``write_corpus`` saves a labelled corpus as
+files in several formats with a ``manifest.json`` of the ground truth, for
+``manage.py benchmark_cv_extraction``.
+"""
+import io
+import json
+import os
+import random
+import zlib
+
+import docx
+from faker import Faker
+
+AIRLINES = [
+    'Kenya Airways', 'Ethiopian Airlines', 'Emirates', 'Qatar Airways', 'RwandAir',
+    'Jambojet', 'Safarilink Aviation', 'Air Tanzania', 'Uganda Airlines', 'Fly540'
+]
+POSITIONS = [
+    'Captain', 'First Officer', 'Senior First Officer', 'Flight Instructor',
+    'Cabin Crew', 'Aircraft Maintenance Engineer', 'Flight Dispatcher', 'Ground Operations Supervisor'
+]
+DEGREES = [
+    'Bachelor of Science in Aeronautical Engineering', 'Diploma in Aviation Management',
+    'Master of Business Administration', 'Bachelor of Arts in Economics',
+    'Certificate in Air Traffic Control', 'BSc Aviation Technology'
+]
+INSTITUTIONS = [
+    'University of Nairobi', 'Kenya School of Flying', 'East African School of Aviation',
+    'Jomo Kenyatta University', 'Embry-Riddle Aeronautical University', 'Moi University'
+]
+LICENSES = [
+    'ATPL', 'CPL', 'PPL', 'Instrument Rating', 'Multi-Crew Cooperation', 'Flight Instructor Rating'
+]
+AUTHORITIES = ['KCAA', 'EASA', 'FAA', 'ICAO', 'CAA']
+AIRCRAFT = [
+    'Boeing 737', 'Boeing 787', 'Airbus A320', 'Embraer', 'Dash 8', 'Cessna', 'ATR', 'Bombardier'
+]
+SKILLS = [
+    'Flight planning', 'Crew Resource Management', 'Navigation systems', 'FMS', 'RNAV',
+    'Safety Management System', 'Human Factors', 'Emergency handling', 'Risk management',
+    'Leadership', 'Situational awareness', 'Customer service', 'Quality assurance'
+]
+HEADERS = {
+    'summary': ['PROFESSIONAL SUMMARY', 'Profile', 'CAREER PROFILE', 'SUMMARY'],
+    'experience': ['WORK EXPERIENCE', 'Professional Experience', 'EMPLOYMENT HISTORY', 'EXPERIENCE:'],
+    'education': ['EDUCATION', 'Education', 'ACADEMIC BACKGROUND', 'EDUCATIONAL QUALIFICATIONS'],
+    'licenses': ['LICENSES & CERTIFICATIONS', 'LICENSES', 'PILOT LICENSES', 'RATINGS'],
+    'flight': ['FLIGHT EXPERIENCE', 'Flight Hours', 'FLYING EXPERIENCE'],
+    'skills': ['SKILLS', 'TECHNICAL SKILLS', 'Core Competencies', 'AVIATION SKILLS'],
+    'languages': ['LANGUAGES'],
+    'references': ['REFERENCES', 'Referees'],
+}
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def _period(rng, start_year):
+    end_year = start_year + rng.randint(1, 6)
+    start = f"{rng.choice(MONTHS)} {start_year}"
+    end = 'Present' if end_year >= 2025 else f"{rng.choice(MONTHS)} {end_year}"
+    return start, end
+
+
+def _employment(rng, fake):
+    lines, jobs = [], []
+    year = rng.randint(2004, 2016)
+    for _ in range(rng.randint(1, 4)):
+        position, company = rng.choice(POSITIONS), rng.choice(AIRLINES)
+        start, end = _period(rng, year)
+        jobs.append({'position': position, 'company': company, 'start': start, 'end': end})
+        style = rng.randint(0, 3)
+        if style == 0:
+            lines.append(f"{company} - {position} ({start} - {end})")
+        elif style == 1:
+            lines.append(f"{position} at {company} ({start} - {end})")
+        elif style == 2:
+            lines.append(f"{start} - {end}\n{position}\n{company}")
+        else:
+            lines.append(f"{position}, {company} ({start} - {end})")
+        for _ in range(rng.randint(1, 3)):
+            lines.append(f"• {fake.sentence(nb_words=rng.randint(6, 12))}")
+        if rng.random() < 0.5:
+            lines.append(f"• Operated the {rng.choice(AIRCRAFT)} on regional and international routes")
+        year += rng.randint(2, 5)
+    return lines, jobs
+
+
+def _education(rng):
+    lines, degrees = [], []
+    for _ in range(rng.randint(1, 2)):
+        degree, institution, year = rng.choice(DEGREES), rng.choice(INSTITUTIONS), rng.randint(1998, 2020)
+        degrees.append({'degree': degree, 'institution': institution, 'year': year})
+        style = rng.randint(0, 2)
+        if style == 0:
+            lines.append(f"{degree}, {institution}, {year}")
+        elif style == 1:
+            lines.append(f"{year}: {degree} from {institution}")
+        else:
+            lines.append(f"{institution}\n{degree}\n{year}")
+    return lines, degrees
+
+
+def _licenses(rng):
+    lines, licenses = [], []
+    for license_name in rng.sample(LICENSES, rng.randint(1, 4)):
+        licenses.append(license_name)
+        style = rng.randint(0, 2)
+        if style == 0:
+            lines.append(f"{license_name} ({rng.randint(2005, 2022)})")
+        elif style == 1:
+            lines.append(f"{license_name}: {rng.choice(AUTHORITIES)} issued, valid until {rng.randint(2025, 2030)}")
+        else:
+            lines.append(f"• {license_name} - {rng.choice(AUTHORITIES)}")
+    if rng.random() < 0.6:
+        type_rating = f"{rng.choice(AIRCRAFT)} Type Rating"
+        licenses.append(type_rating)
+        lines.append(type_rating)
+    return lines, licenses
+
+
+def _flight(rng):
+    total = rng.randint(250, 15000)
+    flight = {'total_flight_hours': total}
+    lines = [f"Total flight hours: {total}"]
+    if rng.random() < 0.7:
+        flight['pic_hours'] = rng.randint(0, total // 2)
+        lines.append(f"PIC hours: {flight['pic_hours']}")
+    if rng.random() < 0.5:
+        flight['multi_engine_hours'] = rng.randint(100, total)
+        lines.append(f"Multi-engine hours: {flight['multi_engine_hours']}")
+    flight['aircraft_types_flown'] = rng.sample(AIRCRAFT, rng.randint(1, 3))
+    lines.append(f"Aircraft types flown: {', '.join(flight['aircraft_types_flown'])}")
+    return lines, flight
+
+
+def _skills(rng):
+    skills = rng.sample(SKILLS, rng.randint(3, 7))
+    if rng.random() < 0.5:
+        return [f"• {skill}" for skill in skills], skills
+    return [f"Skills: {', '.join(skills)}"], skills
+
+
+def generate_cv(rng, fake, aviation=True):
+    """
+    Generate one CV as plain text, with the facts it states.
+
+    Returns:
+        tuple: (text, ground truth dict with name, email, phone, location,
+        aviation, employment, education, licenses, flight and skills)
+    """
+    name = fake.name()
+    truth = {
+        'name': name,
+        'email': fake.email(),
+        'phone': f"+254 7{rng.randint(10, 99)} {rng.randint(100, 999)} {rng.randint(100, 999)}",
+        'location': f"{fake.city()}, Kenya",
+        'aviation': aviation,
+    }
+    lines = [
+        name,
+        f"Email: {truth['email']}",
+        f"Phone: {truth['phone']}",
+        f"Location: {truth['location']}",
+        '',
+    ]
+    summary = [fake.paragraph(nb_sentences=3)]
+    employment_lines, truth['employment'] = _employment(rng, fake)
+    education_lines, truth['education'] = _education(rng)
+    skills_lines, truth['skills'] = _skills(rng)
+    sections = [
+        ('summary', summary),
+        ('experience', employment_lines),
+        ('education', education_lines),
+        ('skills', skills_lines),
+        ('languages', ['English (Fluent), Swahili (Native)']),
+    ]
+    truth['licenses'], truth['flight'] = [], {}
+    if aviation:
+        license_lines, truth['licenses'] = _licenses(rng)
+        flight_lines, truth['flight'] = _flight(rng)
+        sections[2:2] = [('licenses', license_lines), ('flight', flight_lines)]
+    # Most CVs keep the usual order; some move sections around
+    if rng.random() < 0.3:
+        middle = sections[1:-1]
+        rng.shuffle(middle)
+        sections[1:-1] = middle
+    if rng.random() < 0.5:
+        sections.append(('references', ['Available on request']))
+
+    for kind, body in sections:
+        lines.append(rng.choice(HEADERS[kind]))
+        lines.extend(body)
+        lines.append('')
+    return '\n'.join(lines), truth
+
+
+def generate_cv_text(rng, fake, aviation=True):
+    """Generate one CV as plain text."""
+    return generate_cv(rng, fake, aviation)[0]
+
+
+def generate_labelled_cvs(count=100, seed=42, aviation_ratio=0.8):
+    """
+    Generate a reproducible list of synthetic CVs with their ground truth.
+
+    Takes the arguments of ``generate_cv_texts``, and gives the same texts.
+
+    Returns:
+        list: (text, ground truth) pairs
+    """
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    return [generate_cv(rng, fake, aviation=rng.random() < aviation_ratio) for _ in range(count)]
+
+
+def generate_cv_texts(count=100, seed=42, aviation_ratio=0.8):
+    """
+    Generate a reproducible list of synthetic CV texts.
+
+    Args:
+        count (int): Number of CVs
+        seed (int): Random seed; the same seed always gives the same corpus
+        aviation_ratio (float): Share of CVs with licenses and flight experience
+
+    Returns:
+        list: CV texts
+    """
+    return [text for text, _ in generate_labelled_cvs(count, seed, aviation_ratio)]
+
+
+def docx_bytes(text):
+    """A DOCX document with one paragraph per line of ``text``."""
+    document = docx.Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def docx_layout_bytes(text):
+    """
+    A DOCX laid out as CV templates do: the lines before the first blank line
+    in the page header, "Label: value" sections as two-column tables, and
+    sections of bulleted entries as a table with one row per entry, the entry
+    in the first cell and its bullets in the second.
+    """
+    document = docx.Document()
+    blocks = [block.split('\n') for block in text.strip('\n').split('\n\n')]
+    header = document.sections[0].header
+    header.paragraphs[0].text = blocks[0][0]
+    for line in blocks[0][1:]:
+        header.add_paragraph(line)
+
+    for title, *lines in blocks[1:]:
+        document.add_paragraph(title)
+        if lines and all(': ' in line for line in lines):
+            table = document.add_table(rows=0, cols=2)
+            for line in lines:
+                cells = table.add_row().cells
+                cells[0].text, cells[1].text = line.split(': ', 1)
+        elif any(line.startswith('•') for line in lines) and not lines[0].startswith('•'):
+            table = document.add_table(rows=0, cols=2)
+            for line in lines:
+                if line.startswith('•'):
+                    cell = table.rows[-1].cells[1]
+                    if cell.text:
+                        cell.add_paragraph(line)
+                    else:
+                        cell.text = line
+                else:
+                    table.add_row().cells[0].text = line
+        else:
+            for line in lines:
+                document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_string(line):
+    line = line.encode('cp1252', errors='replace')
+    return b'(' + line.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def pdf_bytes(text, lines_per_page=60):
+    """A minimal A4 PDF showing ``text`` in Helvetica, with a real text layer."""
+    lines = text.split('\n')
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objects 1-3 are the catalog, the page tree and the font; each page adds its content and itself
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    page_refs = []
+    for page_lines in pages:
+        content = b'BT /F1 10 Tf 12 TL 50 800 Td ' + b' '.join(_pdf_string(line) + b" '" for line in page_lines) + b' ET'
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects)
+        )
+        page_refs.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [' + b' '.join(page_refs) + b'] /Count %d >>' % len(pages)
+    return _pdf_file(objects)
+
+
+def _pdf_file(objects):
+    """A PDF file of ``objects``, numbered from 1; the first must be the catalog."""
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b'%010d 00000 n \n' % offset)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _single_page_pdf(content_stream):
+    """A PDF of one page drawing the given content stream object, with the Helvetica font of pdf_bytes."""
+    return _pdf_file([
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [5 0 R] /Count 1 >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        content_stream,
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+        b'/Resources << /Font << /F1 3 0 R >> >> /Contents 4 0 R >>',
+    ])
+
+
+def decompression_bomb_pdf_bytes(megabytes=1024):
+    """A small PDF whose page content inflates to ``megabytes`` of blanks."""
+    compressor = zlib.compressobj(9)
+    chunk = b' ' * 2 ** 20
+    data = b'BT /F1 10 Tf 50 800 Td (Bomb) Tj ET\n'
+    data = compressor.compress(data) + b''.join(compressor.compress(chunk) for _ in range(megabytes))
+    data += compressor.flush()
+    return _single_page_pdf(b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(data) + data + b'\nendstream')
+
+
+def slow_text_pdf_bytes(operators=200000):
+    """A small PDF whose one page shows ``operators`` one-letter strings, slow to parse for its size."""
+    compressor = zlib.compressobj(9)
+    data = compressor.compress(b'BT /F1 10 Tf 50 800 Td ')
+    data += b''.join(compressor.compress(b'(a) Tj 1 0 Td ' * 1000) for _ in range(operators // 1000))
+    data += compressor.compress(b'ET') + compressor.flush()
+    return _single_page_pdf(b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(data) + data + b'\nendstream')
+
+
+def page_images(text, dpi=200, lines_per_page=45):
+    """Render ``text`` onto white A4 greyscale pages, as a scanner would deliver them."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = int(8.27 * dpi), int(11.69 * dpi)
+    try:
+        font = ImageFont.load_default(size=max(10, dpi // 7))
+    except (TypeError, OSError):
+        font = ImageFont.load_default()
+    line_height = int(height * 0.9 / lines_per_page)
+
+    lines = text.split('\n')
+    pages = []
+    for first in range(0, max(len(lines), 1), lines_per_page):
+        image = Image.new('L', (width, height), 255)
+        draw = ImageDraw.Draw(image)
+        for row, line in enumerate(lines[first:first + lines_per_page]):
+            draw.text((dpi // 2, dpi // 2 + row * line_height), line, fill=0, font=font)
+        pages.append(image)
+    return pages
+
+
+def scanned_pdf_bytes(text, dpi=200):
+    """An image-only PDF of ``text`` (no text layer), like a scanned CV."""
+    pages = page_images(text, dpi=dpi)
+    buffer = io.BytesIO()
+    pages[0].save(buffer, format='PDF', save_all=True, append_images=pages[1:], resolution=dpi)
+    return buffer.getvalue()
+
+
+def partly_scanned_pdf_bytes(cover_text, text, dpi=200):
+    """A PDF of a scanned page showing ``cover_text``, followed by ``text`` with a real text layer."""
+    import PyPDF2
+
+    writer = PyPDF2.PdfWriter()
+    for part in (scanned_pdf_bytes(cover_text, dpi=dpi), pdf_bytes(text)):
+        for page in PyPDF2.PdfReader(io.BytesIO(part)).pages:
+            writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def phone_photo(page, rng, size=(3024, 4032)):
+    """A page as photographed: tilted, on a dark desk, grey paper, slightly blurred, at phone resolution."""
+    from PIL import Image, ImageFilter
+
+    paper = page.point(lambda level: 60 + level * 150 // 255)
+    paper = paper.rotate(rng.uniform(-3, 3), resample=Image.BICUBIC, expand=True, fillcolor=40)
+    scale = min(size[0] * 0.9 / paper.width, size[1] * 0.9 / paper.height)
+    paper = paper.resize((int(paper.width * scale), int(paper.height * scale)), Image.BICUBIC)
+    photo = Image.new('L', size, 40)
+    photo.paste(paper, ((size[0] - paper.width) // 2, (size[1] - paper.height) // 2))
+    return photo.filter(ImageFilter.GaussianBlur(1.2))
+
+
+def image_bytes(text, dpi=300):
+    """A PNG of ``text`` on a single A4 page, like a photographed or scanned CV saved as an image."""
+    lines = text.split('\n')
+    buffer = io.BytesIO()
+    page_images(text, dpi=dpi, lines_per_page=max(45, len(lines)))[0].save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+CORPUS_FORMATS = {
+    'pdf': ('.pdf', pdf_bytes),
+    'docx': ('.docx', docx_bytes),
+    'docx_layout': ('.docx', docx_layout_bytes),
+    'txt': ('.txt', lambda text: text.encode('utf-8')),
+    'png': ('.png', image_bytes),
+    'scan': ('.pdf', scanned_pdf_bytes),
+}
+
+
+def write_corpus(directory, count=50, seed=42, formats=('pdf', 'docx', 'txt', 'png'), aviation_ratio=0.8):
+    """
+    Write a labelled synthetic corpus: every CV in every format, and a manifest.
+
+    Args:
+        directory (str): Where to write the files; created if missing
+        count (int): Number of CVs
+        seed (int): Random seed
+        formats (tuple): Names from CORPUS_FORMATS
+        aviation_ratio (float): Share of aviation CVs
+
+    Returns:
+        list: Manifest entries, {'file', 'format', 'truth'}, as listed in manifest.json
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = []
+    for position, (text, truth) in enumerate(generate_labelled_cvs(count, seed, aviation_ratio)):
+        for name in formats:
+            extension, render = CORPUS_FORMATS[name]
+            filename = f"cv_{position:04d}_{name}{extension}"
+            with open(os.path.join(directory, filename), 'wb') as f:
+                f.write(render(text))
+            manifest.append({'file': filename, 'format': name, 'truth': truth})
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump({'seed': seed, 'count': count, 'files': manifest}, f, indent=1)
+    return manifest
@@ -0,0 +1,142 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.jobs_postings.models import JobPosting
+from apps.jobs_search.Job_matching.aviation_matching import (
+    AviationProfile,
+    aviation_requirements_filter,
+    _normalise_codes,
+)
+from apps.users.models import User
+from apps.users.profile_management.models import LicensesRatings
+
+# Some postings name the type only, so it is part of the candidate's "Airbus A320" rather than the reverse
+AIRCRAFT = ['Boeing 737', 'Airbus A320', 'A320', 'Embraer 190', 'E190', 'ATR 72', 'Dash 8', 'Cessna Caravan']
+LICENSE_CODES = [code for code, _ in LicensesRatings.LICENSE_TYPE_CHOICES if code != 'other']
+RATING_CODES = [code for code, _ in LicensesRatings.RATING_CHOICES if code != 'other']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark SQL (index-backed) vs Python filtering of jobs on aviation requirements'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=50000, help='Number of synthetic active job postings')
+        parser.add_argument('--runs', type=int, default=5, help='Timed runs per strategy')
+        parser.add_argument('--licenses', type=str, default='cpl,atpl', help='Candidate license types (comma-separated)')
+        parser.add_argument('--ratings', type=str, default='instrument,multi_engine', help='Candidate ratings (comma-separated)')
+        parser.add_argument('--hours', type=int, default=3500, help='Candidate total flight hours')
+        parser.add_argument('--aircraft', type=str, default='Airbus A320', help='Candidate aircraft type')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        profile = AviationProfile(
+            license_types={code.strip() for code in options['licenses'].split(',') if code.strip()},
+            ratings={code.strip() for code in options['ratings'].split(',') if code.strip()},
+            aircraft_types={options['aircraft'].lower()},
+            total_hours=options['hours'],
+            aircraft_hours={options['aircraft'].lower(): options['hours']},
+        )
+
+        # Everything is created inside a transaction that is rolled back at the end
+        with transaction.atomic():
+            self._seed_jobs(options['jobs'])
+
+            python_ids, python_times = self._time(options['runs'], lambda: self._python_filter(profile))
+            sql_ids, sql_times = self._time(options['runs'], lambda: self._sql_filter(profile))
+
+            self.stdout.write(f"\nActive jobs: {options['jobs']}")
+            self.stdout.write(f"Eligible jobs: {len(sql_ids)}")
+            self._report('Python loop over all active jobs', python_times)
+            self._report('SQL containment + hours filter', sql_times)
+
+            if set(python_ids) != set(sql_ids):
+                self.stdout.write(self.style.ERROR(
+                    f"Result mismatch: python={len(python_ids)} sql={len(sql_ids)}"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS('Both strategies returned the same jobs'))
+
+            speedup = statistics.median(python_times) / max(statistics.median(sql_times), 1e-9)
+            self.stdout.write(self.style.SUCCESS(f"Speedup: {speedup:.1f}x"))
+
+            self.stdout.write('\nQuery plan:')
+            queryset = JobPosting.objects.filter(status='active').filter(
+                aviation_requirements_filter(profile)
+            ).values_list('id', flat=True)
+            self.stdout.write(queryset.explain(analyze=True))
+
+            transaction.set_rollback(True)
+
+    def _seed_jobs(self, count):
+        """Bulk create synthetic postings with a realistic spread of requirements."""
+        recruiter = User.objects.create(
+            email=f'benchmark-recruiter-{time.time_ns()}@example.com',
+            role='recruiter',
+            company_name='Benchmark Air'
+        )
+        jobs = []
+        for i in range(count):
+            jobs.append(JobPosting(
+                recruiter=recruiter,
+                title=f'Benchmark position {i}',
+                aircraft_type=random.choice(AIRCRAFT),
+                description='Synthetic job posting for matching benchmarks',
+                qualifications='See requirements',
+                location='Nairobi, Kenya',
+                job_type='full-time',
+                status='active',
+                # About a third of jobs have no license requirement
+                required_license_types=random.sample(LICENSE_CODES, k=random.choice([0, 0, 1, 1, 2])),
+                required_licenses=random.sample(RATING_CODES, k=random.choice([0, 0, 1, 2])),
+                total_flying_hours_required=random.choice([None, 250, 500, 1500, 3000, 5000]),
+                specific_aircraft_hours_required=random.choice([None, None, 100, 500, 1000]),
+            ))
+        self.stdout.write(f"Seeding {count} job postings...")
+        JobPosting.objects.bulk_create(jobs, batch_size=2000)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {JobPosting._meta.db_table}')
+
+    def _python_filter(self, profile):
+        """The pre-index approach: load every active job and check it in Python."""
+        eligible = []
+        for job in JobPosting.objects.filter(status='active').only(
+            'id', 'aircraft_type', 'required_license_types', 'required_licenses',
+            'total_flying_hours_required', 'specific_aircraft_hours_required'
+        ):
+            if not _normalise_codes(job.required_license_types) <= profile.license_types:
+                continue
+            if not _normalise_codes(job.required_licenses) <= profile.credentials:
+                continue
+            if job.total_flying_hours_required is not None and job.total_flying_hours_required > profile.total_hours:
+                continue
+            if job.specific_aircraft_hours_required and profile.hours_on(job.aircraft_type) < job.specific_aircraft_hours_required:
+                continue
+            eligible.append(job.id)
+        return eligible
+
+    def _sql_filter(self, profile):
+        return list(
+            JobPosting.objects.filter(status='active')
+            .filter(aviation_requirements_filter(profile))
+            .values_list('id', flat=True)
+        )
+
+    def _time(self, runs, func):
+        times = []
+        result = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return result, times
+
+    def _report(self, label, times):
+        self.stdout.write(
+            f"{label}: median {statistics.median(times) * 1000:.1f} ms, "
+            f"min {min(times) * 1000:.1f} ms, max {max(times) * 1000:.1f} ms"
+        )
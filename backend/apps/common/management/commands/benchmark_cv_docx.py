@@ -0,0 +1,94 @@
+import io
+import multiprocessing
+import re
+import resource
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import docx
+from django.core.management.base import BaseCommand
+
+from apps.common.cv_corpus import docx_bytes, docx_layout_bytes, generate_cv_texts
+from apps.users.profile_management.cv_ocr import _status_bytes
+from apps.users.profile_management.docx_text import stream_docx_lines
+
+LAYOUTS = {'paragraphs': docx_bytes, 'layout': docx_layout_bytes}
+
+
+def python_docx_text(data):
+    """Text as extract_text_from_docx read it before: body paragraphs only."""
+    return '\n'.join(paragraph.text for paragraph in docx.Document(io.BytesIO(data)).paragraphs)
+
+
+def streamed_text(data):
+    return '\n'.join(stream_docx_lines(io.BytesIO(data)))
+
+
+EXTRACTORS = {'python-docx': python_docx_text, 'stream': streamed_text}
+
+
+def _measure(name, data):
+    """Run one extractor in a fresh process; returns (text, seconds, peak memory growth in bytes)."""
+    rss = _status_bytes('VmRSS')
+    start = time.perf_counter()
+    text = EXTRACTORS[name](data)
+    seconds = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return text, seconds, peak - rss if rss else None
+
+
+def _words(text):
+    return Counter(re.findall(r'\w+', text.lower()))
+
+
+def word_recall(expected, actual):
+    """Share of the words of ``expected`` found in ``actual``, counting repeats."""
+    expected, actual = _words(expected), _words(actual)
+    total = sum(expected.values())
+    return sum((expected & actual).values()) / total if total else 1.0
+
+
+class Command(BaseCommand):
+    help = ('Compare python-docx and the streaming DOCX reader: time per CV, word recall on plain and '
+            'table and header layouts, and time and peak memory on one large document')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=50, help='CVs per layout')
+        parser.add_argument('--seed', type=int, default=42, help='Seed for generated CVs')
+        parser.add_argument('--large', type=int, default=200, help='CVs concatenated into the large document')
+
+    def handle(self, *args, **options):
+        texts = generate_cv_texts(count=options['count'], seed=options['seed'])
+        for layout, render in LAYOUTS.items():
+            documents = [(text, render(text)) for text in texts]
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{layout} ({len(documents)} CVs)"))
+            for name, extract in EXTRACTORS.items():
+                times, recalls = [], []
+                for text, data in documents:
+                    start = time.perf_counter()
+                    extracted = extract(data)
+                    times.append(time.perf_counter() - start)
+                    recalls.append(word_recall(text, extracted))
+                self.stdout.write(
+                    f"  {name:12} {statistics.median(times) * 1000:7.2f} ms median, "
+                    f"word recall {statistics.mean(recalls):.3f} (worst {min(recalls):.3f})"
+                )
+
+        # Large: many CVs in one document, with tables, for time and memory growth
+        large_text = '\n\n'.join(generate_cv_texts(count=options['large'], seed=options['seed'] + 1))
+        data = docx_layout_bytes(large_text)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"large ({len(data) / 1024:.0f} KB DOCX, {len(large_text) / 1024:.0f} KB of text)"
+        ))
+        for name in EXTRACTORS:
+            # In a forked process of its own, so its peak memory is its alone
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('fork')) as executor:
+                extracted, seconds, growth = executor.submit(_measure, name, data).result()
+            growth = f"{growth / 2 ** 20:.1f} MB" if growth is not None else 'unknown'
+            self.stdout.write(
+                f"  {name:12} {seconds * 1000:8.1f} ms, peak memory growth {growth}, "
+                f"word recall {word_recall(large_text, extracted):.3f}"
+            )
@@ -0,0 +1,190 @@
+import contextlib
+import io
+import json
+import os
+import re
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.common.cv_corpus import CORPUS_FORMATS, write_corpus
+from apps.users.profile_management.cv_ocr import _reset_peak, _status_bytes
+from apps.users.profile_management.cv_processing_logic import (
+    empty_cv_information,
+    extract_information_from_text,
+    extract_text_from_file,
+)
+
+
+def _normalize(value):
+    return ' '.join(str(value).lower().split())
+
+
+def _recall(expected, extracted):
+    """Share of ``expected`` strings mentioned anywhere in ``extracted``."""
+    if not expected:
+        return None
+    haystack = _normalize(json.dumps(extracted, cls=DjangoJSONEncoder))
+    return sum(_normalize(item) in haystack for item in expected) / len(expected)
+
+
+def score_cv(truth, data, is_aviation):
+    """
+    Field-level accuracy of one extraction against the ground truth.
+
+    Returns:
+        dict: Score between 0 and 1 by field; None where the field does not apply
+    """
+    personal = data.get('personal_info') or {}
+    aviation = data.get('aviation_data') or {}
+    flight = aviation.get('flight_experience') or {}
+    phone_digits = re.sub(r'\D', '', personal.get('phone_number') or '')
+    scores = {
+        'name': float(_normalize(personal.get('name', '')) == _normalize(truth['name'])),
+        'email': float(_normalize(personal.get('email', '')) == _normalize(truth['email'])),
+        'phone': float(bool(phone_digits) and re.sub(r'\D', '', truth['phone']).endswith(phone_digits[-9:])),
+        'employment_companies': _recall([job['company'] for job in truth['employment']], data.get('employment_history')),
+        'employment_titles': _recall([job['position'] for job in truth['employment']], data.get('employment_history')),
+        'education': _recall([degree['degree'] for degree in truth['education']], data.get('qualifications')),
+        'aviation_detection': float(is_aviation == truth['aviation']),
+        'licenses': None,
+        'flight_hours': None,
+        'aviation_skills': None,
+    }
+    if truth['aviation']:
+        scores['licenses'] = _recall(truth['licenses'], aviation.get('licenses'))
+        scores['flight_hours'] = float(flight.get('total_flight_hours') == truth['flight']['total_flight_hours'])
+        scores['aviation_skills'] = _recall(truth['skills'], aviation.get('aviation_skills'))
+    return scores
+
+
+def _summary_ms(seconds):
+    seconds = sorted(seconds)
+    return {
+        'count': len(seconds),
+        'mean': round(statistics.mean(seconds) * 1000, 3),
+        'median': round(statistics.median(seconds) * 1000, 3),
+        'p95': round(seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))] * 1000, 3),
+    }
+
+
+def _mean_scores(rows):
+    fields = {}
+    for row in rows:
+        for field, score in row.items():
+            if score is not None:
+                fields.setdefault(field, []).append(score)
+    return {field: round(statistics.mean(scores), 4) for field, scores in sorted(fields.items())}
+
+
+class Command(BaseCommand):
+    help = ('Run CV extraction over a labelled corpus and report per-extractor timing, throughput, '
+            'peak memory and field-level accuracy as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', type=str, help='Corpus directory with a manifest.json; generated there if missing')
+        parser.add_argument('--count', type=int, default=50, help='CVs to generate')
+        parser.add_argument('--seed', type=int, default=42, help='Seed for generated CVs')
+        parser.add_argument('--formats', type=str, default='pdf,docx,txt,png',
+                            help=f"Comma-separated formats to generate, from {', '.join(CORPUS_FORMATS)}")
+        parser.add_argument('--runs', type=int, default=1, help='Timed runs over the corpus')
+        parser.add_argument('--output', type=str, help='Write the report to this file instead of stdout')
+        parser.add_argument('--check', type=str, help='Fail if slower or less accurate than this earlier report')
+        parser.add_argument('--max-slowdown', type=float, default=1.25, help='Allowed ratio of per-CV time to --check')
+        parser.add_argument('--max-accuracy-drop', type=float, default=0.02, help='Allowed accuracy drop per field')
+
+    def handle(self, *args, **options):
+        with contextlib.ExitStack() as stack:
+            directory = options['dir'] or stack.enter_context(tempfile.TemporaryDirectory())
+            manifest_path = os.path.join(directory, 'manifest.json')
+            if not os.path.exists(manifest_path):
+                write_corpus(directory, count=options['count'], seed=options['seed'],
+                             formats=tuple(options['formats'].split(',')))
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            report = self.run(directory, manifest['files'], options['runs'])
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+        if options['check']:
+            self.check(report, options['check'], options['max_slowdown'], options['max_accuracy_drop'])
+
+    def run(self, directory, files, runs):
+        text_times, total_times, extractor_times = {}, [], {}
+        scores, scores_by_format, errors = [], {}, []
+
+        baseline_rss = _reset_peak()
+        started = time.perf_counter()
+        for run in range(runs):
+            for entry in files:
+                with open(os.path.join(directory, entry['file']), 'rb') as f:
+                    data = f.read()
+                extension = os.path.splitext(entry['file'])[1].lower()
+                timings, extracted, text_done = {}, empty_cv_information(), None
+
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    try:
+                        text = extract_text_from_file(data, extension, use_cache=False)
+                        text_done = time.perf_counter()
+                        extract_information_from_text(text, extracted, timings=timings)
+                    except Exception as e:
+                        errors.append({'file': entry['file'], 'error': f"{type(e).__name__}: {e}"})
+                end = time.perf_counter()
+
+                text_times.setdefault(entry['format'], []).append((text_done or end) - start)
+                total_times.append(end - start)
+                for name, seconds in timings.items():
+                    extractor_times.setdefault(name, []).append(seconds)
+                if run == 0:
+                    # The aviation extractors only run on CVs detected as aviation
+                    row = score_cv(entry['truth'], extracted, 'extract_aviation_licenses' in timings)
+                    scores.append(row)
+                    scores_by_format.setdefault(entry['format'], []).append(row)
+        elapsed = time.perf_counter() - started
+        peak_rss = _status_bytes('VmHWM')
+
+        return {
+            'corpus': {
+                'directory': directory,
+                'files': len(files),
+                'formats': sorted(scores_by_format),
+                'runs': runs,
+            },
+            'throughput_cvs_per_second': round(len(files) * runs / elapsed, 2),
+            'total_ms_per_cv': _summary_ms(total_times),
+            'text_extraction_ms': {name: _summary_ms(times) for name, times in sorted(text_times.items())},
+            'extractors_ms': {name: _summary_ms(times) for name, times in sorted(extractor_times.items())},
+            'peak_rss_bytes': peak_rss,
+            'peak_rss_growth_bytes': peak_rss - baseline_rss if peak_rss and baseline_rss else None,
+            'accuracy': _mean_scores(scores),
+            'accuracy_by_format': {name: _mean_scores(rows) for name, rows in sorted(scores_by_format.items())},
+            'errors': len(errors),
+            'error_samples': errors[:10],
+        }
+
+    def check(self, report, path, max_slowdown, max_accuracy_drop):
+        with open(path) as f:
+            expected = json.load(f)
+        failures = []
+        slowdown = report['total_ms_per_cv']['median'] / max(expected['total_ms_per_cv']['median'], 1e-9)
+        if slowdown > max_slowdown:
+            failures.append(f"median time per CV is {slowdown:.2f}x that of {path}")
+        for field, accuracy in expected['accuracy'].items():
+            current = report['accuracy'].get(field, 0)
+            if current < accuracy - max_accuracy_drop:
+                failures.append(f"{field} accuracy dropped from {accuracy:.3f} to {current:.3f}")
+        if report['errors'] > expected['errors']:
+            failures.append(f"{report['errors']} extraction errors, {expected['errors']} before")
+        if failures:
+            raise CommandError('Regression against ' + path + ':\n  ' + '\n  '.join(failures))
+        self.stderr.write(self.style.SUCCESS(f"No regression against {path}"))
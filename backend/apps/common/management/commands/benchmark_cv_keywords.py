@@ -0,0 +1,134 @@
+import os
+import random
+import re
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.profile_management import cv_processing_logic as cv
+from apps.users.profile_management.cv_processing_logic import (
+    AVIATION_KEYWORD_MATCHER,
+    check_if_aviation_cv,
+    extract_keyword_context,
+    extract_text_from_docx,
+    extract_text_from_pdf,
+)
+
+FILLER = (
+    "Responsible for daily operations and coordination with the team. Worked closely with "
+    "management on planning and reporting. Maintained records and ensured standards were met."
+).split()
+
+
+def legacy_keyword_count(text):
+    """The per-keyword scan check_if_aviation_cv used before the compiled matcher."""
+    count = 0
+    for keyword in (cv.AVIATION_LICENSES + cv.AVIATION_EXPERIENCE_KEYWORDS + cv.AVIATION_TECHNICAL_SKILLS +
+                    cv.AVIATION_COMPLIANCE_KEYWORDS + cv.AIRCRAFT_TYPES):
+        count += len(re.findall(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE))
+    return count
+
+
+def legacy_skill_contexts(text):
+    """The per-keyword search + context lookup extract_aviation_skills used before."""
+    contexts = []
+    for keyword in cv.AVIATION_TECHNICAL_SKILLS + cv.AVIATION_COMPLIANCE_KEYWORDS:
+        if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
+            contexts.append(extract_keyword_context(text, keyword))
+    return contexts
+
+
+def synthetic_cv(rng, words=1200):
+    keywords = (cv.AVIATION_LICENSES + cv.AVIATION_EXPERIENCE_KEYWORDS + cv.AVIATION_TECHNICAL_SKILLS +
+                cv.AVIATION_COMPLIANCE_KEYWORDS + cv.AIRCRAFT_TYPES)
+    parts = []
+    for i in range(words):
+        parts.append(rng.choice(keywords) if rng.random() < 0.04 else rng.choice(FILLER))
+        if i % 15 == 14:
+            parts[-1] += '.\n'
+    return ' '.join(parts)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the compiled aviation keyword matcher against per-keyword regex scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', type=str, help='Directory of CV files (.pdf, .docx, .txt) to use as corpus')
+        parser.add_argument('--synthetic', type=int, default=50, help='Synthetic CVs to generate if no corpus is found')
+        parser.add_argument('--runs', type=int, default=5, help='Timed runs over the corpus')
+
+    def handle(self, *args, **options):
+        texts = self.load_corpus(options['dir'] or os.path.join(settings.BASE_DIR, 'test_files', 'cv_samples'))
+        if not texts:
+            rng = random.Random(42)
+            texts = [synthetic_cv(rng) for _ in range(options['synthetic'])]
+            self.stdout.write(f"No CV corpus found, using {len(texts)} synthetic CVs")
+        else:
+            self.stdout.write(f"Loaded {len(texts)} CVs")
+
+        # Results must be identical before timing means anything
+        mismatches = 0
+        for text in texts:
+            hits = AVIATION_KEYWORD_MATCHER.scan(text)
+            new_count = sum(hits.count_all(k) for k in AVIATION_KEYWORD_MATCHER.families.values())
+            if new_count != legacy_keyword_count(text):
+                mismatches += 1
+            if self.skill_contexts(text, hits) != legacy_skill_contexts(text):
+                mismatches += 1
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"{mismatches} result mismatches against the legacy scans"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Keyword counts and skill contexts match the legacy scans"))
+
+        legacy = self.time_per_cv(texts, options['runs'], lambda text: (
+            legacy_keyword_count(text), legacy_skill_contexts(text)
+        ))
+        compiled = self.time_per_cv(texts, options['runs'], lambda text: (
+            check_if_aviation_cv(text, AVIATION_KEYWORD_MATCHER.scan(text)),
+        ))
+        shared = self.time_per_cv(texts, options['runs'], self.shared_scan)
+
+        self.stdout.write(f"Per-keyword regex scans: {legacy * 1000:.2f} ms per CV")
+        self.stdout.write(f"Compiled matcher (aviation check only): {compiled * 1000:.2f} ms per CV")
+        self.stdout.write(f"Compiled matcher (scan shared by check + skill contexts): {shared * 1000:.2f} ms per CV")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {legacy / max(shared, 1e-9):.1f}x"))
+
+    def skill_contexts(self, text, hits):
+        """The keyword contexts extract_aviation_skills now derives from shared hits."""
+        contexts = []
+        for keyword in cv.AVIATION_TECHNICAL_SKILLS + cv.AVIATION_COMPLIANCE_KEYWORDS:
+            span = hits.first(keyword)
+            if span:
+                contexts.append(cv._context_around(text, *span))
+        return contexts
+
+    def shared_scan(self, text):
+        hits = AVIATION_KEYWORD_MATCHER.scan(text)
+        check_if_aviation_cv(text, hits)
+        self.skill_contexts(text, hits)
+
+    def time_per_cv(self, texts, runs, func):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            for text in texts:
+                func(text)
+            timings.append((time.perf_counter() - start) / len(texts))
+        return statistics.median(timings)
+
+    def load_corpus(self, directory):
+        texts = []
+        if not os.path.isdir(directory):
+            return texts
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.join(directory, filename)
+            if filename.endswith('.pdf'):
+                texts.append(extract_text_from_pdf(path))
+            elif filename.endswith('.docx'):
+                texts.append(extract_text_from_docx(path))
+            elif filename.endswith('.txt'):
+                with open(path, encoding='utf-8', errors='ignore') as f:
+                    texts.append(f.read())
+        return [text for text in texts if text.strip()]
@@ -0,0 +1,56 @@
+import contextlib
+import difflib
+import io
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.cv_corpus import generate_cv_texts, scanned_pdf_bytes
+from apps.users.profile_management.cv_ocr import ocr_pdf
+from apps.users.profile_management.cv_processing_logic import OCR_ENABLED
+
+
+class Command(BaseCommand):
+    help = 'Benchmark page-parallel OCR wall-clock time against the number of workers on scanned CVs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=4, help='Scanned CVs in the corpus')
+        parser.add_argument('--pages', type=int, default=6, help='Pages per scanned CV (approximately)')
+        parser.add_argument('--workers', type=str, help='Comma-separated pool sizes to try (default: 1, 2, 4, ... up to the core count)')
+        parser.add_argument('--dpi', type=int, default=300, help='Rendering resolution for OCR')
+
+    def handle(self, *args, **options):
+        if not OCR_ENABLED:
+            raise CommandError("OCR is not available: install tesseract, pytesseract and pdf2image")
+
+        if options['workers']:
+            pool_sizes = [int(size) for size in options['workers'].split(',')]
+        else:
+            cores = os.cpu_count() or 1
+            pool_sizes = sorted({1, cores} | {2 ** power for power in range(1, 6) if 2 ** power < cores})
+
+        # About 45 lines per page; repeat each CV until it fills the requested pages
+        corpus = []
+        for text in generate_cv_texts(count=options['count'], seed=11):
+            repeats = max(1, options['pages'] * 45 // (text.count('\n') + 1))
+            text = '\n'.join([text] * repeats)
+            corpus.append((text, scanned_pdf_bytes(text)))
+        self.stdout.write(f"{len(corpus)} scanned CVs, ~{options['pages']} pages each at {options['dpi']} DPI")
+
+        baseline = None
+        for workers in pool_sizes:
+            timings, accuracy = [], []
+            for text, pdf in corpus:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ocr_text = ocr_pdf(pdf, dpi=options['dpi'], workers=workers, max_pages=options['pages'] + 1)
+                timings.append(time.perf_counter() - start)
+                accuracy.append(difflib.SequenceMatcher(None, text, ocr_text, autojunk=False).ratio())
+            seconds = statistics.median(timings)
+            baseline = baseline or seconds
+            self.stdout.write(
+                f"  {workers:2} workers: {seconds:.2f} s per CV, speedup {baseline / seconds:.2f}x, "
+                f"text similarity {statistics.mean(accuracy):.3f}"
+            )
@@ -0,0 +1,78 @@
+import contextlib
+import difflib
+import io
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.common.cv_corpus import generate_cv_texts, page_images, phone_photo
+from apps.users.profile_management.cv_processing_logic import OCR_ENABLED, extract_text_from_image
+from apps.users.profile_management.ocr_preprocessing import OCR_PRESETS, preprocess_image
+
+LINES_PER_PAGE = 45
+
+
+def _normalize(text):
+    return ' '.join(text.split())
+
+
+def character_accuracy(expected, actual):
+    """Share of characters OCR got right, ignoring line breaks and runs of spaces."""
+    return difflib.SequenceMatcher(None, _normalize(expected), _normalize(actual), autojunk=False).ratio()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark OCR preprocessing presets: time per page and character accuracy on labelled scans and phone photos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=5, help='Labelled pages per kind of image')
+        parser.add_argument('--presets', type=str, default='none,' + ','.join(OCR_PRESETS),
+                            help="Comma-separated presets; 'none' is greyscale only, as before preprocessing")
+
+    def handle(self, *args, **options):
+        rng = random.Random(5)
+        pages = {'scan': [], 'photo': []}
+        for text in generate_cv_texts(count=options['count'], seed=17):
+            truth = '\n'.join(text.split('\n')[:LINES_PER_PAGE])
+            page = page_images(truth, dpi=300, lines_per_page=LINES_PER_PAGE)[0]
+            pages['scan'].append((truth, page, 300))
+            # The DPI of a photo is not known
+            pages['photo'].append((truth, phone_photo(page, rng), None))
+
+        if not OCR_ENABLED:
+            self.stdout.write(self.style.WARNING(
+                "OCR is not available (install tesseract, pytesseract and pdf2image): timing preprocessing only"
+            ))
+
+        for kind, labelled in pages.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{kind} ({len(labelled)} pages)"))
+            for preset in options['presets'].split(','):
+                self.report(preset, labelled)
+
+    def report(self, preset, labelled):
+        preprocessing, ocr, accuracy = [], [], []
+        for truth, page, dpi in labelled:
+            start = time.perf_counter()
+            if preset == 'none':
+                image, image_dpi = page.convert('L'), None
+            else:
+                image, image_dpi = preprocess_image(page, preset, dpi)
+            preprocessing.append(time.perf_counter() - start)
+
+            if OCR_ENABLED:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    text = extract_text_from_image(
+                        image, preprocess=False, preset=None if preset == 'none' else preset, dpi=image_dpi
+                    )
+                ocr.append(time.perf_counter() - start)
+                accuracy.append(character_accuracy(truth, text))
+
+        line = f"  {preset:9} preprocessing {statistics.median(preprocessing) * 1000:7.0f} ms/page"
+        if OCR_ENABLED:
+            total = statistics.median(p + o for p, o in zip(preprocessing, ocr))
+            line += (f", OCR {statistics.median(ocr) * 1000:7.0f} ms/page, total {total * 1000:7.0f} ms/page, "
+                     f"character accuracy {statistics.mean(accuracy):.3f}")
+        self.stdout.write(line)
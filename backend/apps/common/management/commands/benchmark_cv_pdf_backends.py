@@ -0,0 +1,67 @@
+import contextlib
+import io
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.cv_corpus import generate_cv_texts, pdf_bytes
+from apps.common.management.commands.benchmark_cv_docx import word_recall
+from apps.users.profile_management.pdf_text import BACKENDS, PdfText, available_backends, text_quality
+
+
+def read_pdf(data, backends):
+    """Text of all pages of a PDF and the backend that read it, choosing among ``backends``."""
+    with contextlib.redirect_stdout(io.StringIO()), PdfText(data, backends=backends) as document:
+        backend = document.choose()
+        pages = [document.page_text(index) for index in range(document.page_count())]
+    return '\n'.join(pages), backend
+
+
+class Command(BaseCommand):
+    help = ('Compare the installed PDF text backends on the CV corpus: time per CV, word recall against '
+            'the source text and text quality, each backend alone and as chosen per document')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=50, help='CVs to render as PDFs')
+        parser.add_argument('--seed', type=int, default=42, help='Seed for generated CVs')
+        parser.add_argument('--lines-per-page', type=int, default=60, help='Lines of text per PDF page')
+        parser.add_argument('--backends', type=str, help=f"Comma-separated backends, from {', '.join(BACKENDS)}")
+
+    def handle(self, *args, **options):
+        names = options['backends'].split(',') if options['backends'] else list(BACKENDS)
+        unknown = set(names) - set(BACKENDS)
+        if unknown:
+            raise CommandError(f"Unknown backends: {', '.join(sorted(unknown))}")
+        installed = [backend.name for backend in available_backends(names)]
+        missing = [name for name in names if name not in installed]
+        if missing:
+            self.stdout.write(f"Not installed: {', '.join(missing)}")
+        if not installed:
+            raise CommandError('No PDF backend installed')
+
+        texts = generate_cv_texts(count=options['count'], seed=options['seed'])
+        documents = [(text, pdf_bytes(text, lines_per_page=options['lines_per_page'])) for text in texts]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{len(documents)} PDFs, preference order {','.join(settings.CV_PDF_BACKENDS)}"
+        ))
+
+        runs = [(name, [name]) for name in installed] + [('auto', installed)]
+        for label, backends in runs:
+            times, recalls, qualities, chosen = [], [], [], {}
+            for text, data in documents:
+                start = time.perf_counter()
+                extracted, backend = read_pdf(data, backends)
+                times.append(time.perf_counter() - start)
+                recalls.append(word_recall(text, extracted))
+                qualities.append(text_quality(extracted))
+                chosen[backend] = chosen.get(backend, 0) + 1
+            line = (
+                f"  {label:10} {statistics.median(times) * 1000:7.2f} ms median, "
+                f"{max(times) * 1000:7.2f} ms max, word recall {statistics.mean(recalls):.3f} "
+                f"(worst {min(recalls):.3f}), quality {statistics.mean(qualities):.3f}"
+            )
+            if label == 'auto':
+                line += ', chose ' + ', '.join(f"{name} {count}" for name, count in sorted(chosen.items(), key=str))
+            self.stdout.write(line)
@@ -0,0 +1,108 @@
+import contextlib
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.profile_management import cv_processing_logic as cv
+from apps.users.profile_management.cv_sections import CVSections
+
+# Inputs that made the extractor patterns backtrack, by name; each takes a size in words
+ADVERSARIAL_INPUTS = {
+    'words': lambda n: 'EXPERIENCE\n' + 'word ' * n,
+    'dashes': lambda n: 'EXPERIENCE\n' + 'Acme Ltd - Pilot ' * (n // 3),
+    'lines': lambda n: 'EXPERIENCE\n' + 'Acme Airways Ltd\n' * (n // 3),
+    'paren': lambda n: 'EXPERIENCE\nPilot at Acme (' + 'Jan 2020 ' * (n // 2),
+    'dates': lambda n: 'EXPERIENCE\n' + '2019 - 2020 ' * (n // 3),
+    'date_lines': lambda n: 'EXPERIENCE\n' + 'Captain\nJan 2019 - Dec 2020\n' * (n // 6),
+    'letters': lambda n: 'EXPERIENCE\n' + 'a' * (n * 5),
+    'commas': lambda n: 'EDUCATION\n' + 'a, ' * n,
+    'degrees': lambda n: 'EDUCATION\n' + 'Bachelor of Science in ' * (n // 4),
+    'licenses': lambda n: 'LICENSES\n' + 'ATPL CPL license ' * (n // 3),
+    'type_ratings': lambda n: 'RATINGS\n' + 'Boeing 737 type rating ' * (n // 4),
+    'hours': lambda n: 'FLIGHT EXPERIENCE\n' + 'total hours flight time pilot ' * (n // 5),
+    'headers': lambda n: 'EXPERIENCE\nEDUCATION\nSKILLS\nLICENSES\n' * (n // 4),
+    'blank_lines': lambda n: 'EXPERIENCE\n' + ('Pilot' + ' \n' * 50) * (n // 50),
+}
+
+
+def _extractor_calls(text):
+    """(name, function, args) for every extractor, as extract_information_from_text calls them."""
+    keyword_hits = cv.AVIATION_KEYWORD_MATCHER.scan(text)
+    sections = CVSections(text)
+    return [
+        ('extract_personal_info', cv.extract_personal_info, (text,)),
+        ('check_if_aviation_cv', cv.check_if_aviation_cv, (text, keyword_hits)),
+        ('extract_experience', cv.extract_experience, (text,)),
+        ('extract_employment_history', cv.extract_employment_history, (text, sections)),
+        ('extract_aviation_licenses', cv.extract_aviation_licenses, (text, keyword_hits, sections)),
+        ('extract_aviation_experience', cv.extract_aviation_experience, (text, keyword_hits)),
+        ('extract_aviation_skills', cv.extract_aviation_skills, (text, keyword_hits, sections)),
+        ('extract_qualifications', cv.extract_qualifications, (text, sections)),
+    ]
+
+
+class Command(BaseCommand):
+    help = ('Time every CV extractor on large and adversarial inputs of growing size and fail if any '
+            'grows faster than linearly or goes over a worst-case bound')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=str, default='500,2000,8000', help='Comma-separated input sizes in words')
+        parser.add_argument('--inputs', type=str, help=f"Comma-separated inputs, from {', '.join(ADVERSARIAL_INPUTS)}")
+        parser.add_argument('--max-seconds', type=float, default=2.0,
+                            help='Worst-case seconds for one extractor on the largest input')
+        parser.add_argument('--max-growth', type=float, default=2.0,
+                            help='Allowed ratio of time growth to size growth between consecutive sizes')
+        parser.add_argument('--min-seconds', type=float, default=0.005,
+                            help='Timings below this are too small to judge growth on')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        names = options['inputs'].split(',') if options['inputs'] else list(ADVERSARIAL_INPUTS)
+        unknown = set(names) - set(ADVERSARIAL_INPUTS)
+        if unknown:
+            raise CommandError(f"Unknown inputs: {', '.join(sorted(unknown))}")
+
+        failures = []
+        for name in names:
+            previous = {}
+            for size in sizes:
+                # Wrapped as extract_information_from_text does before running the extractors
+                text = cv.wrap_long_lines(cv.collapse_blank_lines(ADVERSARIAL_INPUTS[name](size)))
+                current = self.time_extractors(text)
+                slowest = max(current, key=current.get)
+                self.stdout.write(
+                    f"  {name:12} {len(text):7} chars: slowest {slowest} {current[slowest] * 1000:.1f} ms"
+                )
+                for extractor, seconds in current.items():
+                    if extractor in previous and seconds > options['min_seconds']:
+                        growth = (seconds / max(previous[extractor][1], options['min_seconds'])) / (
+                            len(text) / previous[extractor][0]
+                        )
+                        if growth > options['max_growth']:
+                            failures.append(
+                                f"{extractor} on '{name}': {growth:.1f}x the size growth between "
+                                f"{previous[extractor][0]} and {len(text)} chars"
+                            )
+                    previous[extractor] = (len(text), seconds)
+                    if size == sizes[-1] and seconds > options['max_seconds']:
+                        failures.append(f"{extractor} on '{name}': {seconds:.2f} s for {len(text)} chars")
+
+        if failures:
+            raise CommandError('Extractors not bounded:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS(
+            f"All extractors linear on {len(names)} inputs up to {sizes[-1]} words"
+        ))
+
+    def time_extractors(self, text):
+        timings = {}
+        for name, func, args in _extractor_calls(text):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    func(*args)
+                except LookupError:
+                    # NLTK data missing: the extractor stops early, which is not what is timed here
+                    pass
+            timings[name] = time.perf_counter() - start
+        return timings
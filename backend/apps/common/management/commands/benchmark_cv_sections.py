@@ -0,0 +1,65 @@
+import contextlib
+import io
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.cv_corpus import generate_cv_texts
+from apps.users.profile_management.cv_processing_logic import (
+    CV_SECTIONS,
+    extract_information_from_text,
+    parse_sections,
+)
+
+# Section choices of the callers that need only part of a CV
+SUBSETS = {
+    'all': None,
+    'contact': ('personal_info',),
+    'application': ('personal_info', 'licenses'),
+    'profile_refresh': ('employment_history',),
+    'qualifications': ('qualifications',),
+    'aviation': ('licenses', 'flight_experience', 'aviation_skills'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Time field extraction on the CV corpus for each common choice of sections, against extracting all of them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100, help='CVs to extract')
+        parser.add_argument('--seed', type=int, default=42, help='Seed for generated CVs')
+        parser.add_argument('--sections', type=str,
+                            help=f"Also time this comma-separated choice, from {', '.join(CV_SECTIONS)}")
+
+    def handle(self, *args, **options):
+        subsets = dict(SUBSETS)
+        if options['sections']:
+            try:
+                subsets['custom'] = parse_sections(options['sections'])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        texts = generate_cv_texts(count=options['count'], seed=options['seed'])
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{len(texts)} CVs, field extraction from text"))
+        baseline = None
+        for name, sections in subsets.items():
+            times, extractors, stopped = [], set(), 0
+            for text in texts:
+                timings = {}
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    try:
+                        extract_information_from_text(text, timings=timings, sections=sections)
+                    except LookupError:
+                        # NLTK data missing: extraction stops at personal info
+                        stopped += 1
+                times.append(time.perf_counter() - start)
+                extractors.update(timings)
+            median = statistics.median(times)
+            baseline = baseline or median
+            self.stdout.write(
+                f"  {name:16} {median * 1000:7.2f} ms median, {statistics.mean(times) * 1000:7.2f} ms mean, "
+                f"{median / baseline:5.0%} of all; {len(extractors)} extractors run"
+                + (f" (stopped early on {stopped} CVs, NLTK data missing)" if stopped else '')
+            )
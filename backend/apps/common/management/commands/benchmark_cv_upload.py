@@ -0,0 +1,126 @@
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.management.base import BaseCommand
+from django.db.models.fields.files import FieldFile
+
+from apps.common.cv_corpus import docx_bytes, generate_cv_texts, pdf_bytes
+from apps.users.profile_management.cv_processing_logic import (
+    extract_cv_information,
+    extract_text_from_file,
+    open_cv_source,
+)
+from apps.users.profile_management.models import CVProcessingJob
+
+
+def bytes_written():
+    """Bytes this process has passed to write() so far (Linux only, else None)."""
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('wchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def legacy_extract_text(cv_file, file_ext):
+    """Text extraction as before: copy the file chunk by chunk to a temporary file, then parse the copy."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
+        for chunk in cv_file.chunks():
+            temp_file.write(chunk)
+    try:
+        return extract_text_from_file(temp_file.name, file_ext)
+    finally:
+        os.unlink(temp_file.name)
+
+
+def current_extract_text(cv_file, file_ext):
+    source, _, temp_file_path = open_cv_source(cv_file, file_ext)
+    try:
+        return extract_text_from_file(source, file_ext)
+    finally:
+        if temp_file_path:
+            os.unlink(temp_file_path)
+
+
+class Command(BaseCommand):
+    help = 'Measure bytes written and latency per CV upload for each kind of upload, before and after zero-copy parsing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=20, help='Synthetic CVs per file format')
+        parser.add_argument('--runs', type=int, default=3, help='Timed runs')
+        parser.add_argument('--full', action='store_true', help='Time the whole extract_cv_information call as well')
+
+    def handle(self, *args, **options):
+        texts = generate_cv_texts(count=options['count'], seed=7)
+        media_dir = tempfile.mkdtemp()
+        try:
+            files = []
+            for position, text in enumerate(texts):
+                for file_ext, data in (('.pdf', pdf_bytes(text * 3)), ('.docx', docx_bytes(text * 3)),
+                                       ('.txt', (text * 3).encode('utf-8'))):
+                    name = f"cv_{position}{file_ext}"
+                    with open(os.path.join(media_dir, name), 'wb') as f:
+                        f.write(data)
+                    files.append((name, file_ext, data))
+            self.stdout.write(f"{len(files)} files, {sum(len(data) for _, _, data in files) / len(files) / 1024:.0f} KB on average")
+
+            kinds = {
+                'in-memory upload': lambda name, data: SimpleUploadedFile(name, data),
+                'temporary upload': lambda name, data: self.temporary_upload(name, data),
+                'stored file': lambda name, data: self.stored_file(media_dir, name),
+            }
+            for kind, make_file in kinds.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(kind))
+                for label, func in (('temp file copy', legacy_extract_text), ('zero-copy', current_extract_text)):
+                    written, latency = self.measure(files, make_file, func, options['runs'])
+                    self.stdout.write(f"  {label:15} {self.format_bytes(written)} written, {latency * 1000:.2f} ms per upload")
+                if options['full']:
+                    written, latency = self.measure(
+                        files, make_file, lambda cv_file, _: extract_cv_information(cv_file, use_cache=False), 1
+                    )
+                    self.stdout.write(f"  {'full extraction':15} {self.format_bytes(written)} written, {latency * 1000:.2f} ms per upload")
+        finally:
+            shutil.rmtree(media_dir)
+
+    def measure(self, files, make_file, func, runs):
+        """Median bytes written and latency per upload; building the upload objects is not counted."""
+        written, latencies = [], []
+        for _ in range(runs):
+            uploads = [(make_file(name, data), file_ext) for name, file_ext, data in files]
+            before = bytes_written()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                for cv_file, file_ext in uploads:
+                    func(cv_file, file_ext)
+            latencies.append((time.perf_counter() - start) / len(files))
+            if before is not None:
+                written.append((bytes_written() - before) / len(files))
+            for cv_file, _ in uploads:
+                cv_file.close()
+        return (statistics.median(written) if written else None), statistics.median(latencies)
+
+    def temporary_upload(self, name, data):
+        upload = TemporaryUploadedFile(name, 'application/octet-stream', len(data), None)
+        upload.write(data)
+        upload.flush()
+        upload.seek(0)
+        return upload
+
+    def stored_file(self, media_dir, name):
+        """A FieldFile as the queue workers see it, backed by file system storage."""
+        cv = FieldFile(CVProcessingJob(), CVProcessingJob._meta.get_field('cv'), name)
+        cv.storage = FileSystemStorage(location=media_dir)
+        return cv
+
+    def format_bytes(self, value):
+        return 'n/a' if value is None else f"{value / 1024:.1f} KB"
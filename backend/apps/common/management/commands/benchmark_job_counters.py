@@ -0,0 +1,137 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.test.utils import CaptureQueriesContext
+
+from apps.job_applications.models import JobApplication
+from apps.jobs_postings.models import JobPosting, JobTrack
+from apps.jobs_postings.serializers import JobPostingSerializer
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _counted_page(ids):
+    """A page of postings with the counts computed by COUNT subqueries, as before the counter columns."""
+    jobs = list(JobPosting.objects.filter(pk__in=ids).for_serializer().with_actual_counts())
+    data = JobPostingSerializer(jobs, many=True).data
+    for job, item in zip(jobs, data):
+        item['num_applicants'] = job.actual_applications_count
+        item['num_views'] = job.actual_views_count
+        item['num_shortlisted'] = job.actual_shortlisted_count
+        item['num_hired'] = job.actual_hired_count
+    return data
+
+
+def _counter_page(ids):
+    return JobPostingSerializer(JobPosting.objects.filter(pk__in=ids).for_serializer(), many=True).data
+
+
+def _counted_breakdown(recruiter):
+    """Applications per posting of a recruiter with COUNT(*), as ApplicationStatsView did."""
+    return list(
+        JobApplication.objects.filter(job__recruiter=recruiter).values('job__title', 'job_id').annotate(
+            count=Count('id'), shortlisted=Count('id', filter=Q(status='shortlisted')),
+            hired=Count('id', filter=Q(status='hired')),
+        )
+    )
+
+
+def _counter_breakdown(recruiter):
+    return list(
+        JobPosting.objects.filter(recruiter=recruiter, applications_count__gt=0).values(
+            'id', 'title', 'applications_count', 'shortlisted_count', 'hired_count', 'views_count'
+        )
+    )
+
+
+class Command(BaseCommand):
+    help = ('Time the job posting list and the per-posting application stats computed with COUNT(*) '
+            'against reading the counter columns; the generated data is rolled back')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--postings', type=int, default=200, help='Postings generated')
+        parser.add_argument('--applicants', type=int, default=50, help='Applications per posting')
+        parser.add_argument('--views', type=int, default=50, help='Views per posting')
+        parser.add_argument('--page-size', type=int, default=20, help='Postings per list page')
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs per strategy')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.benchmark(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def benchmark(self, options):
+        recruiter = User.objects.create_user(
+            email='job-counters-recruiter@example.com', full_name='Counter Benchmark', role='recruiter'
+        )
+        people = [
+            User.objects.create_user(
+                email=f"job-counters-{i}@example.com", full_name=f"Counter Benchmark{i}", role='professional'
+            )
+            for i in range(max(options['applicants'], options['views']))
+        ]
+        postings = JobPosting.objects.bulk_create(
+            JobPosting(
+                recruiter=recruiter, title=f"First Officer {i}", aircraft_type='B737', description='Line flying',
+                qualifications='ATPL', location='Nairobi', job_type='full-time', status='active',
+            )
+            for i in range(options['postings'])
+        )
+        statuses = ['submitted', 'under_review', 'shortlisted', 'interview', 'hired', 'rejected']
+        # Created in bulk, without signals; the counters are counted once afterwards
+        JobApplication.objects.bulk_create(
+            (
+                JobApplication(
+                    job=posting, applicant=person, cover_letter='x' * 100,
+                    status=statuses[(i + j) % len(statuses)], profile_score=(i * 37 + j * 11) % 100,
+                )
+                for j, posting in enumerate(postings)
+                for i, person in enumerate(people[:options['applicants']])
+            ),
+            batch_size=1000,
+        )
+        JobTrack.objects.bulk_create(
+            (JobTrack(job=posting, user=person) for posting in postings for person in people[:options['views']]),
+            batch_size=1000,
+        )
+        JobPosting.objects.filter(recruiter=recruiter).reconcile_counters()
+        page = [posting.pk for posting in postings[:options['page_size']]]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{options['postings']} postings, {options['applicants']} applications and {options['views']} "
+            f"views each, pages of {len(page)} postings"
+        ))
+        if _counted_page(page) != _counter_page(page):
+            self.stdout.write(self.style.WARNING('  The counters differ from the counted values'))
+        for label, before, after in (
+            ('posting list page', lambda: _counted_page(page), lambda: _counter_page(page)),
+            ('stats by posting', lambda: _counted_breakdown(recruiter), lambda: _counter_breakdown(recruiter)),
+        ):
+            before_times, before_queries = self._time(options['runs'], before)
+            after_times, after_queries = self._time(options['runs'], after)
+            self.stdout.write(
+                f"  {label:18} COUNT(*) {statistics.median(before_times) * 1000:8.2f} ms ({before_queries} queries), "
+                f"counters {statistics.median(after_times) * 1000:8.2f} ms ({after_queries} queries), "
+                f"{statistics.median(before_times) / statistics.median(after_times):5.1f}x"
+            )
+
+    def _time(self, runs, function):
+        with CaptureQueriesContext(connection) as queries:
+            function()
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        return times, len(queries)
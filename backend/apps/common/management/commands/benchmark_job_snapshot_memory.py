@@ -0,0 +1,85 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.jobs_postings.models import JobPosting
+from apps.jobs_search.Job_matching.feature_snapshot import (
+    build_active_jobs_snapshot, description_words, get_active_jobs_snapshot
+)
+from apps.jobs_search.Job_matching.hard_constraints import active_jobs_filter
+
+
+def _memory_usage():
+    """RSS and PSS (RSS with shared pages divided between processes) in KiB."""
+    usage = {'rss': 0, 'pss': 0}
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                usage['rss'] = int(line.split()[1])
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    usage['pss'] = int(line.split()[1])
+    except FileNotFoundError:
+        pass
+    return usage
+
+
+def _private_cache_worker(barrier, results):
+    """What each worker would hold without the snapshot: its own description skill sets."""
+    before = _memory_usage()
+    cache = {
+        job_id: description_words(description)
+        for job_id, description in JobPosting.objects.filter(active_jobs_filter()).values_list('id', 'description')
+    }
+    connections.close_all()
+    barrier.wait()
+    results.put(('private', before, _memory_usage(), len(cache)))
+    barrier.wait()
+
+
+def _shared_snapshot_worker(barrier, results):
+    """Map the snapshot and touch every page, as matching across all jobs would."""
+    before = _memory_usage()
+    snapshot = get_active_jobs_snapshot()
+    for job_id in snapshot.job_ids:
+        snapshot.matching_skills(job_id, ['pilot', 'maintenance'])
+    barrier.wait()
+    results.put(('shared', before, _memory_usage(), len(snapshot)))
+    barrier.wait()
+
+
+class Command(BaseCommand):
+    help = 'Compare per-worker memory of private feature caches vs the shared mmap snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=3, help='Number of forked workers (gunicorn default is 3)')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        build_active_jobs_snapshot()
+        # Forked workers must open their own database connections
+        connections.close_all()
+
+        context = multiprocessing.get_context('fork')
+        for label, target in [('Private cache per worker', _private_cache_worker),
+                              ('Shared mmap snapshot', _shared_snapshot_worker)]:
+            barrier = context.Barrier(workers)
+            results = context.Queue()
+            processes = [context.Process(target=target, args=(barrier, results)) for _ in range(workers)]
+            for process in processes:
+                process.start()
+            reports = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+
+            self.stdout.write(self.style.SUCCESS(f"\n{label} ({reports[0][3]} jobs)"))
+            for index, (_, before, after, _) in enumerate(reports):
+                self.stdout.write(
+                    f"  Worker {index + 1}: RSS {before['rss']} -> {after['rss']} KiB "
+                    f"(+{after['rss'] - before['rss']}), PSS {after['pss']} KiB"
+                )
+            total_pss = sum(after['pss'] for _, _, after, _ in reports)
+            self.stdout.write(f"  Total PSS across workers: {total_pss} KiB")
@@ -0,0 +1,103 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.jobs_postings.models import JobPosting, JobTrack
+from apps.jobs_postings.serializers import JobTrackSerializer
+from apps.jobs_postings.view_buffer import write_job_views
+from apps.jobs_postings.views import JobViewStatsAPIView
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _all_view_records(job_id):
+    """The view stats as JobViewStatsAPIView returned them before the rollups: every row and a count."""
+    job = JobPosting.objects.get(pk=job_id)
+    views_qs = JobTrack.objects.filter(job=job)
+    return {'total_views': views_qs.count(), 'view_records': JobTrackSerializer(views_qs, many=True).data}
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = ('Time the job view stats of a popular and an unpopular posting: every view record against '
+            'rollup buckets and a page of viewers; the generated data is rolled back')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--viewers', type=int, default=5000, help='Viewers of the popular posting')
+        parser.add_argument('--runs', type=int, default=10, help='Timed runs per posting and strategy')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.benchmark(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def benchmark(self, options):
+        recruiter = User.objects.create_user(
+            email='job-view-stats-recruiter@example.com', full_name='Stats Benchmark', role='recruiter'
+        )
+        User.objects.bulk_create(
+            User(email=f"job-view-stats-{i}@example.com", full_name=f"Stats Benchmark{i}", role='professional')
+            for i in range(options['viewers'])
+        )
+        viewer_ids = list(
+            User.objects.filter(email__startswith='job-view-stats-', role='professional').values_list('pk', flat=True)
+        )
+        popular, unpopular = JobPosting.objects.bulk_create(
+            JobPosting(
+                recruiter=recruiter, title=title, aircraft_type='B737', description='Line flying',
+                qualifications='ATPL', location='Nairobi', job_type='full-time', status='active',
+            )
+            for title in ('Popular', 'Unpopular')
+        )
+        write_job_views([(popular.pk, user_id) for user_id in viewer_ids])
+        write_job_views([(unpopular.pk, user_id) for user_id in viewer_ids[:5]])
+
+        factory = APIRequestFactory()
+        view = JobViewStatsAPIView.as_view()
+
+        def stats(job_id):
+            """The stats endpoint, without the middleware."""
+            request = factory.get(f"/api/v1/job-postings/{job_id}/views/stats/", HTTP_HOST="localhost")
+            force_authenticate(request, user=recruiter)
+            response = view(request, job_id=job_id)
+            if response.status_code != 200:
+                raise CommandError(f"Stats of posting {job_id}: {response.status_code} {response.data}")
+            return response.data
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Postings with {len(viewer_ids)} and 5 viewers, median of {options['runs']} runs"
+        ))
+        for label, job in (('popular', popular), ('unpopular', unpopular)):
+            for strategy, function in (('every record', _all_view_records), ('rollups', stats)):
+                queries = _QueryCounter()
+                with connection.execute_wrapper(queries):
+                    data = function(job.pk)
+                times = []
+                for _ in range(options['runs']):
+                    start = time.perf_counter()
+                    function(job.pk)
+                    times.append(time.perf_counter() - start)
+                rows = len(data['view_records'] if 'view_records' in data else data['recent_viewers']['results'])
+                self.stdout.write(
+                    f"  {label:9} {strategy:12} {statistics.median(times) * 1000:8.2f} ms, "
+                    f"{queries.count} queries, {rows} viewers in the response"
+                )
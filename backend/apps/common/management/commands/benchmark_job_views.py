@@ -0,0 +1,106 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.jobs_postings.models import JobPosting, JobTrack
+from apps.jobs_postings.view_buffer import write_job_views
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _track_view(job_id, user_id):
+    """One view as JobViewTrackAPIView recorded it before the buffer."""
+    job = JobPosting.objects.get(pk=job_id)
+    job_view, created = JobTrack.objects.get_or_create(job=job, user_id=user_id)
+    if not created:
+        job_view.viewed_at = timezone.now()
+        job_view.save()
+
+
+class _QueryCounter:
+    """Counts the queries run through a connection, without keeping them as CaptureQueriesContext does."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = ('Measure sustained job view throughput: one get_or_create per view against buffered views '
+            'written with one upsert per batch; the generated data is rolled back')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--views', type=int, default=5000, help='Views recorded with each strategy')
+        parser.add_argument('--postings', type=int, default=100, help='Postings viewed')
+        parser.add_argument('--users', type=int, default=200, help='Users viewing them')
+        parser.add_argument('--batch-sizes', type=str, default='100,500,2000', help='Comma-separated buffer sizes')
+        parser.add_argument('--seed', type=int, default=42, help='Seed for the generated views')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.benchmark(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def benchmark(self, options):
+        recruiter = User.objects.create_user(
+            email='job-views-recruiter@example.com', full_name='View Benchmark', role='recruiter'
+        )
+        users = [
+            User.objects.create_user(email=f"job-views-{i}@example.com", full_name=f"View Benchmark{i}", role='professional')
+            for i in range(options['users'])
+        ]
+        postings = JobPosting.objects.bulk_create(
+            JobPosting(
+                recruiter=recruiter, title=f"First Officer {i}", aircraft_type='B737', description='Line flying',
+                qualifications='ATPL', location='Nairobi', job_type='full-time', status='active',
+            )
+            for i in range(options['postings'])
+        )
+        # Popular postings get most views, and users come back to them
+        rng = random.Random(options['seed'])
+        weights = [1 / (rank + 1) for rank in range(len(postings))]
+        views = [
+            (rng.choices(postings, weights)[0].pk, rng.choice(users).pk) for _ in range(options['views'])
+        ]
+        distinct = len(set(views))
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{len(views)} views of {len(postings)} postings by {len(users)} users, {distinct} distinct"
+        ))
+
+        runs = [('get_or_create', None)] + [
+            (f"buffer {size}", int(size)) for size in options['batch_sizes'].split(',')
+        ]
+        for label, batch_size in runs:
+            sid = transaction.savepoint()
+            queries = _QueryCounter()
+            with connection.execute_wrapper(queries):
+                start = time.perf_counter()
+                if batch_size is None:
+                    for job_id, user_id in views:
+                        _track_view(job_id, user_id)
+                else:
+                    for begin in range(0, len(views), batch_size):
+                        write_job_views(views[begin:begin + batch_size])
+                seconds = time.perf_counter() - start
+            stored = JobTrack.objects.filter(job__recruiter=recruiter).count()
+            counted = sum(JobPosting.objects.filter(recruiter=recruiter).values_list('views_count', flat=True))
+            transaction.savepoint_rollback(sid)
+            if stored != distinct or counted != distinct:
+                raise CommandError(f"{label}: {stored} views stored and {counted} counted, expected {distinct}")
+            self.stdout.write(
+                f"  {label:14} {len(views) / seconds:9.0f} views/s, {queries.count / len(views):6.3f} queries per view"
+            )
@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs_postings.models import JobPosting
+from apps.jobs_search.Job_matching.aviation_matching import get_aviation_profile
+from apps.jobs_search.Job_matching.hard_constraints import get_candidate_jobs
+from apps.jobs_search.Job_matching.job_matching_service import JobMatchingService
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Measure how many jobs the SQL hard-constraint pushdown removes and the matching latency gain'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user_id', type=int, help='Specific professional user ID to benchmark')
+        parser.add_argument('--users', type=int, default=5, help='Number of professional users to sample')
+        parser.add_argument('--runs', type=int, default=3, help='Timed runs per strategy and user')
+
+    def handle(self, *args, **options):
+        if options['user_id']:
+            users = User.objects.filter(id=options['user_id'], role='professional')
+        else:
+            users = User.objects.filter(role='professional')[:options['users']]
+
+        if not users:
+            self.stdout.write(self.style.ERROR("No professional users found to benchmark with"))
+            return
+
+        total_before = total_after = 0
+        baseline_times, pushdown_times = [], []
+
+        for user in users:
+            aviation_profile = get_aviation_profile(user)
+
+            baseline_jobs = JobPosting.objects.filter(status='active')
+            pushdown_jobs = get_candidate_jobs(user, aviation_profile)
+            before = baseline_jobs.count()
+            after = pushdown_jobs.count()
+            total_before += before
+            total_after += after
+
+            user_baseline = self._time(options['runs'], lambda: JobMatchingService.find_matching_jobs(
+                user, JobPosting.objects.filter(status='active'), aviation_profile
+            ))
+            user_pushdown = self._time(options['runs'], lambda: JobMatchingService.find_matching_jobs(
+                user, get_candidate_jobs(user, aviation_profile), aviation_profile
+            ))
+            baseline_times.extend(user_baseline)
+            pushdown_times.extend(user_pushdown)
+
+            self.stdout.write(self.style.SUCCESS(f"\nUser: {user.email}"))
+            self.stdout.write(f"  Jobs scored: {before} -> {after} ({before - after} removed by SQL)")
+            self.stdout.write(
+                f"  Median latency: {statistics.median(user_baseline) * 1000:.1f} ms -> "
+                f"{statistics.median(user_pushdown) * 1000:.1f} ms"
+            )
+
+        removed = total_before - total_after
+        removed_pct = (removed / total_before * 100) if total_before else 0
+        baseline_median = statistics.median(baseline_times)
+        pushdown_median = statistics.median(pushdown_times)
+
+        self.stdout.write(self.style.SUCCESS("\nSummary"))
+        self.stdout.write(f"  Candidate jobs removed: {removed} of {total_before} ({removed_pct:.1f}%)")
+        self.stdout.write(
+            f"  Median end-to-end matching: {baseline_median * 1000:.1f} ms -> {pushdown_median * 1000:.1f} ms "
+            f"({baseline_median / max(pushdown_median, 1e-9):.1f}x)"
+        )
+
+    def _time(self, runs, func):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return times
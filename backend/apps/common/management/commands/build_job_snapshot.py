@@ -0,0 +1,19 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs_search.Job_matching.feature_snapshot import (
+    build_active_jobs_snapshot, get_active_jobs_snapshot, snapshot_path
+)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the memory-mapped active jobs snapshot used by job matching'
+
+    def handle(self, *args, **options):
+        job_count = build_active_jobs_snapshot()
+        snapshot = get_active_jobs_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {job_count} active jobs to {snapshot_path()}"))
+        if snapshot is not None:
+            self.stdout.write(f"  Skill bitset words per job: {snapshot.skill_words}")
+            self.stdout.write(f"  File size: {os.path.getsize(snapshot_path())} bytes")
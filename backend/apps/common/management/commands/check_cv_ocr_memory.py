@@ -0,0 +1,74 @@
+import contextlib
+import io
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.cv_corpus import generate_cv_texts, scanned_pdf_bytes
+from apps.users.profile_management.cv_ocr import _reset_peak, _status_bytes, ocr_pdf
+from apps.users.profile_management.cv_processing_logic import OCR_ENABLED
+
+
+def _render_all_pages(pdf, dpi, results):
+    """Rendering as before streaming: every page in memory at once."""
+    from pdf2image import convert_from_bytes
+
+    baseline = _reset_peak()
+    images = convert_from_bytes(pdf, dpi=dpi)
+    results.put((len(images), _status_bytes('VmHWM') - baseline))
+
+
+class Command(BaseCommand):
+    help = 'OCR a large synthetic scanned PDF and fail if peak page memory exceeds the OCR memory budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=30, help='Pages of the scanned PDF')
+        parser.add_argument('--budget-mb', type=int, default=512, help='OCR memory budget in MB')
+        parser.add_argument('--workers', type=int, default=4, help='OCR pool size')
+        parser.add_argument('--dpi', type=int, default=300, help='Requested rendering resolution')
+        parser.add_argument('--compare', action='store_true', help='Also measure rendering every page at once')
+
+    def handle(self, *args, **options):
+        if not OCR_ENABLED:
+            raise CommandError("OCR is not available: install tesseract, pytesseract and pdf2image")
+
+        # About 45 lines per page; repeat CVs until the PDF has the requested pages
+        lines = []
+        for text in generate_cv_texts(count=options['pages'], seed=13):
+            lines.extend(text.split('\n'))
+        pdf = scanned_pdf_bytes('\n'.join(lines[:options['pages'] * 45]), dpi=200)
+        budget = options['budget_mb'] * 2 ** 20
+        self.stdout.write(f"Scanned PDF: {options['pages']} pages, {len(pdf) / 2 ** 20:.1f} MB")
+
+        if options['compare']:
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_render_all_pages, args=(pdf, options['dpi'], results))
+            process.start()
+            pages, used = results.get()
+            process.join()
+            self.stdout.write(f"  all pages at once: {used / 2 ** 20:.0f} MB for {pages} rendered pages")
+
+        stats = {}
+        baseline = _reset_peak()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ocr_pdf(
+                pdf, dpi=options['dpi'], workers=options['workers'], max_pages=options['pages'],
+                deadline=3600, memory_budget=budget, stats=stats
+            )
+        seconds = time.perf_counter() - start
+        parent = _status_bytes('VmHWM') - baseline if baseline is not None else 0
+
+        in_flight = stats['peak_page_bytes'] * stats['pages_in_flight']
+        dpis = sorted(set(stats['dpi'].values()), reverse=True)
+        self.stdout.write(
+            f"  streaming: {stats['pages_done']}/{stats['pages']} pages in {seconds:.1f} s at {dpis} DPI, "
+            f"peak {stats['peak_page_bytes'] / 2 ** 20:.0f} MB per page x {stats['pages_in_flight']} in flight, "
+            f"caller grew by {parent / 2 ** 20:.0f} MB"
+        )
+        if in_flight > budget:
+            raise CommandError(
+                f"Peak OCR memory {in_flight / 2 ** 20:.0f} MB is over the {options['budget_mb']} MB budget"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Peak OCR memory within the {options['budget_mb']} MB budget"))
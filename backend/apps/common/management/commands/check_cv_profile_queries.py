@@ -0,0 +1,86 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.users.profile_management.cv_queue import update_user_profile, update_user_profiles
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _extracted_data(entries):
+    """Extracted CV data with ``entries`` qualifications and jobs, half of them repeated."""
+    return {
+        'personal_info': {'phone_number': '+254700000000', 'city': 'Nairobi'},
+        'experience': {'current_job_title': 'First Officer', 'years_of_experience': 6},
+        'qualifications': [
+            {
+                'institution': f"Aviation College {i % max(1, entries // 2)}",
+                'course_of_study': 'Aeronautical Engineering',
+                'highest_education_level': 'degree',
+                'expected_graduation_year': '2015',
+            }
+            for i in range(entries)
+        ],
+        'employment_history': [
+            {
+                'company_name': f"Airline {i % max(1, entries // 2)}",
+                'job_title': 'First Officer',
+                'start_date': datetime.date(2015 + i % 5, 1, 1),
+                'responsibilities': 'Line flying',
+            }
+            for i in range(entries)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = ('Count the queries of applying extracted CV data to profiles and fail if they grow '
+            'with the number of entries or CVs; everything is rolled back')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=str, default='1,5,20,100', help='Comma-separated entries per CV')
+        parser.add_argument('--users', type=int, default=20, help='CVs applied at once by the bulk path')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.check(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def check(self, options):
+        counts = {}
+        for entries in [int(count) for count in options['entries'].split(',')]:
+            user = User.objects.create_user(email=f"cv-queries-{entries}@example.com", full_name='Query Check')
+            data = _extracted_data(entries)
+            with CaptureQueriesContext(connection) as first:
+                update_user_profile(user, data)
+            # Again with the same CV: nothing is left to add
+            with CaptureQueriesContext(connection) as again:
+                update_user_profile(user, data)
+            counts[entries] = len(first)
+            added = (user.qualifications.count(), user.employment_history.count())
+            if added != (max(1, entries // 2),) * 2:
+                raise CommandError(f"{entries} entries with {max(1, entries // 2)} distinct added {added}")
+            self.stdout.write(f"  one CV, {entries:4} entries: {len(first)} queries, {len(again)} applied again")
+
+        users = [
+            User.objects.create_user(email=f"cv-queries-bulk-{i}@example.com", full_name='Query Check')
+            for i in range(options['users'])
+        ]
+        with CaptureQueriesContext(connection) as bulk:
+            update_user_profiles([(user, _extracted_data(10)) for user in users])
+        self.stdout.write(f"  {len(users)} CVs at once, 10 entries each: {len(bulk)} queries")
+
+        # bulk_create may split large batches, on SQLite for example, but never per CV
+        if len(set(counts.values())) > 1 or len(bulk) >= 2 * max(counts.values()):
+            raise CommandError(f"Query count grows with the data: {counts} per CV, {len(bulk)} for {len(users)} CVs")
+        self.stdout.write(self.style.SUCCESS(f"Constant: {max(counts.values())} queries per profile update"))
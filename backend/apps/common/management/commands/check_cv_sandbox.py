@@ -0,0 +1,125 @@
+import contextlib
+import importlib.util
+import io
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from apps.common.cv_corpus import (
+    decompression_bomb_pdf_bytes,
+    generate_cv_texts,
+    partly_scanned_pdf_bytes,
+    pdf_bytes,
+    scanned_pdf_bytes,
+    slow_text_pdf_bytes,
+)
+from apps.users.profile_management.cv_ocr import _status_bytes
+from apps.users.profile_management.cv_processing_logic import OCR_ENABLED
+from apps.users.profile_management.cv_sandbox import (
+    CVSandboxCPUError,
+    CVSandboxMemoryError,
+    CVSandboxTimeout,
+    SandboxPool,
+    extract_cv_information_sandboxed,
+)
+
+
+class Command(BaseCommand):
+    help = ('Extract hostile and broken PDFs in the CV sandbox and fail unless each one is stopped by the '
+            'expected limit, quickly, while valid CVs before and after it extract normally')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--memory-mb', type=int, default=256, help='Memory limit of the sandbox workers')
+        parser.add_argument('--cpu-seconds', type=int, default=2, help='CPU time limit per CV')
+        parser.add_argument('--timeout', type=float, default=3.0, help='Wall-clock limit per CV, CPU limit off')
+        parser.add_argument('--max-seconds', type=float, default=15.0,
+                            help='Time in which every CV must be extracted or stopped')
+        parser.add_argument('--ocr-seconds', type=float, default=120.0,
+                            help='Time in which the scanned CV must be OCRed, with the default sandbox limits')
+
+    def handle(self, *args, **options):
+        text = generate_cv_texts(count=1, seed=7)[0]
+        valid = pdf_bytes(text)
+        limited = SandboxPool(workers=1, memory_mb=options['memory_mb'], cpu_seconds=options['cpu_seconds'],
+                              timeout=options['max_seconds'])
+        # Without a CPU limit, so only the wall-clock one can stop the slow PDF
+        unlimited_cpu = SandboxPool(workers=1, memory_mb=options['memory_mb'], cpu_seconds=0,
+                                    timeout=options['timeout'])
+        # The default limits, with OCR in a pool of its own processes inside the worker
+        default_limits = SandboxPool(workers=1, timeout=options['ocr_seconds'])
+
+        # (name, file contents, pool, exception expected or None for a normal result, seconds allowed)
+        cases = [
+            ('valid', valid, limited, None, options['max_seconds']),
+            ('truncated', valid[:len(valid) // 2], limited, None, options['max_seconds']),
+            ('not_a_pdf', os.urandom(64 * 1024), limited, None, options['max_seconds']),
+            ('decompression_bomb', decompression_bomb_pdf_bytes(options['memory_mb'] * 4), limited,
+             CVSandboxMemoryError, options['max_seconds']),
+            ('valid_after_bomb', valid, limited, None, options['max_seconds']),
+            ('slow_text_cpu', slow_text_pdf_bytes(), limited, CVSandboxCPUError, options['max_seconds']),
+            ('valid_after_cpu', valid, limited, None, options['max_seconds']),
+            ('slow_text_timeout', slow_text_pdf_bytes(), unlimited_cpu, CVSandboxTimeout, options['max_seconds']),
+            ('valid_after_timeout', valid, unlimited_cpu, None, options['max_seconds']),
+            # The text layer of the pages after a scanned cover is read with or without OCR
+            ('partly_scanned', partly_scanned_pdf_bytes(text.split('\n', 1)[0], text), default_limits, None,
+             options['ocr_seconds']),
+        ]
+        ocr_available = (
+            OCR_ENABLED and importlib.util.find_spec('pdf2image') is not None
+            and shutil.which('tesseract') and shutil.which('pdftoppm')
+        )
+        if ocr_available:
+            cases.append(('scanned', scanned_pdf_bytes(text), default_limits, None, options['ocr_seconds']))
+        else:
+            self.stdout.write(self.style.WARNING(
+                'OCR is not installed (pytesseract, pdf2image, tesseract, poppler): scanned CV not checked'
+            ))
+
+        failures = []
+        rss_before = _status_bytes('VmRSS')
+        try:
+            for name, data, pool, expected, max_seconds in cases:
+                start = time.perf_counter()
+                try:
+                    # Workers are forked inside, and keep the redirected output; at
+                    # least two OCR processes, so OCR starts its own pool in the worker
+                    metrics = {}
+                    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()), \
+                            override_settings(CV_OCR_WORKERS=max(2, settings.CV_OCR_WORKERS)):
+                        extract_cv_information_sandboxed(
+                            ContentFile(data, name=f"{name}.pdf"), use_cache=False, metrics=metrics, pool=pool
+                        )
+                    outcome, error = 'extracted', None
+                except Exception as e:
+                    outcome, error = type(e).__name__, e
+                seconds = time.perf_counter() - start
+                self.stdout.write(f"  {name:20} {len(data) / 1024:8.0f} KB {seconds:6.2f} s  {outcome}"
+                                  + (f": {error}" if error else ''))
+
+                if expected is None and error is not None:
+                    failures.append(f"{name}: expected a result, got {outcome}: {error}")
+                elif expected is not None and not isinstance(error, expected):
+                    failures.append(f"{name}: expected {expected.__name__}, got {outcome}")
+                elif name.startswith('valid') and not metrics.get('text_length'):
+                    failures.append(f"{name}: no text extracted from a valid CV")
+                elif name in ('scanned', 'partly_scanned') and metrics.get('text_length', 0) < len(text) // 2:
+                    failures.append(f"{name}: found {metrics.get('text_length', 0)} characters "
+                                    f"of the {len(text)} on the pages")
+                if seconds > max_seconds:
+                    failures.append(f"{name}: took {seconds:.1f} s")
+        finally:
+            limited.close()
+            unlimited_cpu.close()
+            default_limits.close()
+
+        rss_after = _status_bytes('VmRSS')
+        if rss_before and rss_after:
+            self.stdout.write(f"Memory of this process: {rss_before / 2 ** 20:.0f} MB before, {rss_after / 2 ** 20:.0f} MB after")
+        if failures:
+            raise CommandError('Sandbox did not contain every CV:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS(f"All {len(cases)} CVs extracted or stopped by the expected limit"))
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.job_applications.models import JobApplication
+from apps.jobs_postings.models import SHORTLIST_SIZE, JobPosting, JobTrack
+from apps.jobs_postings.serializers import JobPostingSerializer
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Count the queries of serializing job postings with their counters and shortlists, and fail '
+            'if they grow with the number of postings; everything is rolled back')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--postings', type=str, default='1,5,20', help='Comma-separated postings serialized at once')
+        parser.add_argument('--applicants', type=int, default=12, help='Applications per posting, half of them shortlisted')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.check(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def check(self, options):
+        sizes = [int(count) for count in options['postings'].split(',')]
+        recruiter = User.objects.create_user(
+            email='job-queries-recruiter@example.com', full_name='Query Check', role='recruiter'
+        )
+        professionals = [
+            User.objects.create_user(
+                email=f"job-queries-{i}@example.com", full_name=f"Query Check{i}", role='professional'
+            )
+            for i in range(options['applicants'])
+        ]
+        postings = [
+            JobPosting.objects.create(
+                recruiter=recruiter, title=f"First Officer {i}", aircraft_type='B737', description='Line flying',
+                qualifications='ATPL', location='Nairobi', job_type='full-time',
+            )
+            for i in range(max(sizes))
+        ]
+        # Created in bulk, so the notification signals of JobApplication stay quiet
+        JobApplication.objects.bulk_create(
+            JobApplication(
+                job=posting, applicant=professional, cover_letter='x' * 100,
+                status='shortlisted' if i % 2 else 'submitted', profile_score=(i * 37 + j * 11) % 100,
+            )
+            for j, posting in enumerate(postings)
+            for i, professional in enumerate(professionals)
+        )
+        JobTrack.objects.bulk_create(
+            JobTrack(job=posting, user=professional) for posting in postings for professional in professionals[:3]
+        )
+        ids = [posting.pk for posting in postings]
+        # bulk_create sends no signals either, so the counters are counted afterwards
+        JobPosting.objects.filter(pk__in=ids).reconcile_counters()
+
+        counts = {}
+        for size in sizes:
+            with CaptureQueriesContext(connection) as queries:
+                data = JobPostingSerializer(JobPosting.objects.filter(pk__in=ids[:size]).for_serializer(), many=True).data
+            counts[size] = len(queries)
+            self.stdout.write(f"  {size:4} postings: {len(queries)} queries")
+
+        # The prefetched shortlists must be those of the per-posting queries, the counters the actual counts
+        with CaptureQueriesContext(connection) as fallback:
+            expected = {item['id']: item for item in JobPostingSerializer(
+                JobPosting.objects.filter(pk__in=ids), many=True
+            ).data}
+        self.stdout.write(f"  {len(ids):4} postings, shortlists queried per posting: {len(fallback)} queries")
+        actual = {job.pk: job for job in JobPosting.objects.filter(pk__in=ids).with_actual_counts()}
+        for item in data:
+            if item['shortlisted_applicants'] != expected[item['id']]['shortlisted_applicants']:
+                raise CommandError(f"Posting {item['id']}: prefetched shortlist differs from the per-posting one")
+            for field, counter in (('num_applicants', 'applications_count'), ('num_views', 'views_count'),
+                                   ('num_shortlisted', 'shortlisted_count'), ('num_hired', 'hired_count')):
+                count = getattr(actual[item['id']], f"actual_{counter}")
+                if item[field] != count:
+                    raise CommandError(f"Posting {item['id']}: {field} is {item[field]}, {count} counted")
+            if len(item['shortlisted_applicants']) != min(SHORTLIST_SIZE, options['applicants'] // 2):
+                raise CommandError(f"Posting {item['id']}: {len(item['shortlisted_applicants'])} shortlisted applicants")
+
+        if len(set(counts.values())) > 1:
+            raise CommandError(f"Query count grows with the number of postings: {counts}")
+        self.stdout.write(self.style.SUCCESS(f"Constant: {max(counts.values())} queries per page of postings"))
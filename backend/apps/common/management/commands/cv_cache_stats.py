@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.users.profile_management.cv_cache import cache_stats, evict, evict_pages
+from apps.users.profile_management.models import CVExtractionCache, CVPageOCRCache
+
+
+def _percent(rate):
+    return '-' if rate is None else f"{rate * 100:.1f}%"
+
+
+class Command(BaseCommand):
+    help = 'Report CV extraction cache hit rates and size, and optionally evict or clear it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Days of stats to include')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+        parser.add_argument('--evict', action='store_true', help='Evict entries beyond the configured caps first')
+        parser.add_argument('--clear', action='store_true', help='Delete every cache entry first')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted, _ = CVExtractionCache.objects.all().delete()
+            deleted_pages, _ = CVPageOCRCache.objects.all().delete()
+            self.stdout.write(f"Deleted {deleted} cache entries and {deleted_pages} page entries")
+        if options['evict']:
+            self.stdout.write(f"Evicted {evict()} cache entries and {evict_pages()} page entries")
+
+        stats = cache_stats(days=options['days'])
+        if options['json']:
+            self.stdout.write(json.dumps(stats, indent=2))
+            return
+
+        self.stdout.write(f"Entries: {stats['entries']} ({stats['size_bytes'] / 1024 / 1024:.1f} MB)")
+        self.stdout.write(f"Result hit rate: {_percent(stats['result_hit_rate'])}")
+        self.stdout.write(f"Text hit rate on result misses: {_percent(stats['text_hit_rate'])}")
+        self.stdout.write(f"Scanned page hit rate: {_percent(stats['page_hit_rate'])} ({stats['page_entries']} pages cached)")
+        self.stdout.write(f"Evictions: {stats['totals']['evictions']}")
+        for day in stats['days']:
+            self.stdout.write(
+                f"  {day['day']}: results {_percent(day['result_hit_rate'])}, "
+                f"text {_percent(day['text_hit_rate'])}, pages {_percent(day['page_hit_rate'])}, "
+                f"{day['evictions']} evicted"
+            )
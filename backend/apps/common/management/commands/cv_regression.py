@@ -0,0 +1,160 @@
+import json
+import os
+import re
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.common.cv_corpus import generate_cv_texts
+from apps.users.profile_management.cv_processing_logic import (
+    extract_aviation_licenses,
+    extract_aviation_skills,
+    extract_employment_history,
+    extract_qualifications,
+    extract_qualifications_excluding_licenses,
+    extract_text_from_docx,
+    extract_text_from_pdf,
+)
+from apps.users.profile_management.cv_sections import BOUNDARIES, CVSections
+
+# (header patterns, boundaries) each extractor uses to find its sections
+SECTION_LOOKUPS = [
+    ([r'(?:WORK|EMPLOYMENT) (?:EXPERIENCE|HISTORY)', r'PROFESSIONAL EXPERIENCE', r'EXPERIENCE', r'WORK HISTORY',
+      r'PROFESSIONAL SUMMARY', r'CAREER PROFILE'], ['caps_line', 'after_experience', 'title_and_title']),
+    ([r'\bEDUCATION\b', r'\bACADEMIC BACKGROUND\b', r'\bQUALIFICATIONS\b'], ['caps_line', 'after_education', 'title_and_title']),
+    ([r'CERTIFICATIONS', r'LICENSES'], ['caps_block']),
+    ([r'\bLICENSES\b', r'\bCERTIFICATIONS\b', r'\bPILOT LICENSES\b', r'\bRATINGS\b'], ['caps_line', 'after_licenses']),
+    ([r'\bSKILLS\b', r'\bTECHNICAL SKILLS\b', r'\bAVIATION SKILLS\b'], ['caps_line', 'after_skills']),
+]
+
+
+def legacy_section_ends(text):
+    """Section ends found by rescanning a copy of the rest of the text for every header, as before."""
+    ends = []
+    for headers, boundaries in SECTION_LOOKUPS:
+        for header in headers:
+            for match in re.finditer(header, text, re.IGNORECASE):
+                section_end = len(text)
+                for name in boundaries:
+                    pattern, flags = BOUNDARIES[name]
+                    next_matches = list(re.finditer(pattern, text[match.end():], flags))
+                    if next_matches:
+                        section_end = min(section_end, match.end() + next_matches[0].start())
+                ends.append(section_end)
+    return ends
+
+
+def section_ends(text):
+    sections = CVSections(text)
+    return [
+        sections.section_end(match.end(), boundaries)
+        for headers, boundaries in SECTION_LOOKUPS
+        for header in headers
+        for match in sections.find_all(header)
+    ]
+
+
+def run_extractors(text):
+    """Run the section-based extractors on one CV the way extract_cv_information does."""
+    sections = CVSections(text)
+    results = {}
+    for name, func in [
+        ('employment_history', lambda: extract_employment_history(text, sections=sections)),
+        ('qualifications', lambda: extract_qualifications(text, sections=sections)),
+        ('aviation_licenses', lambda: extract_aviation_licenses(text, sections=sections)),
+        ('aviation_skills', lambda: extract_aviation_skills(text, sections=sections)),
+    ]:
+        try:
+            results[name] = func()
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+    if isinstance(results['aviation_licenses'], list):
+        try:
+            results['qualifications_excluding_licenses'] = extract_qualifications_excluding_licenses(
+                text, results['aviation_licenses'], sections=sections
+            )
+        except Exception as e:
+            results['qualifications_excluding_licenses'] = {'error': f"{type(e).__name__}: {e}"}
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Record or check the output of the section-based CV extractors on a CV corpus, and time them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--record', type=str, help='Write extractor output to this JSON file')
+        parser.add_argument('--check', type=str, help='Compare extractor output with a recorded JSON file')
+        parser.add_argument('--dir', type=str, help='Directory of CV files (.pdf, .docx, .txt) to add to the corpus')
+        parser.add_argument('--synthetic', type=int, default=200, help='Synthetic CVs in the corpus')
+        parser.add_argument('--seed', type=int, default=42, help='Seed for the synthetic CVs')
+        parser.add_argument('--runs', type=int, default=3, help='Timed runs over the corpus')
+
+    def handle(self, *args, **options):
+        texts = self.load_corpus(options['dir'] or os.path.join(settings.BASE_DIR, 'test_files', 'cv_samples'))
+        texts += generate_cv_texts(count=options['synthetic'], seed=options['seed'])
+        self.stdout.write(f"Corpus: {len(texts)} CVs")
+
+        if any(legacy_section_ends(text) != section_ends(text) for text in texts):
+            raise CommandError("Segmenter section ends differ from the legacy slice scans")
+        legacy = self.time_per_cv(texts, options['runs'], legacy_section_ends)
+        segmented = self.time_per_cv(texts, options['runs'], section_ends)
+        self.stdout.write(
+            f"Locating sections: {legacy * 1000:.2f} ms per CV with slice scans, "
+            f"{segmented * 1000:.2f} ms per CV with the segmenter"
+        )
+
+        timings = []
+        for _ in range(options['runs']):
+            start = time.perf_counter()
+            results = [run_extractors(text) for text in texts]
+            timings.append((time.perf_counter() - start) / len(texts))
+        # Round-trip through JSON so recorded and fresh results compare alike
+        results = json.loads(json.dumps(results, cls=DjangoJSONEncoder))
+        self.stdout.write(f"Extractors: {statistics.median(timings) * 1000:.2f} ms per CV")
+
+        if options['record']:
+            with open(options['record'], 'w') as f:
+                json.dump(results, f, indent=1)
+            self.stdout.write(self.style.SUCCESS(f"Recorded output to {options['record']}"))
+
+        if options['check']:
+            with open(options['check']) as f:
+                expected = json.load(f)
+            if len(expected) != len(results):
+                raise CommandError(f"Recorded corpus has {len(expected)} CVs, current corpus has {len(results)}")
+            mismatches = 0
+            for position, (old, new) in enumerate(zip(expected, results)):
+                for name in sorted(set(old) | set(new)):
+                    if old.get(name) != new.get(name):
+                        mismatches += 1
+                        self.stdout.write(self.style.ERROR(f"CV {position}: {name} differs"))
+            if mismatches:
+                raise CommandError(f"{mismatches} extractor results differ from {options['check']}")
+            self.stdout.write(self.style.SUCCESS(f"All extractor results match {options['check']}"))
+
+    def time_per_cv(self, texts, runs, func):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            for text in texts:
+                func(text)
+            timings.append((time.perf_counter() - start) / len(texts))
+        return statistics.median(timings)
+
+    def load_corpus(self, directory):
+        texts = []
+        if not os.path.isdir(directory):
+            return texts
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.join(directory, filename)
+            if filename.endswith('.pdf'):
+                texts.append(extract_text_from_pdf(path))
+            elif filename.endswith('.docx'):
+                texts.append(extract_text_from_docx(path))
+            elif filename.endswith('.txt'):
+                with open(path, encoding='utf-8', errors='ignore') as f:
+                    texts.append(f.read())
+        return [text for text in texts if text.strip()]
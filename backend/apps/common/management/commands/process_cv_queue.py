@@ -0,0 +1,45 @@
+import multiprocessing
+import os
+import socket
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.users.profile_management.cv_queue import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Run worker processes that process queued CV uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        worker_prefix = f"{socket.gethostname()}-{os.getpid()}"
+        self.stdout.write(self.style.SUCCESS(f"Starting {workers} CV queue worker(s)"))
+
+        if workers == 1:
+            run_worker(f"{worker_prefix}-1", options['poll_interval'], options['once'])
+            return
+
+        # Each forked worker opens its own database connection
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(
+                target=run_worker,
+                args=(f"{worker_prefix}-{index + 1}", options['poll_interval'], options['once'])
+            )
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.profile_management.cv_metrics import prune_metrics
+
+
+class Command(BaseCommand):
+    help = ('Delete the CV extraction metrics older than CV_METRICS_RETENTION_DAYS; run it periodically '
+            'when CV_METRICS_PRUNE_EVERY is 0')
+
+    def handle(self, *args, **options):
+        deleted = prune_metrics()
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} CV extraction metrics older than {settings.CV_METRICS_RETENTION_DAYS} days"
+        ))
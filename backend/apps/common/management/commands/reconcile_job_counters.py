@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.jobs_postings.models import COUNTER_FIELDS, JobPosting
+
+
+class Command(BaseCommand):
+    help = ('Recount the application, shortlisted, hired and view counters of job postings and fix the '
+            'ones that drifted, a batch of postings per transaction')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Postings checked per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Report drifted postings, write nothing')
+        parser.add_argument('--verbose-drift', action='store_true', help='Print the stored and actual counts of each drifted posting')
+        parser.add_argument('--batch-pause', type=float, default=0.0, help='Seconds to sleep after each batch')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        checked = drifted = fixed = 0
+        last_id = 0
+        while True:
+            ids = list(
+                JobPosting.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            with transaction.atomic():
+                drift = list(
+                    JobPosting.objects.filter(pk__in=ids).drifted().order_by('pk').values(
+                        'pk', *COUNTER_FIELDS, *(f"actual_{field}" for field in COUNTER_FIELDS)
+                    )
+                )
+                if drift and not options['dry_run']:
+                    fixed += JobPosting.objects.filter(pk__in=[row['pk'] for row in drift]).reconcile_counters()
+            checked += len(ids)
+            drifted += len(drift)
+            if options['verbose_drift']:
+                for row in drift:
+                    changes = ', '.join(
+                        f"{field} {row[field]} -> {row[f'actual_{field}']}"
+                        for field in COUNTER_FIELDS if row[field] != row[f"actual_{field}"]
+                    )
+                    self.stdout.write(f"  posting {row['pk']}: {changes}")
+            if options['batch_pause']:
+                time.sleep(options['batch_pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{checked} postings checked in {time.perf_counter() - start:.1f} s, {drifted} drifted, "
+            f"{'none fixed (dry run)' if options['dry_run'] else f'{fixed} fixed'}"
+        ))
@@ -0,0 +1,237 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.users.profile_management.cv_processing_logic import CV_PARSER_VERSION, extract_cv_information
+from apps.users.profile_management.cv_queue import plan_profile_updates, update_user_profile, update_user_profiles
+from apps.users.profile_management.cv_sandbox import extract_cv_information_sandboxed
+from apps.users.profile_management.models import ProfessionalDocument
+
+User = get_user_model()
+
+DEFAULT_CHECKPOINT = os.path.join(settings.BASE_DIR, '.reprocess_cvs.json')
+
+
+def _init_worker():
+    # Connections inherited from the parent are dropped, not closed: closing
+    # would end the parent's session. The worker opens its own when needed.
+    for connection in connections.all(initialized_only=True):
+        connection.connection = None
+
+
+def _extract(document_id, cv_name, use_cache):
+    """
+    Extract one stored CV in a pool worker; returns (document id, extracted data, error).
+
+    As in process_cv_queue, the CV is extracted in the sandbox when
+    CV_SANDBOX_ENABLED is on, so a CV over its limits fails only its document.
+    """
+    close_old_connections()
+    cv_file = ProfessionalDocument(pk=document_id, cv=cv_name).cv
+    extract = extract_cv_information_sandboxed if settings.CV_SANDBOX_ENABLED else extract_cv_information
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return document_id, extract(cv_file, use_cache=use_cache), None
+    except Exception as e:
+        return document_id, None, f"{type(e).__name__}: {e}"
+
+
+class Command(BaseCommand):
+    help = ('Re-extract every stored professional CV in a process pool and refresh the profiles, '
+            'in batched transactions, resuming from a checkpoint')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1), help='Extraction processes')
+        parser.add_argument('--batch-size', type=int, default=50, help='CVs per extraction batch and per profile transaction')
+        parser.add_argument('--checkpoint', type=str, default=DEFAULT_CHECKPOINT, help='Checkpoint file')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and start from the first document')
+        parser.add_argument('--limit', type=int, help='Stop after this many documents')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Extract and report changes, write nothing: no profiles, cache entries or metrics')
+        parser.add_argument('--diff', action='store_true', help='With --dry-run, print the changes for every document')
+        parser.add_argument('--no-cache', action='store_true', help='Extract every CV again, ignoring the extraction cache')
+        parser.add_argument('--max-rate', type=float, help='Documents per second at most')
+        parser.add_argument('--batch-pause', type=float, default=0.0, help='Seconds to sleep after each profile transaction')
+        parser.add_argument('--benchmark', type=str,
+                            help='Comma-separated worker counts: time a dry run of --limit documents with each')
+
+    def handle(self, *args, **options):
+        if options['benchmark']:
+            self.benchmark(options)
+            return
+
+        checkpoint = self.load_checkpoint(options)
+        if checkpoint['last_id']:
+            self.stdout.write(
+                f"Resuming after document {checkpoint['last_id']} "
+                f"({checkpoint['processed']} processed, {checkpoint['failed']} failed so far)"
+            )
+        totals = self.reprocess(options, checkpoint)
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['processed']} CVs in {totals['seconds']:.1f} s ({totals['rate']:.2f} docs/s), "
+            f"{totals['failed']} failed, {totals['changed']} profiles {'would change' if options['dry_run'] else 'updated'}"
+        ))
+
+    def reprocess(self, options, checkpoint):
+        """
+        Extract documents after the checkpoint batch by batch, applying each batch while the next one extracts.
+
+        Dry runs neither read nor write the extraction cache and store no
+        extraction metrics; the pool processes are forked with those settings.
+        """
+        if options['dry_run']:
+            with override_settings(CV_METRICS_ENABLED=False):
+                return self._reprocess(dict(options, no_cache=True), checkpoint)
+        return self._reprocess(options, checkpoint)
+
+    def _reprocess(self, options, checkpoint):
+        documents = (
+            ProfessionalDocument.objects.exclude(cv='').exclude(cv__isnull=True)
+            .filter(pk__gt=checkpoint['last_id'])
+            .order_by('pk').values_list('pk', 'user_id', 'cv')
+        )
+        if options['limit']:
+            documents = documents[:options['limit']]
+
+        totals = {'processed': 0, 'failed': 0, 'changed': 0}
+        started = time.monotonic()
+        executor = ProcessPoolExecutor(
+            max_workers=options['workers'], mp_context=multiprocessing.get_context('fork'), initializer=_init_worker
+        )
+        try:
+            pending = None
+            for batch in self.batches(documents.iterator(chunk_size=options['batch_size'] * 4), options['batch_size']):
+                submitted = (batch, [
+                    executor.submit(_extract, document_id, cv_name, not options['no_cache'])
+                    for document_id, _, cv_name in batch
+                ])
+                if pending:
+                    self.apply(pending, options, checkpoint, totals)
+                pending = submitted
+                self.throttle(options, started, totals['processed'] + len(batch))
+            if pending:
+                self.apply(pending, options, checkpoint, totals)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        totals['seconds'] = time.monotonic() - started
+        totals['rate'] = totals['processed'] / totals['seconds'] if totals['seconds'] else 0
+        return totals
+
+    def batches(self, rows, size):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def apply(self, pending, options, checkpoint, totals):
+        """Wait for a batch and write its profile updates in one transaction, then checkpoint it."""
+        batch, futures = pending
+        results = [future.result() for future in futures]
+        users = User.objects.in_bulk([user_id for _, user_id, _ in batch])
+        user_ids = {document_id: user_id for document_id, user_id, _ in batch}
+
+        failed, profiles, documents = 0, [], []
+        for document_id, extracted_data, error in results:
+            totals['processed'] += 1
+            user = users.get(user_ids[document_id])
+            if error or not extracted_data or user is None:
+                failed += 1
+                self.stderr.write(f"Document {document_id}: {error or 'nothing extracted'}")
+                continue
+            profiles.append((user, extracted_data))
+            documents.append(document_id)
+
+        if options['dry_run']:
+            changes, _ = plan_profile_updates(profiles)
+            for document_id, (user, _), profile_changes in zip(documents, profiles, changes):
+                if any(profile_changes.values()):
+                    totals['changed'] += 1
+                    if options['diff']:
+                        self.stdout.write(f"Document {document_id} ({user.email}): " + json.dumps(
+                            {key: value for key, value in profile_changes.items() if value}, cls=DjangoJSONEncoder
+                        ))
+        else:
+            try:
+                changes = update_user_profiles(profiles)
+            except Exception as e:
+                # Apply the batch again one profile at a time, so one bad update only fails its own document
+                self.stderr.write(f"Batch update failed ({e}), updating profiles one by one")
+                changes = []
+                for document_id, (user, extracted_data) in zip(documents, profiles):
+                    try:
+                        changes.append(update_user_profile(user, extracted_data))
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"Document {document_id}: profile update failed: {e}")
+            totals['changed'] += sum(1 for profile_changes in changes if any(profile_changes.values()))
+        totals['failed'] += failed
+
+        if not options['dry_run']:
+            checkpoint['last_id'] = batch[-1][0]
+            checkpoint['processed'] += len(results)
+            checkpoint['failed'] += failed
+            checkpoint['updated_at'] = timezone.now().isoformat()
+            self.save_checkpoint(options['checkpoint'], checkpoint)
+        if options['batch_pause']:
+            time.sleep(options['batch_pause'])
+
+    def throttle(self, options, started, submitted):
+        """Sleep so that no more than --max-rate documents per second are submitted."""
+        if not options['max_rate']:
+            return
+        ahead = submitted / options['max_rate'] - (time.monotonic() - started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+    def load_checkpoint(self, options):
+        fresh = {'last_id': 0, 'processed': 0, 'failed': 0, 'parser_version': CV_PARSER_VERSION}
+        if options['restart'] or options['dry_run'] or not os.path.exists(options['checkpoint']):
+            return fresh
+        with open(options['checkpoint']) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('parser_version') != CV_PARSER_VERSION:
+            self.stdout.write(self.style.WARNING(
+                f"Checkpoint is for parser version {checkpoint.get('parser_version')}, "
+                f"now {CV_PARSER_VERSION}: starting from the first document"
+            ))
+            return fresh
+        return checkpoint
+
+    def save_checkpoint(self, path, checkpoint):
+        # Written to a temporary file and renamed, so an interrupted write leaves the previous checkpoint
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, path)
+
+    def benchmark(self, options):
+        if not options['limit']:
+            raise CommandError('--benchmark needs --limit, the number of documents to time')
+        # A dry run, so without the cache (later runs would just read what earlier ones extracted) or metrics
+        options = dict(options, dry_run=True, diff=False, no_cache=True, max_rate=None, batch_pause=0.0)
+        baseline = None
+        for workers in [int(count) for count in options['benchmark'].split(',')]:
+            totals = self.reprocess(dict(options, workers=workers), {'last_id': 0, 'processed': 0, 'failed': 0})
+            baseline = baseline or totals['rate'] or None
+            speedup = f"{totals['rate'] / baseline:.2f}x" if baseline else '-'
+            self.stdout.write(
+                f"  {workers:2} workers: {totals['rate']:.2f} docs/s "
+                f"({totals['processed']} CVs in {totals['seconds']:.1f} s), speedup {speedup}"
+            )
@@ -1,10 +1,11 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 
+from apps.jobs_postings.models import JobPosting, adjust_counters, application_counter_deltas
 from apps.users.models import User
 from .models import JobApplication, JobApplicationActivity
 
@@ -26,9 +27,13 @@ def create_initial_activity(sender, instance, created, **kwargs):
 @receiver(pre_save, sender=JobApplication)
 def track_status_changes(sender, instance, **kwargs):
     """Track changes in application status."""
-    if instance.pk:
+    # The id is set on creation, so _state tells new applications apart
+    instance._counted = None
+    if instance.pk and not instance._state.adding:
         try:
             old_instance = JobApplication.objects.get(pk=instance.pk)
+            # What the posting counters hold for this application, for update_job_counters
+            instance._counted = (old_instance.job_id, old_instance.status)
             
             # If status changed, record the timestamp
             if old_instance.status != instance.status:
@@ -39,6 +44,34 @@ def track_status_changes(sender, instance, **kwargs):
             pass  
 
 
+@receiver(post_save, sender=JobApplication)
+def update_job_counters(sender, instance, created, **kwargs):
+    """Keep the application counters of the job posting in step with a new or changed application."""
+    counted = None if created else getattr(instance, '_counted', None)
+    if counted == (instance.job_id, instance.status):
+        return
+    deltas = application_counter_deltas(instance.status)
+    if counted:
+        old_job_id, old_status = counted
+        old_deltas = application_counter_deltas(old_status, sign=-1)
+        if old_job_id == instance.job_id:
+            # One UPDATE for a status change
+            deltas = {field: deltas.get(field, 0) + old_deltas.get(field, 0) for field in deltas.keys() | old_deltas.keys()}
+        else:
+            adjust_counters(old_job_id, **old_deltas)
+    adjust_counters(instance.job_id, **deltas)
+
+
+@receiver(post_delete, sender=JobApplication)
+def remove_from_job_counters(sender, instance, **kwargs):
+    """Take a deleted application off the counters of its job posting."""
+    origin = kwargs.get('origin')
+    if isinstance(origin, JobPosting) or getattr(origin, 'model', None) is JobPosting:
+        # Deleted along with the posting itself
+        return
+    adjust_counters(instance.job_id, **application_counter_deltas(instance.status, sign=-1))
+
+
 @receiver(post_save, sender=JobApplication)
 def notify_status_change(sender, instance, created, **kwargs):
     """Send notifications when application status changes."""
@@ -410,19 +410,20 @@ class ApplicationStatsView(APIView):
                 one_week_ago = timezone.now() - timezone.timedelta(days=7)
                 
                 status_counts = applications.aggregate(
-                    total=Count('id'),
                     active=Count('id', filter=Q(
                         status__in=['submitted', 'under_review', 'shortlisted', 'interview', 'offer_extended']
                     )),
                     new=Count('id', filter=Q(status='submitted', created_at__gte=one_week_ago))
                 )
+                # Totals from the counter columns of the postings
+                job_breakdown = self._get_job_breakdown(jobs)
                 
                 stats = {
-                    'total_applications': status_counts['total'],
+                    'total_applications': sum(job['count'] for job in job_breakdown.values()),
                     'active_applications': status_counts['active'],
                     'new_applications': status_counts['new'],
                     'status_breakdown': self._get_status_breakdown(applications),
-                    'job_breakdown': self._get_job_breakdown(applications),
+                    'job_breakdown': job_breakdown,
                     'recent_activity': self._get_recent_activity(applications, user),
                 }
             
@@ -440,11 +441,21 @@ class ApplicationStatsView(APIView):
         from django.db.models import Count
         return dict(applications.values('status').annotate(count=Count('id')).values_list('status', 'count'))
     
-    def _get_job_breakdown(self, applications):
-        """Get counts of applications by job (for recruiters)."""
-        from django.db.models import Count
-        job_stats = applications.values('job__title', 'job_id').annotate(count=Count('id'))
-        return {item['job_id']: {'title': item['job__title'], 'count': item['count']} for item in job_stats}
+    def _get_job_breakdown(self, jobs):
+        """Get counts of applications by job (for recruiters), from the job counters."""
+        job_stats = jobs.filter(applications_count__gt=0).values(
+            'id', 'title', 'applications_count', 'shortlisted_count', 'hired_count', 'views_count'
+        )
+        return {
+            item['id']: {
+                'title': item['title'],
+                'count': item['applications_count'],
+                'shortlisted': item['shortlisted_count'],
+                'hired': item['hired_count'],
+                'views': item['views_count'],
+            }
+            for item in job_stats
+        }
     
     def _get_recent_activity(self, applications, user):
         """Get recent application activities with optimized query."""
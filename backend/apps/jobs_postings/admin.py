@@ -17,13 +17,14 @@ class JobAttachmentInline(admin.TabularInline):
 class JobPostingAdmin(admin.ModelAdmin):
     list_display = ('title', 'aircraft_type', 'recruiter', 'department', 'location', 
                     'is_remote', 'job_type', 'experience_level', 'is_urgent', 
-                    'visibility', 'status', 'created_at')
+                    'visibility', 'status', 'applications_count', 'views_count', 'created_at')
     list_filter = ('status', 'job_type', 'aircraft_type', 'experience_level', 
                    'is_remote', 'is_urgent', 'visibility', 'department')
     search_fields = ('title', 'description', 'responsibilities', 'aircraft_type', 
                      'location', 'department', 'contact_email')
     date_hierarchy = 'created_at'
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'applications_count', 'shortlisted_count',
+                       'hired_count', 'views_count')
     inlines = [JobAttachmentInline]
     fieldsets = (
         ('Basic Information', {
@@ -40,7 +41,8 @@ class JobPostingAdmin(admin.ModelAdmin):
             'fields': ('salary_min', 'salary_max', 'benefits')
         }),
         ('Aviation Requirements', {
-            'fields': ('license_requirements', 'total_flying_hours_required', 
+            'fields': ('license_requirements', 'required_license_types', 'required_licenses',
+                      'total_flying_hours_required', 
                       'specific_aircraft_hours_required', 'medical_certification_required')
         }),
         ('Dates', {
@@ -49,6 +51,9 @@ class JobPostingAdmin(admin.ModelAdmin):
         ('Status & Visibility', {
             'fields': ('status', 'visibility', 'is_urgent', 'application_url')
         }),
+        ('Activity', {
+            'fields': ('applications_count', 'shortlisted_count', 'hired_count', 'views_count')
+        }),
     )
 
 
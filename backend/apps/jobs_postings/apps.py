@@ -5,3 +5,7 @@ class JobsPostingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.jobs_postings'
     verbose_name = 'Job Postings'
+
+    def ready(self):
+        # Import signal handlers
+        import apps.jobs_postings.signals
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:12
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_postings', '0006_rename_jobview_jobtrack'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['required_license_types'], name='jobposting_req_lic_types_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['required_licenses'], name='jobposting_req_licenses_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['total_flying_hours_required'], name='jobposting_total_hours_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['specific_aircraft_hours_required'], name='jobposting_aircraft_hours_idx'),
+        ),
+    ]
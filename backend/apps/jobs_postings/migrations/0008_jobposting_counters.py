@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_existing(apps, schema_editor):
+    JobPosting = apps.get_model('jobs_postings', 'JobPosting')
+    JobTrack = apps.get_model('jobs_postings', 'JobTrack')
+    JobApplication = apps.get_model('job_applications', 'JobApplication')
+
+    def count(queryset):
+        counts = queryset.filter(job=OuterRef('pk')).order_by().values('job').annotate(count=Count('pk')).values('count')
+        return Coalesce(Subquery(counts), 0)
+
+    JobPosting.objects.update(
+        applications_count=count(JobApplication.objects.all()),
+        shortlisted_count=count(JobApplication.objects.filter(status='shortlisted')),
+        hired_count=count(JobApplication.objects.filter(status='hired')),
+        views_count=count(JobTrack.objects.all()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_postings', '0007_jobposting_aviation_matching_indexes'),
+        ('job_applications', '0003_jobapplication_profile_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='shortlisted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='hired_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing, migrations.RunPython.noop),
+    ]
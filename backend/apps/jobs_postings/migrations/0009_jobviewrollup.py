@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDay, TruncHour
+
+
+def roll_up_existing(apps, schema_editor):
+    """One view per existing JobTrack row, in the hour and day of its last view."""
+    JobTrack = apps.get_model('jobs_postings', 'JobTrack')
+    JobViewRollup = apps.get_model('jobs_postings', 'JobViewRollup')
+    for period, trunc in (('hour', TruncHour), ('day', TruncDay)):
+        buckets = JobTrack.objects.annotate(bucket_start=trunc('viewed_at')).order_by().values(
+            'job_id', 'bucket_start'
+        ).annotate(views=Count('pk'))
+        JobViewRollup.objects.bulk_create(
+            (JobViewRollup(period=period, **bucket) for bucket in buckets.iterator()), batch_size=1000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_postings', '0008_jobposting_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobtrack',
+            index=models.Index(fields=['job', '-viewed_at'], name='jobtrack_job_viewed_idx'),
+        ),
+        migrations.CreateModel(
+            name='JobViewRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket_start', models.DateTimeField(help_text='Start of the hour or day, UTC')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_rollups', to='jobs_postings.jobposting')),
+            ],
+            options={
+                'ordering': ['bucket_start'],
+                'unique_together': {('job', 'period', 'bucket_start')},
+            },
+        ),
+        migrations.RunPython(roll_up_existing, migrations.RunPython.noop),
+    ]
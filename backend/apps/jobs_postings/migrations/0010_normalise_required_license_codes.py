@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:20
+
+from django.db import migrations
+
+
+def normalise_codes(apps, schema_editor):
+    JobPosting = apps.get_model('jobs_postings', 'JobPosting')
+
+    def normalise(values):
+        if not isinstance(values, list):
+            return values
+        codes = (str(value).strip().lower() for value in values)
+        return list(dict.fromkeys(code for code in codes if code))
+
+    changed = []
+    postings = JobPosting.objects.exclude(required_license_types=[], required_licenses=[]).only(
+        'id', 'required_license_types', 'required_licenses'
+    )
+    for posting in postings.iterator(chunk_size=2000):
+        license_types = normalise(posting.required_license_types)
+        licenses = normalise(posting.required_licenses)
+        if license_types != posting.required_license_types or licenses != posting.required_licenses:
+            posting.required_license_types = license_types
+            posting.required_licenses = licenses
+            changed.append(posting)
+    JobPosting.objects.bulk_update(changed, ['required_license_types', 'required_licenses'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_postings', '0009_jobviewrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalise_codes, migrations.RunPython.noop),
+    ]
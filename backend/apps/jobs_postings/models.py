@@ -1,12 +1,137 @@
 from django.db import models
+from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery, Window
+from django.db.models.functions import Coalesce, Greatest, RowNumber
+from django.contrib.postgres.indexes import GinIndex
 from django.utils import timezone
 from django.core.files.base import ContentFile
 import base64
+import datetime
 import uuid
 import os
 from apps.users.models import User
 
 
+# Shortlisted applicants shown with each job posting
+SHORTLIST_SIZE = 5
+
+
+def normalise_license_codes(values):
+    """
+    Lower-case, stripped license and rating codes, without blanks or repeats, in their order.
+
+    Job postings store their required codes this way, so that the JSONB
+    containment lookups of job matching can compare them exactly.
+    """
+    codes = (str(value).strip().lower() for value in (values or []))
+    return list(dict.fromkeys(code for code in codes if code))
+
+
+def _count_per_job(queryset):
+    """Number of rows of ``queryset`` (filtered on ``job``) per job posting, 0 for none, as a subquery."""
+    counts = queryset.filter(job=OuterRef('pk')).order_by().values('job').annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts), 0)
+
+
+def shortlisted_applications(limit=SHORTLIST_SIZE):
+    """
+    Shortlisted applications, best profile score first, at most ``limit`` per job.
+
+    The limit is a ROW_NUMBER() window per job, so the applications of any
+    number of postings come in one query.
+    """
+    from apps.job_applications.models import JobApplication
+
+    return JobApplication.objects.filter(status='shortlisted').annotate(
+        shortlist_rank=Window(
+            RowNumber(),
+            partition_by=F('job_id'),
+            order_by=[F('profile_score').desc(), F('created_at').desc()],
+        )
+    ).filter(shortlist_rank__lte=limit).select_related('applicant').order_by('job_id', 'shortlist_rank')
+
+
+# Counter column of JobPosting -> application status it counts; None counts every application
+APPLICATION_COUNTERS = {
+    'applications_count': None,
+    'shortlisted_count': 'shortlisted',
+    'hired_count': 'hired',
+}
+COUNTER_FIELDS = (*APPLICATION_COUNTERS, 'views_count')
+
+
+def _actual_counts():
+    """Counter field -> subquery counting what it should hold per job posting."""
+    from apps.job_applications.models import JobApplication
+
+    counts = {
+        field: _count_per_job(JobApplication.objects.filter(status=status) if status else JobApplication.objects.all())
+        for field, status in APPLICATION_COUNTERS.items()
+    }
+    counts['views_count'] = _count_per_job(JobTrack.objects.all())
+    return counts
+
+
+def application_counter_deltas(status, sign=1):
+    """Changes to the counters of a posting when an application with ``status`` is added (sign 1) or removed (-1)."""
+    return {field: sign for field, counted in APPLICATION_COUNTERS.items() if counted in (None, status)}
+
+
+def adjust_counters(job_id, **deltas):
+    """
+    Add ``deltas`` to the counter columns of one posting, in a single UPDATE.
+
+    The arithmetic is done by the database, so concurrent writers do not
+    overwrite each other's changes; counters never go below 0.
+    """
+    changes = {
+        field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items() if delta
+    }
+    if changes:
+        JobPosting.objects.filter(pk=job_id).update(**changes)
+
+
+class JobPostingQuerySet(models.QuerySet):
+    """Job postings with what JobPostingSerializer shows of them loaded up front."""
+
+    def with_actual_counts(self):
+        """Annotate ``actual_<counter>`` for each counter column, counted with one subquery each."""
+        return self.annotate(**{f"actual_{field}": count for field, count in _actual_counts().items()})
+
+    def with_shortlisted(self, limit=SHORTLIST_SIZE):
+        """Prefetch the top ``limit`` shortlisted applications of each posting into ``top_shortlisted``."""
+        return self.prefetch_related(
+            Prefetch('applications', queryset=shortlisted_applications(limit), to_attr='top_shortlisted')
+        )
+
+    def for_serializer(self):
+        """Everything JobPostingSerializer reads, in a fixed number of queries whatever the number of postings."""
+        return self.select_related('recruiter').prefetch_related('attachments').with_shortlisted()
+
+    def drifted(self):
+        """Postings whose counter columns differ from the rows they count."""
+        drift = Q()
+        for field in COUNTER_FIELDS:
+            drift |= ~Q(**{field: F(f"actual_{field}")})
+        return self.with_actual_counts().filter(drift)
+
+    def reconcile_counters(self, fields=COUNTER_FIELDS):
+        """
+        Recount the counter columns of these postings, in a single UPDATE.
+
+        The counts are subqueries of the UPDATE itself, so changes committed
+        while it runs are not overwritten with stale numbers.
+
+        Args:
+            fields (tuple): Counter columns to recount, all by default
+
+        Returns:
+            int: Number of postings updated
+        """
+        counts = _actual_counts()
+        return self.order_by().update(**{field: counts[field] for field in fields})
+
+
 class JobPosting(models.Model):
     """
     Model for job postings created by recruiters.
@@ -99,8 +224,24 @@ class JobPosting(models.Model):
     )
     internal_notes = models.TextField(blank=True, null=True, help_text="Optional notes visible only to admins")
     
+    # Counters kept up to date by the signals of JobApplication and JobTrack;
+    # reconcile_job_counters fixes any drift
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
+    shortlisted_count = models.PositiveIntegerField(default=0, editable=False)
+    hired_count = models.PositiveIntegerField(default=0, editable=False)
+    views_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = JobPostingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Containment lookups for aviation matching (see Job_matching.aviation_matching)
+            GinIndex(fields=['required_license_types'], name='jobposting_req_lic_types_gin'),
+            GinIndex(fields=['required_licenses'], name='jobposting_req_licenses_gin'),
+            models.Index(fields=['total_flying_hours_required'], name='jobposting_total_hours_idx'),
+            models.Index(fields=['specific_aircraft_hours_required'], name='jobposting_aircraft_hours_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title} - {self.aircraft_type}"
@@ -110,9 +251,26 @@ class JobPosting(models.Model):
         return self.status == 'active' and (self.expiry_date is None or self.expiry_date > timezone.now())
     
     def save(self, *args, **kwargs):
-        """Override save to ensure only recruiters can create job postings."""
+        """
+        Override save to ensure only recruiters can create job postings.
+        
+        Updates leave the counter columns alone: the values loaded with this
+        instance may be stale, and writing them back would undo the changes
+        made by the signals since.
+        
+        Required license codes are stored normalised (see normalise_license_codes).
+        """
         if self.recruiter.role != 'recruiter':
             raise ValueError("Only recruiters can create job postings.")
+        if isinstance(self.required_license_types, list):
+            self.required_license_types = normalise_license_codes(self.required_license_types)
+        if isinstance(self.required_licenses, list):
+            self.required_licenses = normalise_license_codes(self.required_licenses)
+        if self.pk and not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
 
 
@@ -175,6 +333,43 @@ class JobTrack(models.Model):
     class Meta:
         unique_together = ('job', 'user')
         ordering = ['-viewed_at']
+        indexes = [
+            # Most recent viewers of a posting, a page at a time
+            models.Index(fields=['job', '-viewed_at'], name='jobtrack_job_viewed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} viewed {self.job} at {self.viewed_at}"
+
+
+def view_bucket_start(moment, period):
+    """Start of the hour or day (UTC) that ``moment`` falls in."""
+    start = moment.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return start.replace(hour=0) if period == 'day' else start
+
+
+class JobViewRollup(models.Model):
+    """
+    Number of views of a job posting in one hour or one day.
+    
+    Counts every recorded view, repeat views of the same user included;
+    JobTrack keeps one row per viewer. Added to by view_buffer as views are
+    written, so reading the views of a period costs the same whatever their
+    number.
+    """
+    PERIOD_CHOICES = [
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    ]
+    
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='view_rollups')
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    bucket_start = models.DateTimeField(help_text="Start of the hour or day, UTC")
+    views = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ('job', 'period', 'bucket_start')
+        ordering = ['bucket_start']
+    
+    def __str__(self):
+        return f"{self.job} had {self.views} views in the {self.period} from {self.bucket_start}"
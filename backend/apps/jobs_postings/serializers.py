@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import JobPosting, JobAttachment, JobTrack
+from .models import JobPosting, JobAttachment, JobTrack, SHORTLIST_SIZE
 from apps.users.models import User
 import base64
 from django.core.files.base import ContentFile
@@ -29,6 +29,12 @@ class JobTrackSerializer(serializers.ModelSerializer):
         fields = ['id', 'job', 'user', 'viewed_at']
         read_only_fields = ['id', 'viewed_at']
 
+class JobViewBatchSerializer(serializers.Serializer):
+    """Job postings viewed by the requesting user, reported together."""
+    job_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=200
+    )
+
 class JobAttachmentSerializer(serializers.ModelSerializer):
     """
     Serializer for job attachments
@@ -59,7 +65,13 @@ class RecruiterSerializer(serializers.ModelSerializer):
 
 
 class JobPostingSerializer(serializers.ModelSerializer):
-    """Serializer for job posting CRUD operations."""
+    """
+    Serializer for job posting CRUD operations.
+    
+    The counts are the counter columns of the posting. Serialize postings from
+    JobPosting.objects.for_serializer(): their shortlisted applicants are then
+    prefetched instead of being queried per posting.
+    """
     recruiter_details = RecruiterSerializer(source='recruiter', read_only=True)
     attachments = JobAttachmentSerializer(many=True, read_only=True)
     attachment_uploads = serializers.ListField(
@@ -67,8 +79,10 @@ class JobPostingSerializer(serializers.ModelSerializer):
         required=False,
         write_only=True
     )
-    num_applicants = serializers.SerializerMethodField()
-    num_views = serializers.SerializerMethodField()
+    num_applicants = serializers.IntegerField(source='applications_count', read_only=True)
+    num_views = serializers.IntegerField(source='views_count', read_only=True)
+    num_shortlisted = serializers.IntegerField(source='shortlisted_count', read_only=True)
+    num_hired = serializers.IntegerField(source='hired_count', read_only=True)
     shortlisted_applicants = serializers.SerializerMethodField()
     
     class Meta:
@@ -80,36 +94,30 @@ class JobPostingSerializer(serializers.ModelSerializer):
             'contact_email', 'application_url', 'status', 'visibility',
             'is_urgent', 'created_at', 'updated_at', 'expiry_date',
             'expected_start_date', 'license_requirements',
+            'required_license_types', 'required_licenses',
             'total_flying_hours_required', 'specific_aircraft_hours_required',
             'medical_certification_required', 'recruiter', 'recruiter_details',
             'attachments', 'attachment_uploads',
-            'num_applicants', 'num_views', 'shortlisted_applicants'
+            'num_applicants', 'num_views', 'num_shortlisted', 'num_hired',
+            'shortlisted_applicants'
         ]
         read_only_fields = ['recruiter', 'created_at', 'updated_at']
-    def get_num_applicants(self, obj):
-        return obj.applications.count()
-
-    def get_num_views(self, obj):
-        return obj.views.count() if hasattr(obj, 'views') else 0
-
     def get_shortlisted_applicants(self, obj):
-        # Get applications with status 'shortlisted', order by a score (if available)
-        applications = obj.applications.filter(status='shortlisted')
-        # Example: sort by a 'profile_score' field if it exists, else by created_at
-        if applications and hasattr(applications.first(), 'profile_score'):
-            applications = applications.order_by('-profile_score')
-        else:
-            applications = applications.order_by('-created_at')
-        # Return top 5 shortlisted applicants (customize as needed)
+        # Prefetched by JobPosting.objects.with_shortlisted(); one query per posting otherwise
+        applications = getattr(obj, 'top_shortlisted', None)
+        if applications is None:
+            applications = obj.applications.filter(status='shortlisted').select_related('applicant').order_by(
+                '-profile_score', '-created_at'
+            )[:SHORTLIST_SIZE]
         return [
             {
                 'id': app.applicant.id,
                 'name': f"{app.applicant.first_name} {app.applicant.last_name}".strip(),
                 'email': app.applicant.email,
-                'profile_score': getattr(app, 'profile_score', None),
+                'profile_score': app.profile_score,
                 'status': app.status
             }
-            for app in applications[:5]
+            for app in applications
         ]
     
     def create(self, validated_data):
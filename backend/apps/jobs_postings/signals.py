@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import JobPosting, JobTrack, adjust_counters
+
+
+@receiver(post_save, sender=JobTrack)
+def count_job_view(sender, instance, created, **kwargs):
+    """Count a new view on its job posting; a repeat view by the same user only updates the timestamp."""
+    if created:
+        adjust_counters(instance.job_id, views_count=1)
+
+
+@receiver(post_delete, sender=JobTrack)
+def uncount_job_view(sender, instance, **kwargs):
+    """Take a deleted view off the counter of its job posting."""
+    origin = kwargs.get('origin')
+    if isinstance(origin, JobPosting) or getattr(origin, 'model', None) is JobPosting:
+        # Deleted along with the posting itself
+        return
+    adjust_counters(instance.job_id, views_count=-1)
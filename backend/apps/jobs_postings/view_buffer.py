@@ -0,0 +1,222 @@
+"""
+Buffered recording of job posting views.
+
+Recording a view with ``get_or_create`` and a second ``save()`` for repeat
+views takes two or three queries per view, and two concurrent first views of
+the same user race on the unique ``(job, user)`` constraint.
+
+``record_job_views`` adds the views to a buffer of this process instead. The
+buffer keeps each ``(job, user)`` pair once, with the number of times it was
+viewed, and is written in batches, each in one transaction:
+
+* one query keeps the views of postings that still exist;
+* one ``INSERT ... ON CONFLICT (job_id, user_id) DO UPDATE SET viewed_at =
+  EXCLUDED.viewed_at RETURNING job_id, xmax = 0`` adds the new views and
+  moves the timestamp of repeat ones, without racing, and tells which rows it
+  inserted (an inserted row has no deleting transaction, ``xmax``, yet);
+* one UPDATE adds those new viewers to ``views_count`` with ``F()`` (the
+  upsert sends no signals to count them one by one);
+* one INSERT that ignores existing rows and one UPDATE adding with ``F()``
+  count every view, repeats included, into the hour and day JobViewRollup
+  of each posting.
+
+A background thread writes the buffer every ``JOB_VIEW_FLUSH_SECONDS``, or as
+soon as it holds ``JOB_VIEW_BUFFER_SIZE`` views; what is left is written when
+the process exits. With ``JOB_VIEW_BUFFER_SIZE`` 0 every call writes its views
+straight away, in the same queries. ``viewed_at`` is the time of the write, so
+at most ``JOB_VIEW_FLUSH_SECONDS`` late.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .models import JobPosting, JobTrack, JobViewRollup, view_bucket_start
+
+logger = logging.getLogger(__name__)
+
+# Views kept while the database cannot be written, in buffer sizes; more are dropped
+MAX_PENDING_BATCHES = 10
+
+
+def _add_to_rollups(job_views, moment):
+    """Add ``job_views`` (job id -> views) to the hour and day rollups that ``moment`` falls in."""
+    buckets = {period: view_bucket_start(moment, period) for period, _ in JobViewRollup.PERIOD_CHOICES}
+    JobViewRollup.objects.bulk_create(
+        [
+            JobViewRollup(job_id=job_id, period=period, bucket_start=start)
+            for job_id in job_views for period, start in buckets.items()
+        ],
+        ignore_conflicts=True,
+    )
+    in_buckets = Q()
+    for period, start in buckets.items():
+        in_buckets |= Q(period=period, bucket_start=start)
+    JobViewRollup.objects.filter(in_buckets, job_id__in=job_views).update(
+        views=F('views') + Case(
+            *(When(job_id=job_id, then=Value(count)) for job_id, count in job_views.items()), default=Value(0)
+        )
+    )
+
+
+def _upsert_views(pairs, viewed_at):
+    """
+    Insert the (job id, user id) views that are new and move ``viewed_at`` of the others.
+
+    Returns:
+        Counter: New viewers per job id
+    """
+    quote = connection.ops.quote_name
+    job_field, user_field = JobTrack._meta.get_field('job'), JobTrack._meta.get_field('user')
+    job_ids, user_ids = zip(*pairs)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(JobTrack._meta.db_table)} "
+            f"({quote(job_field.column)}, {quote(user_field.column)}, viewed_at) "
+            f"SELECT job_id, user_id, %s FROM unnest(%s::{job_field.db_type(connection)}[], "
+            f"%s::{user_field.db_type(connection)}[]) AS views (job_id, user_id) "
+            f"ON CONFLICT ({quote(job_field.column)}, {quote(user_field.column)}) "
+            f"DO UPDATE SET viewed_at = EXCLUDED.viewed_at "
+            f"RETURNING {quote(job_field.column)}, xmax = 0",
+            [viewed_at, list(job_ids), list(user_ids)],
+        )
+        return Counter(job_id for job_id, inserted in cursor.fetchall() if inserted)
+
+
+def write_job_views(pairs):
+    """
+    Write views in one transaction, whatever their number.
+
+    Args:
+        pairs (iterable or Counter): (job id, user id) pairs, repeated or
+            counted for repeat views; views of postings that no longer exist are skipped
+
+    Returns:
+        int: Views written, repeats included
+    """
+    views = pairs if isinstance(pairs, Counter) else Counter(pairs)
+    if not views:
+        return 0
+    with transaction.atomic():
+        job_ids = set(JobPosting.objects.filter(pk__in={job_id for job_id, _ in views}).values_list('pk', flat=True))
+        views = Counter({pair: count for pair, count in views.items() if pair[0] in job_ids})
+        if not views:
+            return 0
+        now = timezone.now()
+        new_viewers = _upsert_views(views, now)
+        if new_viewers:
+            JobPosting.objects.filter(pk__in=new_viewers).update(views_count=F('views_count') + Case(
+                *(When(pk=job_id, then=Value(count)) for job_id, count in new_viewers.items()), default=Value(0)
+            ))
+        job_views = Counter()
+        for (job_id, _), count in views.items():
+            job_views[job_id] += count
+        _add_to_rollups(job_views, now)
+    return sum(views.values())
+
+
+class JobViewBuffer:
+    """
+    Views waiting to be written, shared by the threads of one process.
+
+    Args:
+        max_size (int): Views that trigger a write, JOB_VIEW_BUFFER_SIZE by default; 0 writes every call
+        flush_seconds (float): Longest a view waits, JOB_VIEW_FLUSH_SECONDS by default
+    """
+
+    def __init__(self, max_size=None, flush_seconds=None):
+        self.max_size = settings.JOB_VIEW_BUFFER_SIZE if max_size is None else max_size
+        self.flush_seconds = flush_seconds or settings.JOB_VIEW_FLUSH_SECONDS
+        self.pid = os.getpid()
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        # Held while writing, so batches are written one after the other
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def add(self, job_id, user_id):
+        self.add_many([(job_id, user_id)])
+
+    def add_many(self, pairs):
+        """Buffer (job id, user id) views; with no buffering, write them now."""
+        if not self.max_size:
+            write_job_views(pairs)
+            return
+        with self._lock:
+            self._pending.update(pairs)
+            full = len(self._pending) >= self.max_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='job-view-buffer', daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write the buffered views now; returns how many were written."""
+        with self._write_lock:
+            with self._lock:
+                pairs, self._pending = self._pending, Counter()
+            if not pairs:
+                return 0
+            try:
+                return write_job_views(pairs)
+            except Exception as e:
+                with self._lock:
+                    if len(self._pending) + len(pairs) <= self.max_size * MAX_PENDING_BATCHES:
+                        self._pending.update(pairs)
+                        logger.error(f"Error writing {len(pairs)} job views, kept for the next write: {str(e)}")
+                    else:
+                        logger.error(f"Error writing {len(pairs)} job views, dropped: {str(e)}")
+                return 0
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                # This thread's connection would otherwise stay open between writes
+                connection.close()
+
+    def close(self):
+        """Stop the background thread and write what is left."""
+        self._closed = True
+        self._wake.set()
+        self.flush()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """The buffer of this process, created on first use; a forked process gets its own."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None or _buffer.pid != os.getpid():
+            _buffer = JobViewBuffer()
+        return _buffer
+
+
+@atexit.register
+def _flush_buffer():
+    if _buffer is not None and _buffer.pid == os.getpid():
+        _buffer.close()
+
+
+def record_job_views(user_id, job_ids):
+    """Record that a user viewed job postings; written within JOB_VIEW_FLUSH_SECONDS."""
+    get_buffer().add_many((job_id, user_id) for job_id in job_ids)
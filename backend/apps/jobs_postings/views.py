@@ -1,19 +1,22 @@
 import logging
+from datetime import timedelta
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from django.db.models import Q
 from django.core.exceptions import ValidationError
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from .models import JobPosting, JobAttachment, JobTrack
+from .models import JobPosting, JobAttachment, JobTrack, JobViewRollup, view_bucket_start
 from .serializers import (
     JobPostingSerializer, JobPostingListSerializer, 
-    JobAttachmentSerializer, JobAttachmentCreateSerializer, JobTrackSerializer
+    JobAttachmentSerializer, JobAttachmentCreateSerializer, JobTrackSerializer,
+    JobViewBatchSerializer
 )
+from .view_buffer import record_job_views
 from core.permissions.permissions import IsRecruiter, IsOwnerOrAdmin
 
 logger = logging.getLogger(__name__)
@@ -132,42 +135,140 @@ class JobPostingCreateView(APIView):
             )
 
 class JobViewTrackAPIView(APIView):
+    """
+    Records that the user viewed a job posting.
+    POST /api/v1/job-postings/<job_id>/track-view/
+    
+    Views are buffered and written in batches (see view_buffer), so the
+    response comes before the view is stored; views of unknown postings are
+    dropped then. The answer is therefore always 202 with {"job_id": ...},
+    where it used to be 201 (200 for a repeat view) with the stored view, or
+    404 for unknown postings.
+    """
     permission_classes = [IsAuthenticated]
 
+    @swagger_auto_schema(
+        operation_description="Record a view of the posting, written within JOB_VIEW_FLUSH_SECONDS",
+        responses={
+            202: openapi.Response("View accepted", openapi.Schema(
+                type=openapi.TYPE_OBJECT, properties={'job_id': openapi.Schema(type=openapi.TYPE_INTEGER)}
+            )),
+        }
+    )
     def post(self, request, job_id):
-        try:
-            job = JobPosting.objects.get(pk=job_id)
-            user = request.user
-            # Only one view per user per job (update timestamp if exists)
-            job_view, created = JobTrack.objects.get_or_create(job=job, user=user)
-            if not created:
-                job_view.viewed_at = timezone.now()
-                job_view.save()
-            serializer = JobTrackSerializer(job_view)
-            return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
-        except JobPosting.DoesNotExist:
-            return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+        record_job_views(request.user.pk, [job_id])
+        return Response({'job_id': job_id}, status=status.HTTP_202_ACCEPTED)
+
+class JobViewBatchAPIView(APIView):
+    """
+    Records that the user viewed several job postings, in one request.
+    POST /api/v1/job-postings/track-views/ with {"job_ids": [...]}
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(request_body=JobViewBatchSerializer)
+    def post(self, request):
+        serializer = JobViewBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        job_ids = set(serializer.validated_data['job_ids'])
+        record_job_views(request.user.pk, job_ids)
+        return Response({'accepted': len(job_ids)}, status=status.HTTP_202_ACCEPTED)
+
+class RecentViewersPagination(CursorPagination):
+    """Pages of the latest viewers of a posting; cursors need no COUNT(*), so every page costs the same."""
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-viewed_at", "-id")
+
+
+# Period -> (buckets returned by default, buckets at most)
+VIEW_STATS_BUCKETS = {
+    'hour': (48, 24 * 31),
+    'day': (30, 366),
+}
+
 
 class JobViewStatsAPIView(APIView):
     """
-    Returns stats and records for job views.
-    GET /api/v1/job-postings/<job_id>/view-stats/
+    Returns view statistics of a job posting.
+    GET /api/v1/job-postings/<job_id>/views/stats/?period=day&buckets=30
+    
+    Views per hour or day come from JobViewRollup, the viewer total from the
+    posting counter and the viewers a cursor page at a time, so a popular
+    posting costs the same to query as an unpopular one. total_views counts
+    viewers, as before; the buckets count every view, repeats included.
     """
     permission_classes = [IsAuthenticated]
 
+    @swagger_auto_schema(
+        operation_description="Views per hour or day, viewer total and a page of the latest viewers",
+        manual_parameters=[
+            openapi.Parameter('period', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="'hour' or 'day', 'day' by default"),
+            openapi.Parameter('buckets', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Hours or days up to the current one, 48 hours or 30 days by default"),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Page of viewers, from the next and previous links"),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Viewers per page, 20 by default, 100 at most"),
+        ],
+        responses={
+            200: "View statistics",
+            400: "Invalid period or buckets",
+            404: "Job not found"
+        }
+    )
     def get(self, request, job_id):
+        period = request.query_params.get('period', 'day')
+        if period not in VIEW_STATS_BUCKETS:
+            return Response(
+                {"error": f"period must be one of: {', '.join(VIEW_STATS_BUCKETS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        default_buckets, max_buckets = VIEW_STATS_BUCKETS[period]
+        try:
+            buckets = int(request.query_params.get('buckets', default_buckets))
+        except ValueError:
+            buckets = 0
+        if not 1 <= buckets <= max_buckets:
+            return Response(
+                {"error": f"buckets must be an integer from 1 to {max_buckets}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             job = JobPosting.objects.get(pk=job_id)
-            views_qs = JobTrack.objects.filter(job=job)
-            total_views = views_qs.count()
-            serializer = JobTrackSerializer(views_qs, many=True)
-            return Response({
-                "job_id": job_id,
-                "total_views": total_views,
-                "view_records": serializer.data
-            })
         except JobPosting.DoesNotExist:
-            return Response({'error': 'Job not found'}, status=404)
+            return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Every bucket up to the current one, 0 for those without views
+        step = timedelta(hours=1) if period == 'hour' else timedelta(days=1)
+        last = view_bucket_start(timezone.now(), period)
+        starts = [last - step * (buckets - 1 - i) for i in range(buckets)]
+        views = dict(
+            JobViewRollup.objects.filter(job=job, period=period, bucket_start__gte=starts[0])
+            .values_list('bucket_start', 'views')
+        )
+        series = [{'start': start, 'views': views.get(start, 0)} for start in starts]
+
+        paginator = RecentViewersPagination()
+        viewers = paginator.paginate_queryset(JobTrack.objects.filter(job=job), request, view=self)
+        return Response({
+            "job_id": job_id,
+            "total_views": job.views_count,
+            "period": period,
+            "period_views": sum(bucket['views'] for bucket in series),
+            "buckets": series,
+            "recent_viewers": {
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": JobTrackSerializer(viewers, many=True).data,
+            },
+        })
+
 class JobPostingDetailView(APIView):
     """
     View for retrieving job posting details.
@@ -199,7 +300,7 @@ class JobPostingDetailView(APIView):
     def _get_job_posting(self, pk):
         """Helper method to retrieve job posting by ID."""
         try:
-            return JobPosting.objects.get(pk=pk)
+            return JobPosting.objects.for_serializer().get(pk=pk)
         except JobPosting.DoesNotExist:
             return None
 
@@ -327,8 +428,9 @@ class RecruiterJobPostingsView(APIView):
             # Get query parameters
             status_filter = request.query_params.get("status", "all")
 
-            # Build queryset - only show jobs posted by this recruiter
-            queryset = JobPosting.objects.filter(recruiter=request.user)
+            # Build queryset - only show jobs posted by this recruiter, with the
+            # counts and shortlists the serializer shows loaded for the whole page
+            queryset = JobPosting.objects.filter(recruiter=request.user).for_serializer()
 
             # Apply status filter if provided and not 'all'
             if status_filter != "all":
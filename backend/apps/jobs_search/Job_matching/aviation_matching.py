@@ -0,0 +1,216 @@
+"""
+Aviation-specific matching: licenses, ratings, aircraft types and flight hours.
+
+The candidate side is loaded once per request into an ``AviationProfile`` and then
+used in two places:
+
+* ``aviation_requirements_filter`` turns it into a SQL filter so PostgreSQL drops
+  jobs the candidate cannot legally fly before anything is scored in Python. The
+  license arrays are backed by GIN indexes and the hour columns by B-tree indexes
+  (see ``JobPosting.Meta.indexes``).
+* ``score_aviation_requirements`` adds an aviation component to the match score
+  for the jobs that survive the filter.
+"""
+from dataclasses import dataclass, field
+
+from django.db.models import F, Q, Value
+from django.db.models.lookups import IContains
+from django.utils import timezone
+
+from apps.jobs_postings.models import normalise_license_codes
+from apps.users.profile_management.models import (
+    LicensesRatings,
+    ProfessionalExperience,
+    ProfessionalRoles,
+)
+
+# Maximum points awarded by the aviation component of the match score
+AVIATION_MAX_SCORE = 20
+
+
+def _split_codes(value):
+    """Split a comma-separated multi-select value into normalised codes."""
+    if not value:
+        return set()
+    return {code.strip().lower() for code in value.split(',') if code.strip()}
+
+
+def _normalise_codes(values):
+    """Normalise a JSON list of license codes from a job posting."""
+    return set(normalise_license_codes(values))
+
+
+@dataclass
+class AviationProfile:
+    """
+    Aviation credentials and flight experience of a single candidate.
+
+    ``aircraft_types`` holds every type the candidate has flown or is rated
+    on; ``aircraft_hours`` only the types with logged hours, and those hours.
+    """
+    license_types: set = field(default_factory=set)
+    ratings: set = field(default_factory=set)
+    aircraft_types: set = field(default_factory=set)
+    total_hours: int = 0
+    aircraft_hours: dict = field(default_factory=dict)
+
+    @property
+    def credentials(self):
+        """Every license type and rating code the candidate currently holds."""
+        return self.license_types | self.ratings
+
+    def hours_on(self, aircraft_type):
+        """Hours the candidate logged on the given aircraft type (0 if none)."""
+        if not aircraft_type:
+            return 0
+        job_aircraft = aircraft_type.lower()
+        return max(
+            (hours for aircraft, hours in self.aircraft_hours.items()
+             if aircraft in job_aircraft or job_aircraft in aircraft),
+            default=0,
+        )
+
+
+def get_aviation_profile(user):
+    """
+    Load the candidate's aviation profile with a fixed number of queries.
+
+    Only licenses that are active and not past their expiry date count.
+    """
+    profile = AviationProfile()
+    today = timezone.now().date()
+
+    licenses = LicensesRatings.objects.filter(
+        user=user,
+        license_status='active',
+        expiry_date__gte=today
+    ).values_list('license_type', 'license_rating')
+    for license_type, license_rating in licenses:
+        profile.license_types |= _split_codes(license_type)
+        profile.ratings |= _split_codes(license_rating)
+
+    experience = ProfessionalExperience.objects.filter(user=user).values(
+        'aircraft_type', 'total_hours'
+    ).first()
+    if experience:
+        profile.total_hours = experience['total_hours'] or 0
+        if experience['aircraft_type']:
+            aircraft = experience['aircraft_type'].strip().lower()
+            profile.aircraft_types.add(aircraft)
+            if experience['total_hours']:
+                profile.aircraft_hours[aircraft] = experience['total_hours']
+
+    # Types from roles and type ratings come without hours
+    for aircraft_types, type_ratings in ProfessionalRoles.objects.filter(user=user).values_list(
+        'aircraft_type_experience', 'icao_type_ratings'
+    ):
+        profile.aircraft_types |= _split_codes(aircraft_types)
+        profile.ratings |= _split_codes(type_ratings)
+
+    return profile
+
+
+def _subset_filter(field_name, held_codes):
+    """
+    Build ``<field> ⊆ held_codes`` for a JSONB array column.
+
+    ``?|`` (has_any_keys) is answered by the GIN index and narrows the candidates
+    to jobs that mention at least one held code; ``<@`` (contained_by) then keeps
+    only the jobs that require nothing beyond what the candidate holds.
+
+    Both operators compare strings exactly; postings store their codes in
+    lower case (see ``JobPosting.save``), so the held codes are lowered too.
+    """
+    no_requirement = Q(**{field_name: []})
+    held_codes = sorted(normalise_license_codes(held_codes))
+    if not held_codes:
+        return no_requirement
+    return no_requirement | (
+        Q(**{f'{field_name}__has_any_keys': held_codes}) &
+        Q(**{f'{field_name}__contained_by': held_codes})
+    )
+
+
+def aviation_requirements_filter(profile):
+    """
+    Hard filter for jobs whose aviation requirements the candidate satisfies.
+
+    Args:
+        profile (AviationProfile): Candidate profile from ``get_aviation_profile``
+
+    Returns:
+        Q: Filter to apply to a ``JobPosting`` queryset
+    """
+    flying_hours = (
+        Q(total_flying_hours_required__isnull=True) |
+        Q(total_flying_hours_required__lte=profile.total_hours)
+    )
+
+    # Each type only counts the hours logged on it; as in AviationProfile.hours_on,
+    # either name may contain the other ("A320" and "airbus a320")
+    aircraft_hours = Q(specific_aircraft_hours_required__isnull=True) | Q(specific_aircraft_hours_required=0)
+    for aircraft, hours in profile.aircraft_hours.items():
+        same_type = Q(aircraft_type__icontains=aircraft) | (
+            Q(IContains(Value(aircraft), F('aircraft_type'))) & ~Q(aircraft_type='')
+        )
+        aircraft_hours |= same_type & Q(specific_aircraft_hours_required__lte=hours)
+
+    return (
+        _subset_filter('required_license_types', profile.license_types) &
+        _subset_filter('required_licenses', profile.credentials) &
+        flying_hours &
+        aircraft_hours
+    )
+
+
+def score_aviation_requirements(profile, job):
+    """
+    Score how well the candidate meets a job's aviation requirements.
+
+    Returns:
+        tuple: (score, max_score, reasons). ``max_score`` is 0 when the job has no
+        aviation requirements so the component does not affect normalisation.
+    """
+    reasons = []
+    checks = []
+
+    required_types = _normalise_codes(job.required_license_types)
+    if required_types:
+        missing = required_types - profile.license_types
+        checks.append(not missing)
+        if missing:
+            reasons.append(f"Missing required license types: {', '.join(sorted(missing))}")
+        else:
+            reasons.append("You hold all required license types")
+
+    required_licenses = _normalise_codes(job.required_licenses)
+    if required_licenses:
+        missing = required_licenses - profile.credentials
+        checks.append(not missing)
+        if missing:
+            reasons.append(f"Missing required licenses or ratings: {', '.join(sorted(missing))}")
+        else:
+            reasons.append("You hold all required licenses and ratings")
+
+    if job.total_flying_hours_required:
+        meets = profile.total_hours >= job.total_flying_hours_required
+        checks.append(meets)
+        if meets:
+            reasons.append(f"Your {profile.total_hours} flight hours meet the {job.total_flying_hours_required} hours required")
+        else:
+            reasons.append(f"The job requires {job.total_flying_hours_required} flight hours, you have {profile.total_hours}")
+
+    if job.specific_aircraft_hours_required:
+        hours = profile.hours_on(job.aircraft_type)
+        meets = hours >= job.specific_aircraft_hours_required
+        checks.append(meets)
+        if meets:
+            reasons.append(f"Your {hours} hours on {job.aircraft_type} meet the requirement")
+        else:
+            reasons.append(f"The job requires {job.specific_aircraft_hours_required} hours on {job.aircraft_type}, you have {hours}")
+
+    if not checks:
+        return 0, 0, reasons
+
+    score = round(AVIATION_MAX_SCORE * sum(checks) / len(checks))
+    return score, AVIATION_MAX_SCORE, reasons
@@ -0,0 +1,261 @@
+"""
+Memory-mapped snapshot of the description skills of every active job.
+
+Gunicorn runs several sync workers from a preloaded app, so any in-process
+feature cache would be built and held once per worker. Instead the features are
+written to a single file in a compact column layout and every worker maps it
+read-only; the pages live in the OS page cache and are shared by all workers.
+
+File layout (native byte order, the file never leaves the host)::
+
+    header   magic, format version, metadata offset, metadata length
+    columns  one typed array per feature, each aligned to 8 bytes
+    metadata JSON: column offsets and the skill vocabulary
+
+Skills are stored as one bitset per job over the vocabulary of words used in
+active job descriptions, so ``matching_skills`` is a few bit tests instead of a
+regex pass over the description. The other features are filtered in SQL (see
+hard_constraints) and are not stored.
+
+The snapshot is rebuilt into a temporary file and renamed over the old one, so
+readers always see either the old or the new version. Workers notice the new
+file on the next lookup (see ``get_active_jobs_snapshot``). Posting changes
+schedule a rebuild in the background, at most one per
+JOB_FEATURE_SNAPSHOT_REBUILD_SECONDS and process (see
+``schedule_snapshot_rebuild``); until then matching may read the skills of a
+description from before its last edit.
+"""
+import atexit
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from apps.jobs_postings.models import JobPosting
+from .hard_constraints import active_jobs_filter
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WJFS'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sIQQ')
+
+# Words the matching service treats as candidate skills in a job description
+WORD_RE = re.compile(r'\b[A-Za-z]+\b')
+
+# JobPosting fields the snapshot is built from; saves that touch none of them leave it as it is
+SNAPSHOT_FIELDS = frozenset({'status', 'expiry_date', 'description'})
+
+# (name, array typecode) in file order
+COLUMNS = [
+    ('job_ids', 'q'),
+    ('skill_bits', 'Q'),
+]
+
+
+def snapshot_path():
+    return str(settings.JOB_FEATURE_SNAPSHOT_PATH)
+
+
+def description_words(description):
+    """Distinct lower-case words of a job description."""
+    return set(WORD_RE.findall((description or '').lower()))
+
+
+def build_active_jobs_snapshot(path=None):
+    """
+    Write the features of all active jobs to ``path`` and atomically replace it.
+
+    Returns:
+        int: Number of jobs in the snapshot
+    """
+    path = path or snapshot_path()
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+    vocabulary = {}
+    job_words = []
+
+    rows = JobPosting.objects.filter(active_jobs_filter()).order_by('id').values_list('id', 'description')
+    for job_id, description in rows.iterator(chunk_size=2000):
+        columns['job_ids'].append(job_id)
+        job_words.append([vocabulary.setdefault(word, len(vocabulary)) for word in description_words(description)])
+
+    job_count = len(columns['job_ids'])
+    skill_words = (len(vocabulary) + 63) // 64
+    skill_bits = array('Q', bytes(8 * skill_words * job_count))
+    for position, word_ids in enumerate(job_words):
+        base = position * skill_words
+        for word_id in word_ids:
+            skill_bits[base + word_id // 64] |= 1 << (word_id % 64)
+    columns['skill_bits'] = skill_bits
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, 'wb') as f:
+        f.write(bytes(HEADER.size))
+        layout = {}
+        for name, typecode in COLUMNS:
+            f.write(bytes(-f.tell() % 8))
+            layout[name] = [f.tell(), typecode, len(columns[name])]
+            columns[name].tofile(f)
+        meta = json.dumps({
+            'built_at': timezone.now().isoformat(),
+            'job_count': job_count,
+            'skill_words': skill_words,
+            'columns': layout,
+            'vocabulary': sorted(vocabulary, key=vocabulary.get),
+        }).encode('utf-8')
+        meta_offset = f.tell()
+        f.write(meta)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, meta_offset, len(meta)))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return job_count
+
+
+def rebuild_active_jobs_snapshot():
+    """Rebuild the snapshot, logging instead of raising so callers never fail on it."""
+    try:
+        job_count = build_active_jobs_snapshot()
+        logger.info(f"Rebuilt active jobs snapshot with {job_count} jobs")
+    except Exception as e:
+        logger.error(f"Error rebuilding active jobs snapshot: {str(e)}")
+
+
+_rebuild_timer = None
+_rebuild_lock = threading.Lock()
+
+
+def _rebuild_in_background():
+    global _rebuild_timer
+    with _rebuild_lock:
+        # Changes committed from now on need a rebuild of their own
+        _rebuild_timer = None
+    try:
+        rebuild_active_jobs_snapshot()
+    finally:
+        # This thread's connection would otherwise stay open
+        connection.close()
+
+
+def schedule_snapshot_rebuild():
+    """
+    Rebuild the snapshot in a background thread, JOB_FEATURE_SNAPSHOT_REBUILD_SECONDS from now.
+
+    Changes made until the rebuild starts are picked up by it, so a burst of
+    posting saves costs one rebuild per process instead of one per save.
+    """
+    global _rebuild_timer
+    with _rebuild_lock:
+        # A timer inherited from the parent of a forked process is not running
+        if _rebuild_timer is not None and _rebuild_timer.is_alive():
+            return
+        _rebuild_timer = threading.Timer(settings.JOB_FEATURE_SNAPSHOT_REBUILD_SECONDS, _rebuild_in_background)
+        _rebuild_timer.daemon = True
+        _rebuild_timer.start()
+
+
+@atexit.register
+def _rebuild_pending():
+    """Run a scheduled rebuild before the process exits (e.g. a worker recycled by max_requests)."""
+    with _rebuild_lock:
+        timer = _rebuild_timer
+    if timer is not None and timer.is_alive():
+        timer.cancel()
+        _rebuild_in_background()
+
+
+class ActiveJobsSnapshot:
+    """Read-only view over a snapshot file. Columns are typed memoryviews into the mapping."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, meta_offset, meta_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported job snapshot format in {path}")
+
+        meta = json.loads(self._mmap[meta_offset:meta_offset + meta_length])
+        view = memoryview(self._mmap)
+        for name, (offset, typecode, length) in meta['columns'].items():
+            size = array(typecode).itemsize * length
+            setattr(self, name, view[offset:offset + size].cast(typecode))
+
+        self.built_at = meta['built_at']
+        self.job_count = meta['job_count']
+        self.skill_words = meta['skill_words']
+        self._vocabulary = {word: word_id for word_id, word in enumerate(meta['vocabulary'])}
+
+    def __len__(self):
+        return self.job_count
+
+    def __contains__(self, job_id):
+        return self.index_of(job_id) is not None
+
+    def index_of(self, job_id):
+        """Row of ``job_id`` in the snapshot, or None if it is not there."""
+        position = bisect_left(self.job_ids, job_id)
+        if position < self.job_count and self.job_ids[position] == job_id:
+            return position
+        return None
+
+    def matching_skills(self, job_id, skills):
+        """
+        Skills from ``skills`` that appear in the job description.
+
+        Returns None when the job is not in the snapshot so callers can fall back
+        to reading the description.
+        """
+        position = self.index_of(job_id)
+        if position is None:
+            return None
+        base = position * self.skill_words
+        matches = []
+        for skill in skills:
+            word_id = self._vocabulary.get(skill)
+            if word_id is not None and self.skill_bits[base + word_id // 64] >> (word_id % 64) & 1:
+                matches.append(skill)
+        return matches
+
+
+_snapshot = None
+_snapshot_key = None
+
+
+def get_active_jobs_snapshot():
+    """
+    Snapshot mapped by this process, remapped when the file has been replaced.
+
+    Returns None if no snapshot has been built yet.
+    """
+    global _snapshot, _snapshot_key
+    path = snapshot_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    key = (stat.st_ino, stat.st_mtime_ns)
+    if key != _snapshot_key:
+        try:
+            _snapshot = ActiveJobsSnapshot(path)
+            _snapshot_key = key
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading active jobs snapshot: {str(e)}")
+            return None
+    return _snapshot
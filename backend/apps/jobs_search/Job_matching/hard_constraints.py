@@ -0,0 +1,70 @@
+"""
+Hard constraints applied in SQL before any job is scored in Python.
+
+Scoring is per job and runs in Python, so every posting that reaches
+``JobMatchingService.find_matching_jobs`` costs several attribute lookups and a
+regex pass over its description. Jobs the candidate can never take (expired,
+invitation only, verified-only for unverified candidates) are removed here
+with a single ``WHERE`` clause instead.
+
+Location is not one of them: ``willing_to_relocate`` is False unless the
+candidate changed it, so it cannot tell a refusal to relocate apart from no
+answer. Jobs elsewhere are kept and score lower (see ``match_candidate_to_job``).
+"""
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.jobs_postings.models import JobPosting
+from .aviation_matching import aviation_requirements_filter
+
+
+def _related_or_none(user, name):
+    """Return a reverse one-to-one relation or None if it does not exist."""
+    try:
+        return getattr(user, name)
+    except ObjectDoesNotExist:
+        return None
+
+
+def active_jobs_filter():
+    """Jobs that are published and not past their expiry date."""
+    return Q(status='active') & (
+        Q(expiry_date__isnull=True) | Q(expiry_date__gt=timezone.now())
+    )
+
+
+def compile_hard_constraints(user):
+    """
+    Compile the candidate's non-negotiables into a single filter.
+
+    Args:
+        user (User): Professional user being matched
+
+    Returns:
+        Q: Filter to apply to a ``JobPosting`` queryset
+    """
+    constraints = active_jobs_filter() & ~Q(visibility='private')
+
+    # Verified-only postings are only visible to verified professionals
+    verification = _related_or_none(user, 'verification_status')
+    if not (verification and verification.is_verified):
+        constraints &= ~Q(visibility='verified')
+
+    return constraints
+
+
+def get_candidate_jobs(user, aviation_profile):
+    """
+    Jobs that survive every hard constraint and are worth scoring.
+
+    Args:
+        user (User): Professional user being matched
+        aviation_profile (AviationProfile): Preloaded aviation profile of the user
+
+    Returns:
+        QuerySet: Filtered ``JobPosting`` queryset
+    """
+    return JobPosting.objects.filter(
+        compile_hard_constraints(user) & aviation_requirements_filter(aviation_profile)
+    )
@@ -1,15 +1,21 @@
-import re
 from django.db.models import QuerySet, F, Max
 from apps.users.models import User
 from apps.jobs_postings.models import JobPosting
+from .aviation_matching import get_aviation_profile, score_aviation_requirements
+from .feature_snapshot import description_words
+
+# Filler words in course titles that would otherwise match almost every description
+NON_SKILL_WORDS = {'and', 'the', 'for', 'with', 'from', 'bachelor', 'master', 'masters', 'diploma', 'certificate'}
 
 class JobMatchingService:
     """Service for matching candidates to jobs based on location, experience, job type, and status."""
     
     @staticmethod
-    def match_candidate_to_job(user, job):
+    def match_candidate_to_job(user, job, aviation_profile=None, snapshot=None):
         """
         Match a user (professional) to a job based on location, experience, job type, and status.
+        Pass a preloaded aviation_profile when scoring many jobs for the same user, and the
+        active jobs snapshot to read description skills from it instead of the description.
         """
         score = 0
         max_score = 100
@@ -25,7 +31,10 @@ class JobMatchingService:
                 user_location = user.personal_info.location.lower()
                 job_location = job.location.lower()
                 
-                if user_location in job_location or job_location in user_location:
+                if job.is_remote:
+                    location_score = 30
+                    reasons.append("This job is remote, so it can be done from your location")
+                elif user_location in job_location or job_location in user_location:
                     location_score = 30
                     reasons.append(f"Your location ({user.personal_info.location}) matches the job location")
                 elif hasattr(user.personal_info, 'willing_to_relocate') and user.personal_info.willing_to_relocate:
@@ -114,16 +123,13 @@ class JobMatchingService:
                 has_qualifications = True
                 
                 # Extract user skills and job required skills
-                user_skills = [q.skill.lower() for q in user.qualifications.all()]
+                user_skills = JobMatchingService._get_user_skills(user)
                 
-                # Extract job skills from description
-                job_skills = []
-                if job.description:
-                    # Extract words that might be skills
-                    job_skills = re.findall(r'\b[A-Za-z]+\b', job.description.lower())
-                
-                # Count matching skills
-                matching_skills = [skill for skill in user_skills if skill in job_skills]
+                # Use the shared snapshot when the job is in it, else read the description
+                matching_skills = snapshot.matching_skills(job.id, user_skills) if snapshot else None
+                if matching_skills is None:
+                    job_skills = description_words(job.description)
+                    matching_skills = [skill for skill in user_skills if skill in job_skills]
                 
                 if len(matching_skills) > 0:
                     # Calculate score based on match percentage
@@ -140,14 +146,22 @@ class JobMatchingService:
         else:
             score += qualification_score
             
+        # Check aviation requirements: licenses, ratings and flight hours (0-20 points)
+        if aviation_profile is None:
+            aviation_profile = get_aviation_profile(user)
+        aviation_score, aviation_max_score, aviation_reasons = score_aviation_requirements(aviation_profile, job)
+        score += aviation_score
+        max_score += aviation_max_score
+        reasons.extend(aviation_reasons)
+            
         # Normalize the score based on available data
         if max_score > 0:
             normalized_score = min(100, round((score / max_score) * 100))
         else:
             normalized_score = 0
         
-        # Add note about profile completeness if max_score < 100
-        if max_score < 100:
+        # Add note about profile completeness if any profile-based component was skipped
+        if max_score < 100 + aviation_max_score:
             reasons.append(f"NOTE: Your profile is incomplete. Complete your profile to improve match accuracy.")
         
         return {
@@ -157,15 +171,17 @@ class JobMatchingService:
         }
         
     @staticmethod
-    def find_matching_jobs(user, jobs):
+    def find_matching_jobs(user, jobs, aviation_profile=None, snapshot=None):
         """
         Find all jobs that match a professional's profile.
         Works with partial profile data, with reduced match quality.
         """
         matches = []
+        if aviation_profile is None:
+            aviation_profile = get_aviation_profile(user)
         
         for job in jobs:
-            match_result = JobMatchingService.match_candidate_to_job(user, job)
+            match_result = JobMatchingService.match_candidate_to_job(user, job, aviation_profile, snapshot)
             if match_result['score'] > 0:  # Include all jobs with any match score
                 matches.append({
                     'job': job,
@@ -178,6 +194,19 @@ class JobMatchingService:
         matches.sort(key=lambda x: x['score'], reverse=True)
         return matches
         
+    @staticmethod
+    def _get_user_skills(user):
+        """
+        Skill words from the user's qualifications: course of study and aviation certifications.
+        Job skills are single description words, so only single words can match.
+        """
+        skills = []
+        for course, certifications in user.qualifications.values_list('course_of_study', 'aviation_certifications'):
+            for word in description_words(f"{course or ''} {certifications or ''}"):
+                if len(word) > 2 and word not in NON_SKILL_WORDS and word not in skills:
+                    skills.append(word)
+        return skills
+
     @staticmethod
     def _has_complete_profile(user):
         """Check if a user has a complete profile for job matching."""
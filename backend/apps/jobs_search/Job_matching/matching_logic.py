@@ -7,6 +7,9 @@ import logging
 from apps.jobs_postings.models import JobPosting
 from apps.jobs_postings.serializers import JobPostingSerializer
 from apps.jobs_search.Job_matching.job_matching_service import JobMatchingService
+from apps.jobs_search.Job_matching.aviation_matching import get_aviation_profile
+from apps.jobs_search.Job_matching.hard_constraints import get_candidate_jobs
+from apps.jobs_search.Job_matching.feature_snapshot import get_active_jobs_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -23,19 +26,25 @@ def get_matching_jobs(request):
                 'error': 'Only professional users can access job matches'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        # Get active jobs
-        jobs = JobPosting.objects.filter(status='active')
+        # Only jobs that pass the candidate's hard constraints are scored
+        aviation_profile = get_aviation_profile(user)
+        jobs = get_candidate_jobs(user, aviation_profile)
         
         # include profile completeness information in the response
         profile_status = check_user_profile_completeness(user)
         
         # Get job matches
-        matches = JobMatchingService.find_matching_jobs(user, jobs)
+        matches = JobMatchingService.find_matching_jobs(
+            user, jobs, aviation_profile, get_active_jobs_snapshot()
+        )
+        
+        # Load what the serializer shows for all matched jobs at once
+        serialized_jobs = JobPosting.objects.for_serializer().in_bulk([match['job'].pk for match in matches])
         
         # Transform matches for API response
         job_matches = []
         for match in matches:
-            job_data = JobPostingSerializer(match['job']).data
+            job_data = JobPostingSerializer(serialized_jobs.get(match['job'].pk, match['job'])).data
             job_matches.append({
                 'job': job_data,
                 'match_score': match['score'],
@@ -71,7 +80,7 @@ def get_job_match_details(request, job_id):
             }, status=status.HTTP_403_FORBIDDEN)
         
         try:
-            job = JobPosting.objects.get(id=job_id)
+            job = JobPosting.objects.for_serializer().get(id=job_id)
         except JobPosting.DoesNotExist:
             return Response({
                 'error': 'Job not found'
@@ -4,4 +4,7 @@ class JobsSearchConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.jobs_search'
     verbose_name = 'Jobs Search'
-  
+
+    def ready(self):
+        # Import signal handlers
+        import apps.jobs_search.signals
@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.jobs_postings.models import JobPosting
+from apps.jobs_search.Job_matching.feature_snapshot import SNAPSHOT_FIELDS, schedule_snapshot_rebuild
+
+
+@receiver([post_save, post_delete], sender=JobPosting)
+def refresh_active_jobs_snapshot(sender, instance, update_fields=None, **kwargs):
+    """Schedule a rebuild of the shared matching snapshot once the posting change is committed."""
+    # Counter updates and other saves of fields the snapshot does not hold change nothing in it
+    if update_fields is not None and not SNAPSHOT_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(schedule_snapshot_rebuild)
@@ -7,6 +7,7 @@ from apps.jobs_postings.views import (
     JobPostingDeleteView,
     RecruiterJobPostingsView,
     JobViewTrackAPIView,
+    JobViewBatchAPIView,
     JobViewStatsAPIView
 )
 
@@ -22,5 +23,6 @@ urlpatterns = [
     path('recruiter/job-postings/list/', RecruiterJobPostingsView.as_view(), name='recruiter-jobs'),
     # Job view tracking endpoint
     path('job-postings/<int:job_id>/track-view/', JobViewTrackAPIView.as_view(), name='job-track-view'),
+    path('job-postings/track-views/', JobViewBatchAPIView.as_view(), name='job-track-views'),
     path('job-postings/<int:job_id>/views/stats/', JobViewStatsAPIView.as_view(), name='job-views'),
 ]
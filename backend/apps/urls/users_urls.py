@@ -7,7 +7,11 @@ from apps.users.profile_management.views import (
     # LicensesRatingsViewSet,
     DocumentViewSet,
 )
-from apps.users.profile_management.cv_extract_views import CVProcessingAPIView
+from apps.users.profile_management.cv_extract_views import (
+    CVMetricsAPIView,
+    CVProcessingAPIView,
+    CVProcessingStatusAPIView,
+)
 
 urlpatterns = [
     # General user profile
@@ -33,6 +37,8 @@ urlpatterns = [
     
     # CV Processing
     path('profile/professional/cv/process/', CVProcessingAPIView.as_view(), name='cv-process'),
+    path('profile/professional/cv/process/<uuid:job_id>/', CVProcessingStatusAPIView.as_view(), name='cv-process-status'),
+    path('admin/cv-metrics/', CVMetricsAPIView.as_view(), name='cv-metrics'),
     
     # Document management
     path('documents/upload/add', DocumentViewSet.as_view({'post': 'create'}), name='document-upload'),
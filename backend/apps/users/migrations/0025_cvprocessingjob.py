@@ -0,0 +1,40 @@
+import uuid
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0024_rename_continuous_training_expiry_qualifications_training_expiry_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVProcessingJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('cv', models.FileField(max_length=255, upload_to='professional_documents/cvs/')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('completed', 'Completed'), ('partial', 'Partially Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('stage', models.CharField(blank=True, default='', max_length=50)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Progress in percent')),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Extracted CV information', null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('worker', models.CharField(blank=True, default='', help_text='Worker that claimed the job', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cv_processing_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'CV Processing Job',
+                'verbose_name_plural': 'CV Processing Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='cvjob_status_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0025_cvprocessingjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVExtractionCache',
+            fields=[
+                ('content_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('file_extension', models.CharField(blank=True, default='', max_length=10)),
+                ('text', models.TextField(blank=True, default='')),
+                ('text_version', models.CharField(max_length=20)),
+                ('result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('parser_version', models.CharField(blank=True, default='', max_length=20)),
+                ('size', models.PositiveIntegerField(default=0, help_text='Bytes of cached text and result')),
+                ('text_hits', models.PositiveIntegerField(default=0)),
+                ('result_hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'CV Extraction Cache Entry',
+                'verbose_name_plural': 'CV Extraction Cache',
+                'indexes': [models.Index(fields=['last_used_at'], name='cvcache_last_used_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CVExtractionCacheStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('text_hits', models.PositiveIntegerField(default=0)),
+                ('text_misses', models.PositiveIntegerField(default=0)),
+                ('result_hits', models.PositiveIntegerField(default=0)),
+                ('result_misses', models.PositiveIntegerField(default=0)),
+                ('evictions', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'CV Extraction Cache Stats',
+                'verbose_name_plural': 'CV Extraction Cache Stats',
+                'ordering': ['-day'],
+            },
+        ),
+    ]
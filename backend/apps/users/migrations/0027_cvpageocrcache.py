@@ -0,0 +1,38 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0026_cvextractioncache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvextractioncachestats',
+            name='page_hits',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cvextractioncachestats',
+            name='page_misses',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='CVPageOCRCache',
+            fields=[
+                ('page_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('text', models.TextField(blank=True, default='')),
+                ('ocr_version', models.CharField(max_length=20)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'CV Page OCR Cache Entry',
+                'verbose_name_plural': 'CV Page OCR Cache',
+                'indexes': [models.Index(fields=['last_used_at'], name='cvpagecache_last_used_idx')],
+            },
+        ),
+    ]
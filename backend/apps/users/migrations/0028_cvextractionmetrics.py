@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0027_cvpageocrcache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvprocessingjob',
+            name='metrics',
+            field=models.JSONField(blank=True, help_text='Stage timings of the extraction', null=True),
+        ),
+        migrations.CreateModel(
+            name='CVExtractionMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('file_extension', models.CharField(blank=True, default='', max_length=10)),
+                ('total_seconds', models.FloatField()),
+                ('text_length', models.PositiveIntegerField(default=0)),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('ocr_pages', models.PositiveIntegerField(default=0)),
+                ('cache', models.CharField(blank=True, default='', help_text='Cache layer that served the CV, if any', max_length=10)),
+                ('stages', models.JSONField(default=dict, help_text='Seconds by stage')),
+            ],
+            options={
+                'verbose_name': 'CV Extraction Metrics',
+                'verbose_name_plural': 'CV Extraction Metrics',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_at'], name='cvmetrics_created_idx')],
+            },
+        ),
+    ]
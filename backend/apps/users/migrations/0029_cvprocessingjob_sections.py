@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0028_cvextractionmetrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvprocessingjob',
+            name='sections',
+            field=models.JSONField(blank=True, default=list, help_text='CV sections to extract; all when empty'),
+        ),
+    ]
@@ -9,7 +9,12 @@ from .models import (
     Qualifications,
     LicensesRatings,
     # OrganizationProfile,
-    EmploymentHistory
+    EmploymentHistory,
+    CVProcessingJob,
+    CVExtractionCache,
+    CVExtractionCacheStats,
+    CVPageOCRCache,
+    CVExtractionMetrics
 )
 
 User = get_user_model()
@@ -128,3 +133,38 @@ class EmploymentHistoryAdmin(admin.ModelAdmin):
             # Filter to show only users with role='professional'
             kwargs["queryset"] = User.objects.filter(role='professional')
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+@admin.register(CVProcessingJob)
+class CVProcessingJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'status', 'stage', 'progress', 'attempts', 'created_at', 'finished_at')
+    search_fields = ('user__email', 'id')
+    list_filter = ('status',)
+    readonly_fields = ('id', 'created_at', 'started_at', 'finished_at', 'worker', 'attempts')
+
+
+@admin.register(CVExtractionCache)
+class CVExtractionCacheAdmin(admin.ModelAdmin):
+    list_display = ('content_hash', 'file_extension', 'parser_version', 'size', 'text_hits', 'result_hits', 'last_used_at')
+    search_fields = ('content_hash',)
+    list_filter = ('file_extension', 'parser_version')
+    readonly_fields = ('content_hash', 'created_at', 'last_used_at', 'text_hits', 'result_hits', 'size')
+
+
+@admin.register(CVExtractionCacheStats)
+class CVExtractionCacheStatsAdmin(admin.ModelAdmin):
+    list_display = ('day', 'result_hits', 'result_misses', 'text_hits', 'text_misses', 'page_hits', 'page_misses', 'evictions')
+
+
+@admin.register(CVPageOCRCache)
+class CVPageOCRCacheAdmin(admin.ModelAdmin):
+    list_display = ('page_hash', 'ocr_version', 'hits', 'last_used_at')
+    search_fields = ('page_hash',)
+    list_filter = ('ocr_version',)
+    readonly_fields = ('page_hash', 'created_at', 'last_used_at', 'hits')
+
+
+@admin.register(CVExtractionMetrics)
+class CVExtractionMetricsAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'file_extension', 'total_seconds', 'text_length', 'page_count', 'ocr_pages', 'cache')
+    list_filter = ('file_extension', 'cache')
+    readonly_fields = ('created_at', 'file_extension', 'total_seconds', 'text_length', 'page_count', 'ocr_pages', 'cache', 'stages')
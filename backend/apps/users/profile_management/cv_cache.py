@@ -0,0 +1,247 @@
+"""
+Content-addressed cache for CV extraction.
+
+Users often upload the same CV again. Entries are keyed by the SHA-256 of the
+file bytes and hold two layers:
+
+* the raw text, the expensive part (PDF parsing and OCR), stamped with the text
+  extraction version;
+* the structured result of the extractors, stamped with the parser version.
+
+After a parser upgrade only the structured layer is rebuilt, from the cached
+text. The OCR text of scanned PDF pages is also cached on its own, by the hash
+of each page's content, so a PDF sharing pages with one seen before only has
+its new pages OCRed. The table is capped by entry count and total size; the least recently
+used entries are evicted first. Hits and misses per layer are counted per day
+(see ``manage.py cv_cache_stats``).
+
+Cache failures are logged and treated as misses; they never fail an extraction.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .models import CVExtractionCache, CVExtractionCacheStats, CVPageOCRCache
+
+logger = logging.getLogger(__name__)
+
+
+def cache_enabled():
+    return settings.CV_CACHE_ENABLED
+
+
+def _record(**counters):
+    """Add ``counters`` to today's stats row."""
+    stats, _ = CVExtractionCacheStats.objects.get_or_create(day=timezone.localdate())
+    CVExtractionCacheStats.objects.filter(pk=stats.pk).update(
+        **{name: F(name) + value for name, value in counters.items()}
+    )
+
+
+def lookup(content_hash, file_extension, text_version, parser_version):
+    """
+    Find cached extraction for a file.
+
+    Args:
+        content_hash (str): SHA-256 hex digest of the file bytes
+        file_extension (str): Extension the file was parsed as
+        text_version (str): Current text extraction version
+        parser_version (str): Current parser version
+
+    Returns:
+        tuple: (text, result); each is None when that layer is missing or stale
+    """
+    try:
+        entry = CVExtractionCache.objects.filter(
+            content_hash=content_hash, file_extension=file_extension, text_version=text_version
+        ).first()
+
+        if entry and entry.result is not None and entry.parser_version == parser_version:
+            CVExtractionCache.objects.filter(pk=entry.pk).update(
+                result_hits=F('result_hits') + 1, last_used_at=timezone.now()
+            )
+            _record(result_hits=1)
+            return entry.text, entry.result
+
+        if entry:
+            CVExtractionCache.objects.filter(pk=entry.pk).update(
+                text_hits=F('text_hits') + 1, last_used_at=timezone.now()
+            )
+            _record(result_misses=1, text_hits=1)
+            return entry.text, None
+
+        _record(result_misses=1, text_misses=1)
+    except Exception as e:
+        logger.error(f"Error reading CV extraction cache: {str(e)}")
+    return None, None
+
+
+def store_text(content_hash, file_extension, text, text_version):
+    """Cache the raw text of a file, replacing any stale entry."""
+    size = len(text.encode('utf-8'))
+    if size > settings.CV_CACHE_MAX_ENTRY_BYTES:
+        return
+    try:
+        CVExtractionCache.objects.update_or_create(
+            content_hash=content_hash,
+            defaults={
+                'file_extension': file_extension,
+                'text': text,
+                'text_version': text_version,
+                'result': None,
+                'parser_version': '',
+                'size': size,
+                'last_used_at': timezone.now(),
+            }
+        )
+        evict()
+    except Exception as e:
+        logger.error(f"Error writing CV extraction cache: {str(e)}")
+
+
+def store_result(content_hash, text, result, parser_version):
+    """Cache the structured result next to the already cached text."""
+    text_size = len(text.encode('utf-8'))
+    result_size = len(json.dumps(result, cls=DjangoJSONEncoder).encode('utf-8'))
+    if text_size + result_size > settings.CV_CACHE_MAX_ENTRY_BYTES:
+        return
+    try:
+        CVExtractionCache.objects.filter(content_hash=content_hash).update(
+            result=result, parser_version=parser_version, size=text_size + result_size,
+            last_used_at=timezone.now()
+        )
+        evict()
+    except Exception as e:
+        logger.error(f"Error writing CV extraction cache: {str(e)}")
+
+
+def lookup_pages(page_hashes, ocr_version):
+    """
+    Find cached OCR text of PDF pages.
+
+    Args:
+        page_hashes (list): SHA-256 hex digests of page contents
+        ocr_version (str): Current OCR version
+
+    Returns:
+        dict: Text by page hash, for the pages found
+    """
+    page_hashes = set(page_hashes)
+    try:
+        texts = dict(
+            CVPageOCRCache.objects.filter(page_hash__in=page_hashes, ocr_version=ocr_version)
+            .values_list('page_hash', 'text')
+        )
+        if texts:
+            CVPageOCRCache.objects.filter(page_hash__in=texts).update(
+                hits=F('hits') + 1, last_used_at=timezone.now()
+            )
+        _record(page_hits=len(texts), page_misses=len(page_hashes) - len(texts))
+        return texts
+    except Exception as e:
+        logger.error(f"Error reading CV page OCR cache: {str(e)}")
+    return {}
+
+
+def store_pages(texts, ocr_version):
+    """Cache the OCR text of PDF pages, given by page hash."""
+    if not texts:
+        return
+    try:
+        for page_hash, text in texts.items():
+            CVPageOCRCache.objects.update_or_create(
+                page_hash=page_hash,
+                defaults={'text': text, 'ocr_version': ocr_version, 'last_used_at': timezone.now()}
+            )
+        evict_pages()
+    except Exception as e:
+        logger.error(f"Error writing CV page OCR cache: {str(e)}")
+
+
+def evict_pages():
+    """
+    Remove least recently used page texts beyond CV_CACHE_MAX_PAGE_ENTRIES.
+
+    Returns:
+        int: Number of entries removed
+    """
+    excess = CVPageOCRCache.objects.count() - settings.CV_CACHE_MAX_PAGE_ENTRIES
+    if excess <= 0:
+        return 0
+    doomed = list(CVPageOCRCache.objects.order_by('last_used_at').values_list('page_hash', flat=True)[:excess])
+    CVPageOCRCache.objects.filter(page_hash__in=doomed).delete()
+    _record(evictions=len(doomed))
+    return len(doomed)
+
+
+def evict():
+    """
+    Remove least recently used entries until the cache is within its caps.
+
+    Returns:
+        int: Number of entries removed
+    """
+    totals = CVExtractionCache.objects.aggregate(entries=Count('pk'), size=Sum('size'))
+    excess_entries = totals['entries'] - settings.CV_CACHE_MAX_ENTRIES
+    excess_bytes = (totals['size'] or 0) - settings.CV_CACHE_MAX_BYTES
+    if excess_entries <= 0 and excess_bytes <= 0:
+        return 0
+
+    doomed = []
+    oldest_first = CVExtractionCache.objects.order_by('last_used_at').values_list('content_hash', 'size')
+    for content_hash, size in oldest_first.iterator(chunk_size=500):
+        if excess_entries <= 0 and excess_bytes <= 0:
+            break
+        doomed.append(content_hash)
+        excess_entries -= 1
+        excess_bytes -= size
+
+    CVExtractionCache.objects.filter(content_hash__in=doomed).delete()
+    _record(evictions=len(doomed))
+    return len(doomed)
+
+
+def _rate(hits, misses):
+    return round(hits / (hits + misses), 4) if hits + misses else None
+
+
+def cache_stats(days=30):
+    """
+    Hit rates and size of the cache.
+
+    Args:
+        days (int): Number of most recent days to include
+
+    Returns:
+        dict: Overall and per-day hit rates, entry count and total size
+    """
+    rows = list(CVExtractionCacheStats.objects.order_by('-day')[:days])
+    totals = {
+        name: sum(getattr(row, name) for row in rows)
+        for name in ('text_hits', 'text_misses', 'result_hits', 'result_misses', 'page_hits', 'page_misses', 'evictions')
+    }
+    size = CVExtractionCache.objects.aggregate(entries=Count('pk'), size=Sum('size'))
+    return {
+        'entries': size['entries'],
+        'size_bytes': size['size'] or 0,
+        'result_hit_rate': _rate(totals['result_hits'], totals['result_misses']),
+        # Share of result misses that still skipped text extraction
+        'text_hit_rate': _rate(totals['text_hits'], totals['text_misses']),
+        'page_entries': CVPageOCRCache.objects.count(),
+        'page_hit_rate': _rate(totals['page_hits'], totals['page_misses']),
+        'totals': totals,
+        'days': [
+            {
+                'day': row.day.isoformat(),
+                'result_hit_rate': _rate(row.result_hits, row.result_misses),
+                'text_hit_rate': _rate(row.text_hits, row.text_misses),
+                'page_hit_rate': _rate(row.page_hits, row.page_misses),
+                'evictions': row.evictions,
+            }
+            for row in rows
+        ],
+    }
@@ -1,104 +1,47 @@
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.urls import reverse
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from .models import (
-    ProfessionalRoles, 
-    Qualifications, 
-    LicensesRatings, 
-    EmploymentHistory,
-    ProfessionalPersonalInfo,
-    ProfessionalExperience,
-    ProfessionalDocument,
-    UploadedFile
-)
-from .serializers import CVUploadSerializer
-from .cv_processing_logic import extract_cv_information
+from .models import ProfessionalDocument, CVProcessingJob
+from .serializers import CVUploadSerializer, CVProcessingJobSerializer
+from .cv_queue import enqueue_cv_job
+from .cv_metrics import stage_histograms
+from .cv_processing_logic import CV_SECTIONS, parse_sections
 
 class CVProcessingAPIView(APIView):
     """API view for processing CV/resume files and extracting information."""
     permission_classes = [IsAuthenticated]
     
-    def _update_user_profile(self, user, extracted_data):
-        """Update user profile with information extracted from CV"""
-        # Update personal info
-        if extracted_data.get('personal_info'):
-            personal_info, created = ProfessionalPersonalInfo.objects.get_or_create(user=user)
-            personal_info_data = extracted_data['personal_info']
-            
-            # Update fields only if they're currently empty
-            for field, value in personal_info_data.items():
-                if hasattr(personal_info, field) and value and not getattr(personal_info, field):
-                    setattr(personal_info, field, value)
-            
-            personal_info.save()
-        
-        # Update experience
-        if extracted_data.get('experience'):
-            experience, created = ProfessionalExperience.objects.get_or_create(user=user)
-            experience_data = extracted_data['experience']
-            
-            for field, value in experience_data.items():
-                if hasattr(experience, field) and value and not getattr(experience, field):
-                    setattr(experience, field, value)
-            
-            experience.save()
-        
-        # Add qualifications
-        if extracted_data.get('qualifications'):
-            for qual_data in extracted_data['qualifications']:
-                # Only add if qualification doesn't exist with same institution and degree
-                if not Qualifications.objects.filter(
-                    user=user,
-                    institution=qual_data.get('institution', ''),
-                    course_of_study=qual_data.get('course_of_study', '')
-                ).exists():
-                    qualification = Qualifications(user=user)
-                    
-                    for field, value in qual_data.items():
-                        if hasattr(qualification, field) and value:
-                            setattr(qualification, field, value)
-                    
-                    qualification.save()
-        
-        # Add employment history
-        if extracted_data.get('employment_history'):
-            for emp_data in extracted_data['employment_history']:
-                # Only add if employment doesn't exist with same company and position
-                if not EmploymentHistory.objects.filter(
-                    user=user,
-                    company_name=emp_data.get('company_name', ''),
-                    job_title=emp_data.get('job_title', '')
-                ).exists():
-                    employment = EmploymentHistory(user=user)
-                    
-                    for field, value in emp_data.items():
-                        if hasattr(employment, field) and value:
-                            setattr(employment, field, value)
-                    
-                    employment.save()
-    
     @swagger_auto_schema(
         operation_description="Process uploaded CV and extract information",
         request_body=CVUploadSerializer,
+        manual_parameters=[
+            openapi.Parameter('sections', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description=f"Comma-separated CV sections to extract, all by default: {', '.join(CV_SECTIONS)}")
+        ],
         responses={
-            200: "CV processed successfully",
+            202: "CV queued for processing",
             400: "Invalid request data",
             403: "Permission denied"
         }
     )
     def post(self, request):
-        """Process uploaded CV and extract information."""
+        """Store the uploaded CV and queue it for information extraction."""
         if request.user.role != request.user.Role.PROFESSIONAL:
             return Response(
                 {"error": "This endpoint is only for professional users."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        try:
+            sections = parse_sections(request.query_params.get('sections', ''))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         serializer = CVUploadSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -110,20 +53,67 @@ class CVProcessingAPIView(APIView):
         doc.cv = cv_file
         doc.save()
         
-        # Extract information from the CV
-        extracted_data = extract_cv_information(cv_file)
+        # Extraction runs in the process_cv_queue workers
+        job = enqueue_cv_job(request.user, doc.cv.name, sections=sections)
+        
+        return Response({
+            'status': job.status,
+            'job_id': str(job.id),
+            'status_url': request.build_absolute_uri(reverse('cv-process-status', args=[job.id])),
+            'message': 'CV uploaded and queued for processing'
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class CVProcessingStatusAPIView(APIView):
+    """API view for polling the progress and result of a queued CV processing job."""
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Get status, progress and extracted fields of a CV processing job",
+        responses={
+            200: CVProcessingJobSerializer,
+            404: "Job not found"
+        }
+    )
+    def get(self, request, job_id):
+        """Return the current state of one of the user's CV processing jobs."""
+        try:
+            job = CVProcessingJob.objects.get(id=job_id, user=request.user)
+        except CVProcessingJob.DoesNotExist:
+            return Response(
+                {"error": "CV processing job not found."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(CVProcessingJobSerializer(job).data)
+
+
+class CVMetricsAPIView(APIView):
+    """API view for staff: per-stage timing histograms of recent CV extractions."""
+    permission_classes = [IsAdminUser]
+    
+    @swagger_auto_schema(
+        operation_description="Per-stage CV extraction timing histograms over the last hours",
+        manual_parameters=[
+            openapi.Parameter('hours', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description='How far back to look, 24 by default')
+        ],
+        responses={
+            200: "Stage histograms",
+            400: "Invalid hours",
+            403: "Permission denied"
+        }
+    )
+    def get(self, request):
+        """Return stage histograms, OCR and cache usage of the CVs extracted in the last hours."""
+        try:
+            hours = int(request.query_params.get('hours', 24))
+        except ValueError:
+            hours = 0
+        if hours <= 0:
+            return Response(
+                {"error": "hours must be a positive integer."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        if extracted_data:
-            # Update user's profile information with extracted data
-            self._update_user_profile(request.user, extracted_data)
-            
-            return Response({
-                'status': 'success',
-                'message': 'CV processed successfully and profile updated',
-                'extracted_fields': extracted_data
-            })
-        else:
-            return Response({
-                'status': 'partial_success',
-                'message': 'CV uploaded but could not extract all information. Please update your profile manually.'
-            }, status=status.HTTP_200_OK)
+        return Response(stage_histograms(hours=hours))
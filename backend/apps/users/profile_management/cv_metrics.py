@@ -0,0 +1,255 @@
+"""
+Per-stage timing of CV extraction.
+
+``extract_cv_information`` opens a ``CVProfile`` for each CV when
+``CV_METRICS_ENABLED`` is on (or when its caller asks for the metrics). While it
+is open, ``stage`` blocks and functions decorated with ``timed`` add their
+duration to it, and ``note`` records counts such as the page count and the
+number of OCRed pages. The field extractors are timed through the ``timings``
+dict of ``extract_information_from_text``, which writes into the profile.
+Stages nest: the time of ``pdf_ocr`` is also part of ``text_extraction``.
+
+When it closes, the profile is logged as one JSON line on this module's logger
+and stored as a ``CVExtractionMetrics`` row, kept for
+``CV_METRICS_RETENTION_DAYS``: about one extraction in
+``CV_METRICS_PRUNE_EVERY`` also deletes the older rows, and the
+``prune_cv_metrics`` command does it on demand. ``stage_histograms`` aggregates
+the rows into per-stage histograms for the metrics endpoint.
+
+With no profile open, ``stage`` returns a shared no-op context and ``timed``
+calls straight through: a ContextVar lookup per instrumented call.
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import CVExtractionMetrics
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets, in milliseconds
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_current_profile = contextvars.ContextVar('cv_profile', default=None)
+_NO_STAGE = contextlib.nullcontext()
+
+
+class CVProfile:
+    """Stage durations and counts of one CV extraction."""
+
+    def __init__(self, file_extension=''):
+        self.file_extension = file_extension
+        self.stages = {}
+        self.counts = {'text_length': 0, 'page_count': 0, 'ocr_pages': 0, 'ocr_cached_pages': 0}
+        self.cache = ''
+        self.started = time.perf_counter()
+        self.total = None
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def as_dict(self):
+        return {
+            'file_extension': self.file_extension,
+            'total_ms': round((self.total or 0) * 1000, 3),
+            'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+            'cache': self.cache,
+            **self.counts,
+        }
+
+
+class _Stage:
+    __slots__ = ('profile', 'name', 'start')
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.profile.add(self.name, time.perf_counter() - self.start)
+
+
+def current_profile():
+    """The profile of the CV being extracted, or None."""
+    return _current_profile.get()
+
+
+def stage(name):
+    """Context manager adding the time of its block to stage ``name`` of the current profile."""
+    profile = _current_profile.get()
+    if profile is None:
+        return _NO_STAGE
+    return _Stage(profile, name)
+
+
+def timed(name=None):
+    """Decorator timing each call of a function as stage ``name``, its own name by default."""
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.add(stage_name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def note(**counts):
+    """Add to the counts (text_length, page_count, ocr_pages, ...) of the current profile."""
+    profile = _current_profile.get()
+    if profile is not None:
+        for name, value in counts.items():
+            profile.counts[name] = profile.counts.get(name, 0) + value
+
+
+def note_cache(layer):
+    """Record which cache layer served the current CV: 'result' or 'text'."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.cache = layer
+
+
+def start(file_extension, force=False):
+    """
+    Open a profile for the CV about to be extracted.
+
+    Args:
+        file_extension (str): Extension of the CV file
+        force (bool): Open one even when CV_METRICS_ENABLED is off
+
+    Returns:
+        tuple: (profile, token) to hand to finish; (None, None) when not profiling
+    """
+    if not (force or settings.CV_METRICS_ENABLED):
+        return None, None
+    profile = CVProfile(file_extension)
+    return profile, _current_profile.set(profile)
+
+
+def finish(profile, token, metrics=None):
+    """
+    Close a profile opened by start, then log and store it when metrics are enabled.
+
+    Args:
+        profile (CVProfile): Profile returned by start, or None
+        token (Token): Token returned by start
+        metrics (dict): If given, filled with the profile as a dict
+    """
+    if profile is None:
+        return
+    _current_profile.reset(token)
+    profile.total = time.perf_counter() - profile.started
+    data = profile.as_dict()
+    if metrics is not None:
+        metrics.update(data)
+    if settings.CV_METRICS_ENABLED:
+        record(profile, data)
+
+
+def record(profile, data):
+    """Log the metrics of one CV as a JSON line and store them; failures never fail an extraction."""
+    logger.info(f"cv_extraction {json.dumps(data)}")
+    try:
+        CVExtractionMetrics.objects.create(
+            file_extension=profile.file_extension,
+            total_seconds=profile.total,
+            text_length=profile.counts['text_length'],
+            page_count=profile.counts['page_count'],
+            ocr_pages=profile.counts['ocr_pages'],
+            cache=profile.cache,
+            stages=profile.stages,
+        )
+        # A DELETE over the table on every extraction would cost more than the INSERT
+        if settings.CV_METRICS_PRUNE_EVERY and random.random() * settings.CV_METRICS_PRUNE_EVERY < 1:
+            prune_metrics()
+    except Exception as e:
+        logger.error(f"Error storing CV extraction metrics: {str(e)}")
+
+
+def prune_metrics():
+    """
+    Delete the metrics older than CV_METRICS_RETENTION_DAYS.
+
+    Returns:
+        int: Number of rows deleted
+    """
+    cutoff = timezone.now() - timedelta(days=settings.CV_METRICS_RETENTION_DAYS)
+    deleted, _ = CVExtractionMetrics.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+def _histogram(seconds):
+    seconds = sorted(seconds)
+    buckets = {str(bound): 0 for bound in HISTOGRAM_BUCKETS_MS}
+    buckets['inf'] = 0
+    for value in seconds:
+        ms = value * 1000
+        bucket = next((str(bound) for bound in HISTOGRAM_BUCKETS_MS if ms <= bound), 'inf')
+        buckets[bucket] += 1
+    return {
+        'count': len(seconds),
+        'mean_ms': round(sum(seconds) / len(seconds) * 1000, 3),
+        'p50_ms': round(seconds[len(seconds) // 2] * 1000, 3),
+        'p95_ms': round(seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))] * 1000, 3),
+        'max_ms': round(seconds[-1] * 1000, 3),
+        'buckets_ms': buckets,
+    }
+
+
+def stage_histograms(hours=24):
+    """
+    Per-stage duration histograms of the CVs extracted recently.
+
+    Args:
+        hours (int): How far back to look
+
+    Returns:
+        dict: Number of CVs, OCR and cache usage, and for each stage (and the
+        total) the count, mean, p50, p95 and max in milliseconds and the count
+        per bucket, keyed by the bucket's upper bound in milliseconds
+    """
+    since = timezone.now() - timedelta(hours=hours)
+    rows = CVExtractionMetrics.objects.filter(created_at__gte=since).values_list(
+        'total_seconds', 'stages', 'page_count', 'ocr_pages', 'text_length', 'cache', 'file_extension'
+    )
+    totals, stages, by_extension, by_cache = [], {}, {}, {}
+    pages = ocr_cvs = text_length = 0
+    for total_seconds, row_stages, page_count, ocr_pages, length, cache, file_extension in rows.iterator(chunk_size=1000):
+        totals.append(total_seconds)
+        for name, seconds in (row_stages or {}).items():
+            stages.setdefault(name, []).append(seconds)
+        pages += page_count
+        ocr_cvs += bool(ocr_pages)
+        text_length += length
+        by_extension[file_extension] = by_extension.get(file_extension, 0) + 1
+        by_cache[cache or 'miss'] = by_cache.get(cache or 'miss', 0) + 1
+
+    return {
+        'hours': hours,
+        'cvs': len(totals),
+        'by_file_extension': by_extension,
+        'by_cache': by_cache,
+        'ocr_share': round(ocr_cvs / len(totals), 4) if totals else None,
+        'mean_page_count': round(pages / len(totals), 2) if totals else None,
+        'mean_text_length': round(text_length / len(totals)) if totals else None,
+        'total': _histogram(totals) if totals else None,
+        'stages': {name: _histogram(seconds) for name, seconds in sorted(stages.items())},
+    }
@@ -0,0 +1,305 @@
+"""
+Page-parallel OCR for scanned PDF CVs.
+
+Rendering a whole scanned PDF at 300 DPI and OCRing it page by page keeps one
+core busy for tens of seconds. ``ocr_pdf`` instead renders and OCRs each page in
+a bounded process pool: a worker renders only its own page (pdf2image
+``first_page``/``last_page``, in greyscale) and hands the image straight to
+tesseract, then drops it.
+
+Limits:
+
+* at most ``CV_OCR_MAX_PAGES`` pages are processed;
+* rendering and OCR of a page each give up after ``CV_OCR_PAGE_TIMEOUT``
+  seconds (poppler and tesseract are killed by their own timeouts);
+* pages not finished when the ``CV_OCR_DEADLINE`` passes are cancelled and
+  left empty;
+* the pages being OCRed at once must fit in ``CV_OCR_MEMORY_BUDGET_MB``.
+
+Memory grows with the pixels of a page, so pages are submitted one window at a
+time and each worker reports the peak memory its page took (its own and that of
+poppler and tesseract). From the worst bytes per pixel seen so far, the next
+pages get the highest DPI (down to ``CV_OCR_MIN_DPI``) at which the window fits
+the budget; failing that the window shrinks, and when a single page at the
+lowest DPI does not fit, OCR stops early with the pages done so far.
+
+``ocr_pdf_pages`` OCRs only the given pages and returns their texts by page
+number; ``ocr_pdf`` joins the texts of all pages in page order, whichever
+worker finishes first.
+"""
+import logging
+import re
+import resource
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+
+from .ocr_preprocessing import ocr_preset
+
+logger = logging.getLogger(__name__)
+
+# Assumed working memory per rendered pixel until a page has been measured: the
+# greyscale render, the copies preprocessing makes, and the PNG and buffers
+# tesseract works on
+DEFAULT_BYTES_PER_PIXEL = 8
+DPI_STEP = 50
+# Bump when rendering, preprocessing or tesseract options change; cached page texts of older versions are OCRed again
+OCR_VERSION = '2'
+A4_POINTS = (595, 842)
+
+# The PDF being OCRed, set once per worker process by the pool initializer
+_pdf_source = None
+
+
+def _set_source(source):
+    global _pdf_source
+    _pdf_source = source
+
+
+def ocr_version():
+    """OCR_VERSION and the preset in use; OCR text is only reused under the same one."""
+    return f"{OCR_VERSION}-{settings.CV_OCR_PRESET}"
+
+
+def _is_bytes(source):
+    return isinstance(source, (bytes, bytearray))
+
+
+def pdf_info(source):
+    """
+    Page count and page size of a PDF given by path or bytes.
+
+    Returns:
+        tuple: (pages, (width, height)); the size is in points, of the first page
+    """
+    from pdf2image import pdfinfo_from_bytes, pdfinfo_from_path
+
+    info = pdfinfo_from_bytes(source) if _is_bytes(source) else pdfinfo_from_path(source)
+    size = re.match(r'\s*([\d.]+)\s*x\s*([\d.]+)', info.get('Page size', ''))
+    return int(info['Pages']), (tuple(float(value) for value in size.groups()) if size else A4_POINTS)
+
+
+def pdf_page_count(source):
+    """Number of pages of a PDF given by path or bytes."""
+    return pdf_info(source)[0]
+
+
+def page_pixels(page_size, dpi):
+    width, height = page_size
+    return int(width / 72 * dpi) * int(height / 72 * dpi)
+
+
+def _status_bytes(field):
+    """A Vm* line of /proc/self/status in bytes, None where there is no procfs."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def _reset_peak():
+    """Reset this process's peak RSS so the next reading covers one page only; returns the current RSS."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+    return _status_bytes('VmRSS')
+
+
+def _children_peak():
+    # ru_maxrss is in KiB on Linux: the largest finished poppler or tesseract run
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+
+
+def _ocr_page(page_number, dpi, page_timeout):
+    """
+    Render one page of the worker's PDF and OCR it.
+
+    Returns:
+        tuple: (text, bytes) where bytes is the peak memory the page took
+    """
+    from pdf2image import convert_from_bytes, convert_from_path
+    from .cv_processing_logic import extract_text_from_image
+
+    baseline = _reset_peak()
+    children_before = _children_peak()
+    start_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    convert = convert_from_bytes if _is_bytes(_pdf_source) else convert_from_path
+    images = convert(
+        _pdf_source, dpi=dpi, first_page=page_number, last_page=page_number,
+        grayscale=True, timeout=page_timeout
+    )
+    text = ''
+    for image in images:
+        # A failed page is reported as one, not as a page without text
+        text = extract_text_from_image(image, timeout=page_timeout, dpi=dpi, raise_errors=True)
+        image.close()
+    del images
+
+    if baseline is not None:
+        own = _status_bytes('VmHWM') - baseline
+    else:
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - start_peak
+    # A child peak below an earlier page's is not visible; the budget keeps the worst ratio anyway
+    children = _children_peak()
+    return text, max(own, 0) + (children if children > children_before else 0)
+
+
+class MemoryBudget:
+    """Picks DPI and pages in flight so that the pages being OCRed fit the budget."""
+
+    def __init__(self, budget, page_size, dpi, min_dpi, window):
+        self.budget = budget
+        self.page_size = page_size
+        self.dpis = list(range(dpi, min(min_dpi, dpi) - 1, -DPI_STEP))
+        if self.dpis[-1] != min(min_dpi, dpi):
+            self.dpis.append(min(min_dpi, dpi))
+        self.max_window = window
+        self.bytes_per_pixel = DEFAULT_BYTES_PER_PIXEL
+        self.peak = 0
+        self.dpi, self.window = self.plan()
+
+    def plan(self):
+        """(dpi, window) that fits the budget, or (None, 0) if not even one page does."""
+        for window in range(self.max_window, 0, -1):
+            for dpi in self.dpis:
+                if window * page_pixels(self.page_size, dpi) * self.bytes_per_pixel <= self.budget:
+                    return dpi, window
+        return None, 0
+
+    def record(self, dpi, used):
+        """Take a measured page into account and replan."""
+        self.peak = max(self.peak, used)
+        self.bytes_per_pixel = max(self.bytes_per_pixel, used / page_pixels(self.page_size, dpi))
+        dpi, window = self.plan()
+        if (dpi, window) != (self.dpi, self.window):
+            logger.info(f"OCR memory: {used / 2 ** 20:.0f} MB for a page at {self.dpi} DPI, "
+                        f"continuing at {dpi} DPI with {window} pages at once")
+        self.dpi, self.window = dpi, window
+
+
+def ocr_pdf_pages(source, page_numbers=None, dpi=None, workers=None, max_pages=None, page_timeout=None,
+                  deadline=None, memory_budget=None, stats=None):
+    """
+    OCR some or all pages of a scanned PDF in parallel.
+
+    Args:
+        source (str or bytes): Path of the PDF, or its contents
+        page_numbers (list): Pages to OCR, numbered from 1; all pages by default
+        dpi (int): Rendering resolution, that of the OCR preset by default; may be
+            lowered to fit the memory budget
+        workers (int): Pool size, CV_OCR_WORKERS by default
+        max_pages (int): Pages to OCR at most, CV_OCR_MAX_PAGES by default
+        page_timeout (int): Seconds allowed to render, and to OCR, one page
+        deadline (float): Seconds after which unfinished pages are cancelled
+        memory_budget (int): Bytes the pages in flight may use, CV_OCR_MEMORY_BUDGET_MB by default
+        stats (dict): If given, filled with the pages done, DPI per page and peak page
+            memory, and ``complete``: whether every page was OCRed at the requested DPI
+
+    Returns:
+        dict: Text by page number, for the pages that were OCRed
+    """
+    dpi = dpi or ocr_preset()['dpi']
+    workers = workers or settings.CV_OCR_WORKERS
+    max_pages = max_pages or settings.CV_OCR_MAX_PAGES
+    page_timeout = page_timeout or settings.CV_OCR_PAGE_TIMEOUT
+    deadline = deadline or settings.CV_OCR_DEADLINE
+    memory_budget = memory_budget or settings.CV_OCR_MEMORY_BUDGET_MB * 2 ** 20
+    started = time.monotonic()
+
+    page_count, page_size = pdf_info(source)
+    if page_numbers is None:
+        page_numbers = range(1, page_count + 1)
+    queue = [page_number for page_number in page_numbers if 1 <= page_number <= page_count]
+    requested_pages = len(queue)
+    if len(queue) > max_pages:
+        logger.warning(f"PDF has {len(queue)} pages to OCR, OCRing the first {max_pages}")
+        queue = queue[:max_pages]
+    texts = {}
+    page_dpi = {}
+    budget = MemoryBudget(memory_budget, page_size, dpi, settings.CV_OCR_MIN_DPI, min(workers, len(queue)) or 1)
+    # The window only ever shrinks, so this is the most pages in flight at once
+    pages_in_flight = budget.window
+    next_index = 0
+
+    def finish_page(page_number, result):
+        text, used = result
+        texts[page_number] = text
+        budget.record(page_dpi[page_number], used)
+
+    if budget.window <= 1:
+        # Not worth a pool; the deadline and budget are still checked between pages
+        _set_source(source)
+        while next_index < len(queue) and budget.window:
+            if time.monotonic() - started > deadline:
+                logger.warning(f"OCR deadline passed, {len(queue) - next_index} of {len(queue)} pages skipped")
+                break
+            page_number = queue[next_index]
+            page_dpi[page_number] = budget.dpi
+            try:
+                finish_page(page_number, _ocr_page(page_number, budget.dpi, page_timeout))
+            except Exception as e:
+                logger.warning(f"Error using OCR on PDF page {page_number}: {str(e)}")
+            next_index += 1
+        _set_source(None)
+    else:
+        executor = ProcessPoolExecutor(max_workers=budget.window, initializer=_set_source, initargs=(source,))
+        try:
+            futures = {}
+            while True:
+                # Keep one window of pages in flight, at the DPI the budget allows now
+                while next_index < len(queue) and len(futures) < budget.window:
+                    page_number = queue[next_index]
+                    page_dpi[page_number] = budget.dpi
+                    futures[executor.submit(_ocr_page, page_number, budget.dpi, page_timeout)] = page_number
+                    next_index += 1
+                if not futures:
+                    break
+                remaining = deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    logger.warning(f"OCR deadline passed, {len(futures) + len(queue) - next_index} of {len(queue)} pages skipped")
+                    break
+                done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_number = futures.pop(future)
+                    try:
+                        finish_page(page_number, future.result())
+                    except Exception as e:
+                        logger.warning(f"Error using OCR on PDF page {page_number}: {str(e)}")
+        finally:
+            # Running pages end with their own timeouts
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if not budget.window and next_index < len(queue):
+        logger.warning(f"OCR memory budget exceeded, {len(queue) - next_index} of {len(queue)} pages skipped")
+    if stats is not None:
+        stats.update({
+            'pages': len(queue),
+            'pages_done': len(texts),
+            'requested_dpi': dpi,
+            'dpi': page_dpi,
+            'peak_page_bytes': budget.peak,
+            'pages_in_flight': pages_in_flight,
+            'budget_bytes': memory_budget,
+            'complete': len(texts) == requested_pages and all(page_dpi[page] == dpi for page in texts),
+        })
+    return texts
+
+
+def ocr_pdf(source, dpi=None, stats=None, **options):
+    """
+    OCR all pages of a scanned PDF in parallel; takes the options of ``ocr_pdf_pages``.
+
+    Returns:
+        str: Page texts in page order, separated by blank lines
+    """
+    stats = {} if stats is None else stats
+    texts = ocr_pdf_pages(source, dpi=dpi, stats=stats, **options)
+    return "\n\n".join(texts.get(page_number, '') for page_number in range(1, stats['pages'] + 1))
@@ -1,9 +1,29 @@
 """CV processing module for extracting information from CV/resume files."""
+import contextvars
+import hashlib
+import io
+import logging
 import re
 import os
 import tempfile
+import time
 from datetime import datetime
 
+from bisect import bisect_right
+from collections import namedtuple
+
+from django.conf import settings
+
+from . import cv_cache, cv_metrics
+from .cv_ocr import ocr_pdf_pages, ocr_version
+from .ocr_preprocessing import ocr_preset, preprocess_image
+from .keyword_matcher import KeywordMatcher
+from .docx_text import stream_docx_lines
+from .pdf_text import PdfText
+from .cv_sections import CVSections
+
+logger = logging.getLogger(__name__)
+
 # Aviation-specific constants and keywords
 AVIATION_LICENSES = [
     'ATPL', 'Airline Transport Pilot License', 'Airline Transport Pilot Licence',
@@ -52,6 +72,15 @@ AIRCRAFT_TYPES = [
     'Beechcraft', 'Piper', 'Dash 8', 'CRJ', 'Saab', 'Dornier', 'Learjet'
 ]
 
+# Compiled once; scanning a CV with it finds every keyword family in one pass
+AVIATION_KEYWORD_MATCHER = KeywordMatcher({
+    'licenses': AVIATION_LICENSES,
+    'experience': AVIATION_EXPERIENCE_KEYWORDS,
+    'technical_skills': AVIATION_TECHNICAL_SKILLS,
+    'compliance': AVIATION_COMPLIANCE_KEYWORDS,
+    'aircraft': AIRCRAFT_TYPES,
+})
+
 # Function to parse date from various string formats
 def parse_date_from_string(date_str):
     """
@@ -148,13 +177,66 @@ except ImportError:
 
 
 
-def extract_cv_information(cv_file):
-    """
-    Extract information from a CV file with enhanced support for multiple formats.
-    Handles PDFs (including image-based), DOCX, and image files through OCR.
-    Includes special handling for aviation-specific data.
-    """
-    extracted_data = {
+# Bump when text extraction changes; cached raw text of older versions is re-extracted
+CV_TEXT_VERSION = '4'
+# Bump when any extractor changes; cached results of older versions are rebuilt from the cached text
+CV_PARSER_VERSION = '2'
+# Files not already on local disk are parsed from memory up to this size, larger ones from a temporary copy
+CV_IN_MEMORY_MAX_BYTES = 10 * 1024 * 1024
+# Longer lines are wrapped before the extractors see them. Every extractor
+# pattern stays within a line, so this bounds the work any one match attempt
+# can do, whatever the layout of the file
+CV_MAX_LINE_CHARS = 1000
+
+
+class CVExtractionTimeout(Exception):
+    """The per-CV extraction deadline passed; what was extracted so far is kept."""
+
+
+# Monotonic time by which the CV being extracted must be done, None for no limit
+_extraction_deadline = contextvars.ContextVar('cv_extraction_deadline', default=None)
+
+
+def check_deadline():
+    """Raise CVExtractionTimeout if the deadline of the CV being extracted has passed."""
+    deadline = _extraction_deadline.get()
+    if deadline is not None and time.monotonic() > deadline:
+        raise CVExtractionTimeout("CV extraction deadline passed")
+
+
+def wrap_long_lines(text, width=CV_MAX_LINE_CHARS):
+    """Break lines longer than ``width`` characters at the last space before the limit."""
+    if len(text) <= width:
+        return text
+    lines = []
+    for line in text.split('\n'):
+        start = 0
+        while len(line) - start > width:
+            cut = line.rfind(' ', start, start + width + 1)
+            if cut <= start:
+                cut = start + width
+            lines.append(line[start:cut])
+            start = cut
+            while start < len(line) and line[start] == ' ':
+                start += 1
+        lines.append(line[start:])
+    return '\n'.join(lines)
+
+
+# Three or more line ends with only whitespace between them. Patterns that
+# start with \n\s* scan every blank line after each one they try, so long runs
+# of them are collapsed before the extractors run.
+_BLANK_LINES_RE = re.compile(r'\n[ \t\r\f\v]*(?:\n[ \t\r\f\v]*){2,}')
+
+
+def collapse_blank_lines(text):
+    """Keep at most one blank line between two lines of text."""
+    return _BLANK_LINES_RE.sub('\n\n', text)
+
+
+def empty_cv_information():
+    """The structure extract_cv_information returns, with nothing extracted."""
+    return {
         'personal_info': {},
         'experience': {},
         'employment_history': [],
@@ -165,131 +247,117 @@ def extract_cv_information(cv_file):
             'aviation_skills': {}
         }
     }
+
+
+# Parts of the result extract_cv_information can be limited to; the last three
+# are in 'aviation_data' and only extracted from aviation CVs
+CV_SECTIONS = (
+    'personal_info', 'experience', 'employment_history', 'qualifications',
+    'licenses', 'flight_experience', 'aviation_skills',
+)
+AVIATION_SECTIONS = {'licenses', 'flight_experience', 'aviation_skills'}
+
+
+def parse_sections(sections):
+    """
+    Validate a choice of CV sections.
+    
+    Args:
+        sections (str or list): Section names, or a comma-separated string of them; empty for all
+        
+    Returns:
+        tuple: The sections in CV_SECTIONS order, or None for all of them
+        
+    Raises:
+        ValueError: A name is not in CV_SECTIONS
+    """
+    if isinstance(sections, str):
+        sections = sections.split(',')
+    names = {name.strip() for name in sections or () if name.strip()}
+    unknown = names - set(CV_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown CV sections: {', '.join(sorted(unknown))}; choose from {', '.join(CV_SECTIONS)}")
+    if not names or names == set(CV_SECTIONS):
+        return None
+    return tuple(name for name in CV_SECTIONS if name in names)
+
+
+def extract_cv_information(cv_file, use_cache=True, metrics=None, sections=None):
+    """
+    Extract information from a CV file with enhanced support for multiple formats.
+    Handles PDFs (including image-based), DOCX, and image files through OCR.
+    Includes special handling for aviation-specific data.
+
+    Extraction is cached by the SHA-256 of the file bytes (see cv_cache): the
+    raw text while CV_TEXT_VERSION is unchanged, the result while
+    CV_PARSER_VERSION is unchanged.
+
+    Stage timings are logged and stored when CV_METRICS_ENABLED is on (see
+    cv_metrics); ``metrics``, if given, is filled with them either way.
+    
+    ``sections`` limits extraction to some parts of the result (see
+    CV_SECTIONS and parse_sections); the others are left empty. The cached
+    text is still used, and a cached full result is returned as it is, but a
+    partial result is not cached. Neither is anything extracted from a file
+    whose OCR did not complete (see extract_text_from_file).
+    
+    Raises:
+        ValueError: sections names an unknown section
+    """
+    sections = parse_sections(sections)
+    extracted_data = empty_cv_information()
+    started = time.perf_counter()
     
     file_ext = os.path.splitext(cv_file.name)[1].lower()
+    use_cache = use_cache and cv_cache.cache_enabled()
+    profile, profile_token = cv_metrics.start(file_ext, force=metrics is not None)
     
-    # Save the uploaded file to a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-        for chunk in cv_file.chunks():
-            temp_file.write(chunk)
-        temp_file_path = temp_file.name
+    # Parse the file where it already is; copy it only as a last resort
+    try:
+        source, content_hash, temp_file_path = open_cv_source(cv_file, file_ext)
+    except Exception:
+        cv_metrics.finish(profile, profile_token, metrics)
+        raise
+    text_version = f"{CV_TEXT_VERSION}+ocr-{ocr_version()}" if OCR_ENABLED else CV_TEXT_VERSION
     
     try:
-        extracted_text = ""
-        
-        # Extract text based on file type
-        if file_ext == '.pdf':
-            # First try normal PDF text extraction
-            extracted_text = extract_text_from_pdf(temp_file_path)
-            
-            # If little text was extracted, the PDF might be image-based - try OCR
-            if len(extracted_text.strip()) < 100 and OCR_ENABLED:
-                print("PDF appears to be image-based or has little text. Attempting OCR...")
-                
-                # Use OCR on the PDF (treat it like an image)
-                try:
-                    from pdf2image import convert_from_path
-                    
-                    # Convert PDF to images
-                    pdf_images = convert_from_path(temp_file_path, dpi=300)
-                    
-                    # Process each page with OCR
-                    ocr_texts = []
-                    for i, image in enumerate(pdf_images):
-                        # Save the image temporarily
-                        img_path = f"{temp_file_path}_page_{i}.png"
-                        image.save(img_path, 'PNG')
-                        
-                        # Extract text with OCR
-                        page_text = extract_text_from_image(img_path)
-                        ocr_texts.append(page_text)
-                        
-                        # Remove the temporary image
-                        try:
-                            os.unlink(img_path)
-                        except:
-                            pass
-                    
-                    # Combine OCR text from all pages
-                    ocr_text = "\n\n".join(ocr_texts)
-                    
-                    # If OCR extracted more text, use it
-                    if len(ocr_text) > len(extracted_text):
-                        print(f"OCR extracted {len(ocr_text)} characters, compared to {len(extracted_text)} with direct extraction")
-                        extracted_text = ocr_text
-                
-                except ImportError:
-                    print("pdf2image not installed. Cannot process image-based PDFs with OCR.")
-                except Exception as e:
-                    print(f"Error using OCR on PDF: {str(e)}")
-        
-        # Extract text from DOCX
-        elif file_ext == '.docx':
-            extracted_text = extract_text_from_docx(temp_file_path)
-        
-        # Handle image formats using OCR
-        elif file_ext in ['.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp', '.gif']:
-            if OCR_ENABLED:
-                extracted_text = extract_text_from_image(temp_file_path)
-            else:
-                print("OCR capability is disabled. Cannot extract text from image files.")
-        
-        # Try plain text file
-        elif file_ext in ['.txt', '.text', '.md', '.rtf']:
-            try:
-                with open(temp_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    extracted_text = f.read()
-            except Exception as e:
-                print(f"Error reading text file: {str(e)}")
-        
+        cached_text, cached_result = None, None
+        if use_cache:
+            with cv_metrics.stage('cache_lookup'):
+                cached_text, cached_result = cv_cache.lookup(content_hash, file_ext, text_version, CV_PARSER_VERSION)
+        if cached_result is not None:
+            logger.debug(f"Using cached CV extraction for {content_hash[:12]}")
+            cv_metrics.note_cache('result')
+            return cached_result
+        
+        if cached_text is not None:
+            logger.debug(f"Using cached CV text for {content_hash[:12]}")
+            cv_metrics.note_cache('text')
+            extracted_text = cached_text
         else:
-            print(f"Unsupported file format: {file_ext}")
-            extracted_text = ""
-            
-        # Print the extracted text for debugging
-        print(f"Extracted text length: {len(extracted_text)}")
-        if len(extracted_text) < 100:
-            print("Warning: Very little text extracted. The file may be empty, unreadable, or incompatible.")
-            if len(extracted_text) > 0:
-                print(f"Preview: {extracted_text[:100]}")
-        
-        # Process the extracted text if we have enough content
-        if extracted_text and len(extracted_text.strip()) > 50:  # Ensure we have meaningful text
-            # Extract personal information
-            extracted_data['personal_info'] = extract_personal_info(extracted_text)
-            
-            # First check if this is an aviation CV by looking for keywords
-            is_aviation_cv = check_if_aviation_cv(extracted_text)
-            
-            # Extract general experience (this works for all CVs)
-            extracted_data['experience'] = extract_experience(extracted_text)
-            
-            # Extract employment history
-            extracted_data['employment_history'] = extract_employment_history(extracted_text)
-            
-            # Perform special aviation-specific extraction if it's an aviation CV
-            if is_aviation_cv:
-                print("Detected aviation CV, performing specialized extraction")
-                
-                # Extract aviation licenses
-                aviation_licenses = extract_aviation_licenses(extracted_text)
-                extracted_data['aviation_data']['licenses'] = aviation_licenses
-                
-                # Extract flight experience
-                flight_experience = extract_aviation_experience(extracted_text)
-                extracted_data['aviation_data']['flight_experience'] = flight_experience
-                
-                # Extract aviation skills
-                aviation_skills = extract_aviation_skills(extracted_text)
-                extracted_data['aviation_data']['aviation_skills'] = aviation_skills
-                
-                # Add aviation certifications to qualifications
-                extracted_data['qualifications'] = extract_qualifications_excluding_licenses(extracted_text, aviation_licenses)
-            else:
-                # Regular qualification extraction for non-aviation CVs
-                extracted_data['qualifications'] = extract_qualifications(extracted_text)
-        else:
-            print("Insufficient text extracted from the CV. Unable to process.")
+            text_stats = {}
+            extracted_text = extract_text_from_file(source, file_ext, use_cache=use_cache, stats=text_stats)
+            if not text_stats['complete']:
+                # Another try may OCR the pages that failed, ran out of time or were rendered smaller
+                logger.warning(f"OCR of {content_hash[:12]} did not complete, its text and result are not cached")
+                use_cache = False
+            if use_cache:
+                with cv_metrics.stage('cache_store'):
+                    cv_cache.store_text(content_hash, file_ext, extracted_text, text_version)
+        cv_metrics.note(text_length=len(extracted_text))
+        
+        # Filled in place, so whatever was extracted before an error is kept
+        extract_information_from_text(extracted_text, extracted_data, sections=sections)
+        if use_cache and sections is None:
+            with cv_metrics.stage('cache_store'):
+                cv_cache.store_result(content_hash, extracted_text, extracted_data, CV_PARSER_VERSION)
+    
+    except CVExtractionTimeout as e:
+        # Partial results are returned but not cached
+        logger.warning(f"{e}, returning the information extracted so far")
+    
+    except MemoryError:
+        raise
     
     except Exception as e:
         # Log the error
@@ -298,43 +366,283 @@ def extract_cv_information(cv_file):
         traceback.print_exc()
     
     finally:
-        # Clean up the temporary file
+        # Clean up the temporary copy, if one was needed
+        if temp_file_path:
+            try:
+                os.unlink(temp_file_path)
+            except:
+                pass
+        logger.debug(f"CV extraction took {(time.perf_counter() - started) * 1000:.0f} ms")
+        cv_metrics.finish(profile, profile_token, metrics)
+    
+    return extracted_data
+
+
+def _local_path(cv_file):
+    """Path of an upload or stored file that is already on local disk, or None."""
+    if hasattr(cv_file, 'temporary_file_path'):
+        return cv_file.temporary_file_path()
+    try:
+        path = cv_file.path
+    except (AttributeError, NotImplementedError, ValueError):
+        return None
+    return path if os.path.exists(path) else None
+
+
+@cv_metrics.timed('read_file')
+def open_cv_source(cv_file, file_ext):
+    """
+    Find the cheapest source to parse a CV from, and hash its bytes.
+    
+    Stored files and large uploads (TemporaryUploadedFile) are parsed from
+    their own path, small in-memory uploads and files on remote storage from a
+    bytes buffer. Only large files with no local path are copied to a
+    temporary file.
+    
+    Args:
+        cv_file (File): Uploaded file or FieldFile
+        file_ext (str): Lower-case file extension, including the dot
+        
+    Returns:
+        tuple: (source, content_hash, temp_file_path); source is a path or
+            bytes, temp_file_path is set when a copy was made and must be removed
+    """
+    digest = hashlib.sha256()
+    path = _local_path(cv_file)
+    if path:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        logger.debug(f"Parsing CV from {path}, 0 bytes copied")
+        return path, digest.hexdigest(), None
+    
+    if cv_file.size is not None and cv_file.size <= CV_IN_MEMORY_MAX_BYTES:
+        data = b''.join(cv_file.chunks())
+        digest.update(data)
+        logger.debug("Parsing CV from memory, 0 bytes copied")
+        return data, digest.hexdigest(), None
+    
+    bytes_copied = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
+        for chunk in cv_file.chunks():
+            digest.update(chunk)
+            temp_file.write(chunk)
+            bytes_copied += len(chunk)
+    logger.debug(f"Parsing CV from a temporary copy, {bytes_copied} bytes copied")
+    return temp_file.name, digest.hexdigest(), temp_file.name
+
+
+def _binary_stream(source):
+    """Binary file object for a path or a bytes buffer; the caller closes it."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return open(source, 'rb')
+
+
+@cv_metrics.timed('text_extraction')
+def extract_text_from_file(source, file_ext, use_cache=True, stats=None):
+    """
+    Extract the raw text of a CV file, using OCR for image-based files.
+    
+    Args:
+        source (str or bytes): Path of the file, or its contents
+        file_ext (str): Lower-case file extension, including the dot
+        use_cache (bool): Whether OCR text of scanned PDF pages may come from the page cache
+        stats (dict): If given, ``complete`` is set to whether all the OCR the
+            file needed succeeded, on every page and at the requested DPI
+        
+    Returns:
+        str: Extracted text, empty if none could be extracted
+    """
+    extracted_text = ""
+    stats = {} if stats is None else stats
+    stats['complete'] = True
+    
+    # Extract text based on file type
+    if file_ext == '.pdf':
+        # Use the text layer of each page, and OCR the pages that only hold images
+        if OCR_ENABLED:
+            extracted_text = extract_text_from_pdf_with_ocr(source, use_cache=use_cache, stats=stats)
+        else:
+            extracted_text = extract_text_from_pdf(source)
+    
+    # Extract text from DOCX
+    elif file_ext == '.docx':
+        extracted_text = extract_text_from_docx(source)
+    
+    # Handle image formats using OCR
+    elif file_ext in ['.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp', '.gif']:
+        if OCR_ENABLED:
+            cv_metrics.note(page_count=1, ocr_pages=1)
+            try:
+                extracted_text = extract_text_from_image(source, raise_errors=True)
+            except Exception as e:
+                logger.error(f"Error extracting text from image using OCR: {str(e)}")
+                stats['complete'] = False
+        else:
+            print("OCR capability is disabled. Cannot extract text from image files.")
+    
+    # Try plain text file
+    elif file_ext in ['.txt', '.text', '.md', '.rtf']:
         try:
-            os.unlink(temp_file_path)
-        except:
-            pass
+            with io.TextIOWrapper(_binary_stream(source), encoding='utf-8', errors='ignore') as f:
+                extracted_text = f.read()
+        except Exception as e:
+            print(f"Error reading text file: {str(e)}")
+    
+    else:
+        print(f"Unsupported file format: {file_ext}")
+        extracted_text = ""
+        
+    # Print the extracted text for debugging
+    print(f"Extracted text length: {len(extracted_text)}")
+    if len(extracted_text) < 100:
+        print("Warning: Very little text extracted. The file may be empty, unreadable, or incompatible.")
+        if len(extracted_text) > 0:
+            print(f"Preview: {extracted_text[:100]}")
     
+    return extracted_text
+
+
+@cv_metrics.timed('field_extraction')
+def extract_information_from_text(extracted_text, extracted_data=None, timings=None, deadline=None, sections=None):
+    """
+    Run the extractors over the raw text of a CV.
+    
+    Args:
+        extracted_text (str): Text from extract_text_from_file
+        extracted_data (dict): Structure to fill in, a new one if not given
+        timings (dict): If given, filled with the seconds each extractor took, by function name;
+            by default they go to the stages of the CV profile being recorded, if any
+        deadline (float): Seconds the extractors may take, CV_EXTRACTION_DEADLINE by default; 0 for no limit
+        sections (list): Parts of the result to extract, from CV_SECTIONS; all by default. Only
+            their extractors run, and only the keyword scan and aviation check they need
+        
+    Returns:
+        dict: Extracted information, structured like empty_cv_information()
+        
+    Raises:
+        CVExtractionTimeout: The deadline passed; extracted_data keeps what was extracted until then
+    """
+    if extracted_data is None:
+        extracted_data = empty_cv_information()
+    if timings is None and cv_metrics.current_profile() is not None:
+        timings = cv_metrics.current_profile().stages
+    if deadline is None:
+        deadline = settings.CV_EXTRACTION_DEADLINE
+    token = _extraction_deadline.set(time.monotonic() + deadline if deadline else None)
+    try:
+        if extracted_text:
+            extracted_text = wrap_long_lines(collapse_blank_lines(extracted_text))
+        _extract_information(extracted_text, extracted_data, timings, sections)
+    finally:
+        _extraction_deadline.reset(token)
     return extracted_data
 
 
-def check_if_aviation_cv(text):
+def _extract_information(extracted_text, extracted_data, timings, sections=None):
+    def run(func, *args, name=None):
+        check_deadline()
+        if timings is None:
+            return func(*args)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            timings[name or func.__name__] = time.perf_counter() - start
+    
+    wanted = set(sections or CV_SECTIONS)
+    
+    # Inputs shared by several extractors, each computed the first time one needs it
+    shared = {}
+    
+    def keyword_hits():
+        # All aviation keywords, found in one pass
+        if 'keyword_hits' not in shared:
+            shared['keyword_hits'] = run(AVIATION_KEYWORD_MATCHER.scan, extracted_text, name='aviation_keyword_scan')
+        return shared['keyword_hits']
+    
+    def cv_sections():
+        # Section boundaries; CVSections finds them as they are asked for
+        if 'sections' not in shared:
+            shared['sections'] = CVSections(extracted_text)
+        return shared['sections']
+    
+    def is_aviation_cv():
+        if 'is_aviation_cv' not in shared:
+            shared['is_aviation_cv'] = run(check_if_aviation_cv, extracted_text, keyword_hits())
+            if shared['is_aviation_cv']:
+                print("Detected aviation CV, performing specialized extraction")
+        return shared['is_aviation_cv']
+    
+    def aviation_licenses():
+        if 'licenses' not in shared:
+            shared['licenses'] = run(extract_aviation_licenses, extracted_text, keyword_hits(), cv_sections())
+        return shared['licenses']
+    
+    # Process the extracted text if we have enough content
+    if extracted_text and len(extracted_text.strip()) > 50:  # Ensure we have meaningful text
+        # Extract personal information
+        if 'personal_info' in wanted:
+            extracted_data['personal_info'] = run(extract_personal_info, extracted_text)
+        
+        # Extract general experience (this works for all CVs)
+        if 'experience' in wanted:
+            extracted_data['experience'] = run(extract_experience, extracted_text)
+        
+        # Extract employment history
+        if 'employment_history' in wanted:
+            extracted_data['employment_history'] = run(extract_employment_history, extracted_text, cv_sections())
+        
+        # Perform special aviation-specific extraction if it's an aviation CV;
+        # qualifications are extracted differently from one
+        aviation_data = extracted_data['aviation_data']
+        if wanted & (AVIATION_SECTIONS | {'qualifications'}) and is_aviation_cv():
+            if 'licenses' in wanted:
+                aviation_data['licenses'] = aviation_licenses()
+            
+            if 'flight_experience' in wanted:
+                aviation_data['flight_experience'] = run(extract_aviation_experience, extracted_text, keyword_hits())
+            
+            if 'aviation_skills' in wanted:
+                aviation_data['aviation_skills'] = run(
+                    extract_aviation_skills, extracted_text, keyword_hits(), cv_sections()
+                )
+            
+            # Add aviation certifications to qualifications
+            if 'qualifications' in wanted:
+                extracted_data['qualifications'] = run(
+                    extract_qualifications_excluding_licenses, extracted_text, aviation_licenses(), cv_sections()
+                )
+        elif 'qualifications' in wanted:
+            # Regular qualification extraction for non-aviation CVs
+            extracted_data['qualifications'] = run(extract_qualifications, extracted_text, cv_sections())
+    else:
+        print("Insufficient text extracted from the CV. Unable to process.")
+
+
+def check_if_aviation_cv(text, keyword_hits=None):
     """
     Determine if the CV is aviation-related based on keyword frequency.
     
     Args:
         text (str): The CV text content
+        keyword_hits (KeywordHits): Result of AVIATION_KEYWORD_MATCHER.scan(text), if already computed
         
     Returns:
         bool: True if likely an aviation CV, False otherwise
     """
-    # Combine all aviation-related keywords
-    aviation_keywords = (
-        AVIATION_LICENSES +
-        AVIATION_EXPERIENCE_KEYWORDS +
-        AVIATION_TECHNICAL_SKILLS +
-        AVIATION_COMPLIANCE_KEYWORDS +
-        AIRCRAFT_TYPES
-    )
+    if keyword_hits is None:
+        keyword_hits = AVIATION_KEYWORD_MATCHER.scan(text)
     
     # Count occurrences of aviation keywords
-    aviation_keyword_count = 0
-    for keyword in aviation_keywords:
-        matches = re.findall(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE)
-        aviation_keyword_count += len(matches)
+    aviation_keyword_count = sum(
+        keyword_hits.count_all(keywords) for keywords in AVIATION_KEYWORD_MATCHER.families.values()
+    )
     
     # Check for common aviation license references
-    license_matches = re.findall(r'\b(?:ATPL|CPL|PPL|Type Rating|Flight Instructor)\b', text, re.IGNORECASE)
-    if len(license_matches) >= 2:
+    license_matches = keyword_hits.count_all(['ATPL', 'CPL', 'PPL', 'Type Rating', 'Flight Instructor'])
+    if license_matches >= 2:
         return True
     
     # Check for flight hours
@@ -363,19 +671,20 @@ def check_if_aviation_cv(text):
     return False
 
 
-def extract_qualifications_excluding_licenses(text, aviation_licenses):
+def extract_qualifications_excluding_licenses(text, aviation_licenses, sections=None):
     """
     Extract qualifications while excluding aviation licenses already extracted.
     
     Args:
         text (str): The CV text content
         aviation_licenses (list): Already extracted aviation licenses
+        sections (CVSections): Segmentation of text, if already computed
         
     Returns:
         list: Qualifications excluding aviation licenses
     """
     # Get all qualifications first
-    all_qualifications = extract_qualifications(text)
+    all_qualifications = extract_qualifications(text, sections)
     
     # Skip qualifications that match aviation licenses
     filtered_qualifications = []
@@ -397,20 +706,80 @@ def extract_qualifications_excluding_licenses(text, aviation_licenses):
     return filtered_qualifications
 
 
-def extract_text_from_pdf(file_path):
+PdfPage = namedtuple('PdfPage', ['text', 'needs_ocr', 'content_hash'])
+
+
+def _hash_resources(digest, resources, depth=0):
+    """Add the images and forms a page draws to ``digest``."""
+    resources = resources.get_object() if resources is not None else None
+    xobjects = resources.get('/XObject') if resources else None
+    if not xobjects or depth > 5:
+        return
+    xobjects = xobjects.get_object()
+    for name in sorted(xobjects):
+        xobject = xobjects[name].get_object()
+        digest.update(name.encode('utf-8'))
+        digest.update(xobject.get_data())
+        if xobject.get('/Subtype') == '/Form':
+            _hash_resources(digest, xobject.get('/Resources'), depth + 1)
+
+
+def _page_hash(page):
+    """SHA-256 of what a PDF page shows, or None if some of it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        digest.update(f"{list(page.mediabox)} {page.get('/Rotate', 0)}".encode('utf-8'))
+        contents = page.get_contents()
+        if contents is not None:
+            digest.update(contents.get_data())
+        _hash_resources(digest, page.get('/Resources'))
+    except Exception as e:
+        logger.warning(f"Cannot hash PDF page content, its OCR text will not be cached: {str(e)}")
+        return None
+    return digest.hexdigest()
+
+
+def _has_images(page):
+    """Whether a page draws any images or forms, the only things OCR could read."""
+    try:
+        resources = page.get('/Resources')
+        resources = resources.get_object() if resources is not None else None
+        return bool(resources and resources.get('/XObject'))
+    except Exception:
+        return True
+
+
+@cv_metrics.timed('pdf_text_layer')
+def extract_pdf_pages(source, ocr_min_chars=None):
     """
-    Extract text content from a PDF file with enhanced error handling.
-    Attempts multiple extraction methods for better results.
+    Extract the text layer of each page of a PDF.
+    
+    The text is read by the backend of pdf_text that suits the document best;
+    PyPDF2 still reads the metadata and finds the pages that need OCR.
+    
+    Args:
+        source (str or bytes): Path of the PDF, or its contents
+        ocr_min_chars (int): Pages with images and fewer characters of text than
+            this need OCR; they are marked and their content hashed. The other
+            backends are tried on such pages first
+    
+    Returns:
+        tuple: (metadata text, list of PdfPage)
     """
-    text = ""
+    metadata, pages = "", []
     
-    try:
-        # Method 1: Use PyPDF2
-        with open(file_path, 'rb') as file:
+    with _binary_stream(source) as file:
+        try:
             reader = PyPDF2.PdfReader(file)
-            
+            page_count = len(reader.pages)
+        except Exception as e:
+            # Another backend may still read it
+            logger.warning(f"Error reading PDF with PyPDF2: {str(e)}")
+            reader = None
+        
+        try:
             # Get document info if available
-            if reader.metadata:
+            if reader is not None and reader.metadata:
                 meta_text = []
                 if reader.metadata.title:
                     meta_text.append(f"Title: {reader.metadata.title}")
@@ -420,32 +789,151 @@ def extract_text_from_pdf(file_path):
                     meta_text.append(f"Subject: {reader.metadata.subject}")
                 
                 if meta_text:
-                    text += "\n".join(meta_text) + "\n\n"
-            
-            # Extract text from each page
-            for page_num in range(len(reader.pages)):
-                try:
-                    page_text = reader.pages[page_num].extract_text()
-                    if page_text:
-                        text += page_text + "\n\n"
-                except Exception as page_error:
-                    print(f"Error extracting text from PDF page {page_num}: {str(page_error)}")
+                    metadata = "\n".join(meta_text) + "\n\n"
+        except Exception as e:
+            logger.warning(f"Error reading PDF metadata: {str(e)}")
         
-        # If PyPDF2 failed to extract meaningful text, try alternative methods
-        if len(text.strip()) < 50:
-            print("PyPDF2 extracted minimal text. The PDF might be image-based or have text encoding issues.")
+        try:
+            with PdfText(source, reader=reader) as document:
+                backend = document.choose()
+                if reader is None:
+                    page_count = document.page_count()
+                logger.debug(f"Reading PDF text with {backend}")
+                
+                # Extract text from each page
+                for page_num in range(page_count):
+                    page_text = document.page_text(page_num, min_chars=ocr_min_chars)
+                    try:
+                        page = reader.pages[page_num] if reader is not None else None
+                    except Exception as page_error:
+                        logger.warning(f"Error reading PDF page {page_num}: {str(page_error)}")
+                        page = None
+                    
+                    needs_ocr = (
+                        ocr_min_chars is not None and len(page_text.strip()) < ocr_min_chars
+                        and (page is None or _has_images(page))
+                    )
+                    content_hash = _page_hash(page) if needs_ocr and page is not None else None
+                    pages.append(PdfPage(page_text, needs_ocr, content_hash))
+        except MemoryError:
+            # Not a broken PDF but a hostile one; the sandbox reports it (see cv_sandbox)
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF: {str(e)}")
+    
+    cv_metrics.note(page_count=len(pages))
+    return metadata, pages
+
+
+def _join_pdf_text(metadata, page_texts):
+    return metadata + "".join(page_text + "\n\n" for page_text in page_texts if page_text)
+
+
+def extract_text_from_pdf(source):
+    """
+    Extract text content from a PDF file with enhanced error handling.
+    Attempts multiple extraction methods for better results.
     
-    except Exception as e:
-        print(f"Error extracting text from PDF with PyPDF2: {str(e)}")
+    Args:
+        source (str or bytes): Path of the PDF, or its contents
+    """
+    metadata, pages = extract_pdf_pages(source)
+    text = _join_pdf_text(metadata, [page.text for page in pages])
+    
+    # If no backend extracted meaningful text, try alternative methods
+    if len(text.strip()) < 50:
+        logger.info("PDF text layer has minimal text. The PDF might be image-based or have text encoding issues.")
     
     # Return whatever text we managed to extract
     return text
 
 
-def extract_text_from_docx(file_path):
-    """Extract text content from a DOCX file."""
+def extract_text_from_pdf_with_ocr(source, dpi=None, use_cache=True, stats=None):
+    """
+    Extract text from a PDF page by page: the text layer where a page has
+    enough text, OCR where it only holds images (a scanned CV, or scanned
+    pages in an otherwise digital one).
+    
+    OCR text is cached by page content hash, so pages seen before in any PDF
+    are not OCRed again.
+    
+    Args:
+        source (str or bytes): Path of the PDF, or its contents
+        dpi (int): Rendering resolution for OCR, that of the OCR preset by default
+        use_cache (bool): Whether to read and write the page cache
+        stats (dict): If given, ``complete`` is set to whether every page that
+            needed OCR was OCRed, or cached, at the requested DPI
+    
+    Returns:
+        str: Text of all pages in page order
+    """
+    stats = {} if stats is None else stats
+    stats['complete'] = True
+    metadata, pages = extract_pdf_pages(source, ocr_min_chars=settings.CV_OCR_PAGE_MIN_CHARS)
+    ocr_pages = [page_number for page_number, page in enumerate(pages, start=1) if page.needs_ocr]
+    if not ocr_pages:
+        return _join_pdf_text(metadata, [page.text for page in pages])
+    
+    logger.info(f"{len(ocr_pages)} of {len(pages)} PDF pages are image-based or have little text. Attempting OCR...")
+    hashes = {
+        page_number: pages[page_number - 1].content_hash
+        for page_number in ocr_pages if pages[page_number - 1].content_hash
+    }
+    use_cache = use_cache and cv_cache.cache_enabled() and bool(hashes)
+    cached = cv_cache.lookup_pages(hashes.values(), ocr_version()) if use_cache else {}
+    ocr_texts = {
+        page_number: cached[page_hash] for page_number, page_hash in hashes.items() if page_hash in cached
+    }
+    
+    # Render and OCR the remaining pages in parallel
+    missing = [page_number for page_number in ocr_pages if page_number not in ocr_texts]
+    cv_metrics.note(ocr_pages=len(missing), ocr_cached_pages=len(ocr_pages) - len(missing))
+    if missing:
+        ocr_stats = {'complete': False}
+        try:
+            with cv_metrics.stage('pdf_ocr'):
+                new_texts = ocr_pdf_pages(source, missing, dpi=dpi, stats=ocr_stats)
+        except ImportError:
+            print("pdf2image not installed. Cannot process image-based PDFs with OCR.")
+            new_texts = {}
+        except Exception as e:
+            print(f"Error using OCR on PDF: {str(e)}")
+            new_texts = {}
+        stats['complete'] = ocr_stats['complete']
+        ocr_texts.update(new_texts)
+        if use_cache and new_texts:
+            # Pages rendered below the requested DPI to fit the memory budget are not cached
+            cv_cache.store_pages({
+                hashes[page_number]: text for page_number, text in new_texts.items()
+                if page_number in hashes and ocr_stats['dpi'].get(page_number) == ocr_stats['requested_dpi']
+            }, ocr_version())
+    logger.debug(f"OCR text for {len(ocr_texts)} of {len(ocr_pages)} pages, {len(ocr_pages) - len(missing)} from the page cache")
+    
+    # If OCR extracted more text than the text layer, use it
+    page_texts = []
+    for page_number, page in enumerate(pages, start=1):
+        ocr_text = ocr_texts.get(page_number, "")
+        page_texts.append(ocr_text if len(ocr_text.strip()) > len(page.text.strip()) else page.text)
+    return _join_pdf_text(metadata, page_texts)
+
+
+@cv_metrics.timed('docx_text')
+def extract_text_from_docx(source):
+    """
+    Extract text content from a DOCX file, given its path or contents.
+    
+    The zip is read as a stream (see docx_text), headers and tables included;
+    python-docx, which only reads the body paragraphs, is the fallback for
+    files the stream reader cannot parse.
+    """
+    try:
+        with _binary_stream(source) as file:
+            return "\n".join(stream_docx_lines(file))
+    except Exception as e:
+        logger.warning(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+    
     try:
-        doc = docx.Document(file_path)
+        doc = docx.Document(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
         return text
     except Exception as e:
@@ -453,14 +941,20 @@ def extract_text_from_docx(file_path):
         return ""
 
 
-def extract_text_from_image(file_path, preprocess=True, lang='eng'):
+@cv_metrics.timed('image_ocr')
+def extract_text_from_image(source, preprocess=True, lang='eng', timeout=0, preset=None, dpi=None,
+                            raise_errors=False):
     """
     Extract text content from an image file using OCR.
     
     Args:
-        file_path (str): Path to the image file
+        source (str, bytes or Image): Path to the image file, its contents, or an already decoded image
         preprocess (bool): Whether to preprocess the image for better OCR results
         lang (str): OCR language, default is English ('eng')
+        timeout (int): Seconds before tesseract is killed, 0 for no limit
+        preset (str): OCR preset ('fast' or 'accurate'), CV_OCR_PRESET by default
+        dpi (int): Resolution of the image if known, as for rendered PDF pages
+        raise_errors (bool): Raise OCR errors instead of returning an empty text
     
     Returns:
         str: Extracted text from the image
@@ -470,27 +964,33 @@ def extract_text_from_image(file_path, preprocess=True, lang='eng'):
         return ""
     
     try:
-        # Open the image
-        image = Image.open(file_path)
+        # Open the image, unless it already is one
+        if isinstance(source, Image.Image):
+            image = source
+        elif isinstance(source, (bytes, bytearray)):
+            image = Image.open(io.BytesIO(source))
+        else:
+            image = Image.open(source)
         
         if preprocess:
-            # Convert image to grayscale for better OCR results
-            if image.mode != 'L':
-                image = image.convert('L')
-                
+            # Scale, clean up, deskew, binarize and crop the page for better and faster OCR
+            image, dpi = preprocess_image(image, preset, dpi)
         
-        
-        # Configure OCR options
-        custom_config = f'-l {lang} --psm 1'  # Page segmentation mode: 1 = Auto page segmentation with OSD
+        # Configure OCR options; page segmentation mode 1 adds orientation detection to mode 3
+        custom_config = f'-l {lang} --psm {ocr_preset(preset)["psm"]}'
+        if dpi:
+            custom_config += f' --dpi {dpi}'
         
         # Use pytesseract to extract text
-        text = pytesseract.image_to_string(image, config=custom_config)
+        text = pytesseract.image_to_string(image, config=custom_config, timeout=timeout)
         
         # Log the amount of text extracted
         print(f"OCR extracted {len(text)} characters from image")
         
         return text
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"Error extracting text from image using OCR: {str(e)}")
         return ""
 
@@ -702,13 +1202,13 @@ def extract_experience(text):
     
     # Extract years of experience with enhanced patterns
     experience_patterns = [
-        r'(\d+)[\+]? years? of experience',
+        r'(?<!\d)(\d+)[\+]? years? of experience',
         r'experience[:\s]+(\d+)[\+]? years?',
         r'worked for (\d+) years?',
-        r'(\d+)[\+]? years? in',
-        r'(\d+) years experience',
+        r'(?<!\d)(\d+)[\+]? years? in',
+        r'(?<!\d)(\d+) years experience',
         r'experience of (\d+)[\+]? years?',
-        r'(\d+)[\+]?[+\s-]*year',  # Matches "10+ year" or "15-year" or "20 year"
+        r'(?<!\d)(\d+)[\+]?[+\s-]*year',  # Matches "10+ year" or "15-year" or "20 year"
         r'career spanning (\d+)[\+]? years?',
         r'over (\d+) years?'
     ]
@@ -768,8 +1268,142 @@ def extract_experience(text):
     return experience_data
 
 
-def extract_employment_history(text):
+# A date in a job entry: "Jan 2020", "01/2020" or "2020"
+JOB_DATE = r'(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]{0,6}\.?[ \t]+\d{4}|\d{1,2}/\d{4}|\d{4})'
+# The dates of a job, on one line; every token is bounded, so finding them all is linear in the text
+JOB_DATE_RANGE_RE = re.compile(
+    rf'\b({JOB_DATE})[ \t]*[-–][ \t]*({JOB_DATE}|Present|Current|Now)\b', re.IGNORECASE
+)
+# Characters of a company name and of a job title
+JOB_COMPANY_RE = re.compile(r"[\w \t&.,'\-]+")
+JOB_TITLE_RE = re.compile(r"[\w \t&.,'()\-]+")
+# Separators between the company and the title on a job line
+JOB_SPACED_DASH_RE = re.compile(r'[ \t]+[-–][ \t]+')
+JOB_DASH_RE = re.compile(r'[-–]')
+JOB_AT_RE = re.compile(r'[ \t]+(?:at|with|for)[ \t]+', re.IGNORECASE)
+JOB_COMMA_RE = re.compile(r',[ \t]*')
+# Separators tried in order on the text before and after the dates of a job
+# line, with whether the title comes first; otherwise classify_company_and_title
+# decides which field is which
+JOB_HEAD_LAYOUTS = [(JOB_SPACED_DASH_RE, False), (JOB_AT_RE, True), (JOB_COMMA_RE, True), (JOB_DASH_RE, False)]
+JOB_TAIL_LAYOUTS = [(JOB_SPACED_DASH_RE, False), (JOB_AT_RE, True), (JOB_DASH_RE, False)]
+# Longer lines are prose, not job entries
+MAX_JOB_LINE_CHARS = 200
+JOB_BULLETS = ('•', '*', '-')
+
+
+def _split_last(text, separator_re):
+    """(before, after) around the last match of separator_re in text, or None if there is none."""
+    last = None
+    for last in separator_re.finditer(text):
+        pass
+    if last is None:
+        return None
+    return text[:last.start()].strip(), text[last.end():].strip()
+
+
+def _read_job_fields(text, layouts, classify_company_and_title):
+    """(company, title) split at the first separator of ``layouts`` found in text, or (None, None)."""
+    for separator_re, title_first in layouts:
+        fields = _split_last(text, separator_re)
+        if fields:
+            return fields[::-1] if title_first else classify_company_and_title(*fields)
+    return None, None
+
+
+def _line_bounds(text, line_starts, index):
+    start = line_starts[index]
+    end = line_starts[index + 1] - 1 if index + 1 < len(line_starts) else len(text)
+    return start, end
+
+
+def _nearby_lines(text, line_starts, index, step):
+    """
+    The two non-blank lines next to line ``index``, going back (step -1) or forward (step 1).
+
+    Returns:
+        list: (start, end, stripped line) of each, or None if there are not two
+        short lines without dates, with at most two blank lines skipped
+    """
+    found, blank = [], 0
+    index += step
+    while 0 <= index < len(line_starts) and len(found) < 2 and blank <= 2:
+        start, end = _line_bounds(text, line_starts, index)
+        line = text[start:end].strip()
+        if not line:
+            blank += 1
+        elif len(line) > MAX_JOB_LINE_CHARS or JOB_DATE_RANGE_RE.search(line):
+            return None
+        else:
+            found.append((start, end, line))
+        index += step
+    return found if len(found) == 2 else None
+
+
+def _job_entry_at(text, line_starts, date_match, classify_company_and_title):
+    """
+    Read the job entry a date range belongs to.
+
+    Layouts, tried in order:
+        Company - Position (Date - Date)
+        Position at|with|for Company (Date - Date)
+        Position, Company (Date - Date), also bulleted or as • Position, Company | Date - Date |
+        Date - Date: Company - Position
+        Date - Date: Position at|with|for Company
+        Date - Date / Position / Company, on three lines
+        Company / Position / Date - Date, on three lines
+
+    Fields never cross a line and lines are at most MAX_JOB_LINE_CHARS long,
+    so each date range costs a bounded amount of work.
+
+    Args:
+        text (str): Experience section
+        line_starts (list): Offset of every line of text
+        date_match (Match): JOB_DATE_RANGE_RE match in text
+        classify_company_and_title (function): Tells (company, title) from two fields in either order
+
+    Returns:
+        tuple: (entry start, entry end, company, title, start date text, end date text),
+        or None if the date range is not part of a job entry
+    """
+    index = bisect_right(line_starts, date_match.start()) - 1
+    line_start, line_end = _line_bounds(text, line_starts, index)
+    if line_end - line_start > MAX_JOB_LINE_CHARS:
+        return None
+    before = text[line_start:date_match.start()].strip()
+    after = text[date_match.end():line_end].strip()
+    if before[:1] in JOB_BULLETS:
+        before = before[1:].strip()
+    company, title, entry_start, entry_end = None, None, line_start, line_end
+    
+    if before[-1:] in ('(', '|') and after[:1] in (')', '|'):
+        # Fields before the dates
+        layouts = [(JOB_COMMA_RE, True)] if before[-1] == '|' else JOB_HEAD_LAYOUTS
+        company, title = _read_job_fields(before[:-1].strip(), layouts, classify_company_and_title)
+    elif not before and after:
+        # Fields after the dates
+        company, title = _read_job_fields(after.lstrip(':').strip(), JOB_TAIL_LAYOUTS, classify_company_and_title)
+    elif not before:
+        # Fields on the lines after, or before, a line with only the dates
+        following = _nearby_lines(text, line_starts, index, 1)
+        if following and JOB_TITLE_RE.fullmatch(following[0][2]) and JOB_COMPANY_RE.fullmatch(following[1][2]):
+            company, title = classify_company_and_title(following[1][2], following[0][2])
+            entry_end = following[1][1]
+        else:
+            preceding = _nearby_lines(text, line_starts, index, -1)
+            if preceding and JOB_COMPANY_RE.fullmatch(preceding[1][2]) and JOB_TITLE_RE.fullmatch(preceding[0][2]):
+                company, title = classify_company_and_title(preceding[1][2], preceding[0][2])
+                entry_start = preceding[1][0]
+    
+    if not (company and title and JOB_COMPANY_RE.fullmatch(company) and JOB_TITLE_RE.fullmatch(title)):
+        return None
+    return entry_start, entry_end, company, title, date_match.group(1), date_match.group(2)
+
+
+def extract_employment_history(text, sections=None):
     """Extract employment history entries with enhanced format detection and improved company detection."""
+    if sections is None:
+        sections = CVSections(text)
     employment_entries = []
     
     # Common patterns indicating work experience sections
@@ -797,33 +1431,13 @@ def extract_employment_history(text):
     
     # Look for section headers in the text
     for indicator in section_indicators:
-        matches = list(re.finditer(indicator, text, re.IGNORECASE))
-        for match in matches:
+        for match in sections.find_all(indicator):
             # Get text after the section header
             section_start = match.end()
             
-            # Look for the next major section header
-            next_section_patterns = [
-                r'\n\s*[A-Z][A-Z\s]{4,}\s*(?::|$|\n)',  # All caps section header
-                r'\n\s*(?:EDUCATION|QUALIFICATIONS|SKILLS|CERTIFICATIONS|TRAINING|ACHIEVEMENTS|PROJECTS|LANGUAGES|REFERENCES)',
-                r'\n\s*[A-Z][a-z]+\s*&\s*[A-Z][a-z]+\s*(?::|$|\n)'  # Title case with &
-            ]
-            
-            next_section_pos = len(text)
-            for pattern in next_section_patterns:
-                next_matches = list(re.finditer(pattern, text[section_start:], re.IGNORECASE))
-                if next_matches:
-                    pos = section_start + next_matches[0].start()
-                    if pos < next_section_pos:
-                        next_section_pos = pos
-            
-            # Extract the experience section
-            if next_section_pos < len(text):
-                exp_section = text[section_start:next_section_pos]
-                section_end = next_section_pos
-            else:
-                exp_section = text[section_start:]
-                section_end = len(text)
+            # The section runs to the next major section header
+            section_end = sections.section_end(section_start, ['caps_line', 'after_experience', 'title_and_title'])
+            exp_section = text[section_start:section_end]
                 
             experience_sections.append((section_start, section_end, exp_section))
             experience_section = exp_section
@@ -855,38 +1469,6 @@ def extract_employment_history(text):
         'Incorporated', 'Systems', 'Solutions', 'Services', 'Technologies', 'Partners'
     ]
     
-    # Enhanced patterns to identify job entries in various formats
-    job_entry_patterns = [
-        # Company - Position (Date - Date)
-        r'([\w\s&.,\'\-]+)\s*[-–]\s*([\w\s&.,\'\(\)\-]+)\s*\((\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)\)',
-        
-        # Position at Company (Date - Date)
-        r'([\w\s&.,\'\(\)\-]+)\s*(?:at|with|for)\s*([\w\s&.,\'\-]+)\s*\((\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)\)',
-        
-        # Date - Date: Position at Company
-        r'(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)[:\s]+?([\w\s&.,\'\(\)\-]+)\s*(?:at|with|for)\s*([\w\s&.,\'\-]+)',
-        
-        # Date - Date: Company - Position
-        r'(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)[:\s]+?([\w\s&.,\'\-]+)\s*[-–]\s*([\w\s&.,\'\(\)\-]+)',
-        
-        # Date - Date
-        # Position
-        # Company
-        r'(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)\s*\n\s*([\w\s&.,\'\(\)\-]+)\s*\n\s*([\w\s&.,\'\-]+)',
-        
-        # Company
-        # Position
-        # Date - Date
-        r'([\w\s&.,\'\-]+)\s*\n\s*([\w\s&.,\'\(\)\-]+)\s*\n\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)',
-        
-        # Position, Company (Date - Date)
-        r'([\w\s&.,\'\(\)\-]+),\s*([\w\s&.,\'\-]+)\s*\((\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)\)',
-        
-        # Bullet-based format:
-        # • Position, Company (Date - Date)
-        r'[•\*\-]\s*([\w\s&.,\'\(\)\-]+),\s*([\w\s&.,\'\-]+)\s*(?:\(|\|)(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)(?:\)|\|)',
-    ]
-    
     # Try to find job entries
     job_entries_found = False
     
@@ -927,94 +1509,66 @@ def extract_employment_history(text):
         # If still unsure, use the default assignment
         return (text1, text2)
     
-    # Process all experience sections
+    # Each date range in an experience section anchors at most one job entry,
+    # read from its own line and the lines around it (see _job_entry_at)
+    seen_positions = set()
     for section_start, section_end, section_text in experience_sections:
-        for pattern in job_entry_patterns:
-            matches = list(re.finditer(pattern, section_text, re.IGNORECASE | re.MULTILINE))
-            for match in matches:
-                try:
-                    groups = match.groups()
-                    job_entry = {}
-                    
-                    if len(groups) == 4:
-                        # Determine the format based on the first group
-                        if re.match(r'\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}', groups[0]):  # If first group is a date
-                            # Format: Date - Date: Position at Company or Date - Date: Company - Position
-                            if any(x in match.group(0).lower() for x in ['at', 'with', 'for']):
-                                company_name = groups[3].strip()
-                                job_title = groups[2].strip()
-                            else:
-                                # Use our classifier to determine which is company and which is title
-                                company_name, job_title = classify_company_and_title(groups[2].strip(), groups[3].strip())
-                                
-                            start_date_str = groups[0].strip()
-                            end_date_str = groups[1].strip()
-                        else:
-                            # Format: Company - Position (Date - Date) or Position at Company (Date - Date)
-                            if any(x in match.group(0).lower() for x in ['at', 'with', 'for']):
-                                company_name = groups[1].strip()
-                                job_title = groups[0].strip()
-                            elif ',' in match.group(0) and not any(x in match.group(0).lower() for x in ['at', 'with', 'for']):
-                                # Format: Position, Company (Date - Date)
-                                job_title = groups[0].strip()
-                                company_name = groups[1].strip()
-                            else:
-                                # Use our classifier to determine which is company and which is title
-                                company_name, job_title = classify_company_and_title(groups[0].strip(), groups[1].strip())
-                                
-                            start_date_str = groups[2].strip()
-                            end_date_str = groups[3].strip()
-                        
-                        # Clean up company name and job title
-                        job_entry['company_name'] = company_name.strip()[:255]
-                        job_entry['job_title'] = job_title.strip()[:255]
-                        
-                        # Clean up any remaining brackets, parentheses from job title
-                        job_entry['job_title'] = re.sub(r'[\(\)]', '', job_entry['job_title'])
-                        
-                        # Parse dates using our enhanced date parser
-                        job_entry['start_date'] = parse_date_from_string(start_date_str)
-                        
-                        # Set is_current based on end date text
-                        is_current = end_date_str.lower() in ['present', 'current', 'now', 'to date', 'today', 'ongoing', 'to present']
-                        job_entry['is_current'] = is_current
-                        
-                        # Try to parse the end date if not current
-                        if not is_current:
-                            job_entry['end_date'] = parse_date_from_string(end_date_str)
-                        
-                        # Extract job description and responsibilities
-                        # Get text between this match and the next job entry or section
-                        match_end = match.end()
-                        next_entry_start = len(section_text)
-                        
-                        # Look for the start of the next job entry
-                        for next_match in matches:
-                            if next_match.start() > match_end:
-                                next_entry_start = next_match.start()
-                                break
-                        
-                        # Extract responsibilities text
-                        responsibilities_text = section_text[match_end:next_entry_start].strip()
-                        # Clean up the text - remove bullet points, extra spaces, etc.
-                        responsibilities_text = re.sub(r'^\s*[•\-\*]\s*', '', responsibilities_text, flags=re.MULTILINE)
-                        
-                        # responsibilities is a TextField, but let's still truncate if it's extremely large
-                        job_entry['responsibilities'] = responsibilities_text[:2000] if responsibilities_text else ""
-                        job_entry['reason_leaving'] = "Not specified in CV"
-                        
-                        # Add the entry to our results
-                        employment_entries.append(job_entry)
-                        job_entries_found = True
-                        
-                except Exception as e:
-                    print(f"Error parsing job entry: {str(e)}")
+        line_starts = [0] + [newline.end() for newline in re.finditer('\n', section_text)]
+        found = []
+        for date_match in JOB_DATE_RANGE_RE.finditer(section_text):
+            check_deadline()
+            # Sections can overlap; every entry is read once
+            if section_start + date_match.start() in seen_positions:
+                continue
+            entry = _job_entry_at(section_text, line_starts, date_match, classify_company_and_title)
+            if entry:
+                seen_positions.add(section_start + date_match.start())
+                found.append(entry)
+        
+        for position, (entry_start, entry_end, company_name, job_title, start_date_str, end_date_str) in enumerate(found):
+            try:
+                job_entry = {}
+                
+                # Clean up company name and job title
+                job_entry['company_name'] = company_name.strip()[:255]
+                job_entry['job_title'] = job_title.strip()[:255]
+                
+                # Clean up any remaining brackets, parentheses from job title
+                job_entry['job_title'] = re.sub(r'[\(\)]', '', job_entry['job_title'])
+                
+                # Parse dates using our enhanced date parser
+                job_entry['start_date'] = parse_date_from_string(start_date_str)
+                
+                # Set is_current based on end date text
+                is_current = end_date_str.lower() in ['present', 'current', 'now', 'to date', 'today', 'ongoing', 'to present']
+                job_entry['is_current'] = is_current
+                
+                # Try to parse the end date if not current
+                if not is_current:
+                    job_entry['end_date'] = parse_date_from_string(end_date_str)
+                
+                # Extract job description and responsibilities: the text up to the next job entry or the section end
+                next_entry_start = found[position + 1][0] if position + 1 < len(found) else len(section_text)
+                responsibilities_text = section_text[entry_end:max(entry_end, next_entry_start)].strip()
+                # Clean up the text - remove bullet points, extra spaces, etc.
+                responsibilities_text = re.sub(r'^[ \t]*[•\-\*][ \t]*', '', responsibilities_text, flags=re.MULTILINE)
+                
+                # responsibilities is a TextField, but let's still truncate if it's extremely large
+                job_entry['responsibilities'] = responsibilities_text[:2000] if responsibilities_text else ""
+                job_entry['reason_leaving'] = "Not specified in CV"
+                
+                # Add the entry to our results
+                employment_entries.append(job_entry)
+                job_entries_found = True
+                
+            except Exception as e:
+                print(f"Error parsing job entry: {str(e)}")
     
     # If no job entries found with the patterns, try a simpler approach based on dates
     if not job_entries_found:
         # Look for date ranges that might indicate job periods
         date_range_patterns = [
-            r'(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4})\s*[-–]\s*(\w+\s+\d{4}|\/?\d{1,2}\/?\d{4}|\/?\d{4}|Present|Current|Now)',
+            JOB_DATE_RANGE_RE.pattern,
             r'(\d{2}\/\d{2,4})\s*[-–]\s*(\d{2}\/\d{2,4}|Present|Current|Now)',  # MM/YY - MM/YY format
             r'(\d{2}\.\d{2,4})\s*[-–]\s*(\d{2}\.\d{2,4}|Present|Current|Now)'   # MM.YY - MM.YY format
         ]
@@ -1075,28 +1629,14 @@ def extract_employment_history(text):
     return employment_entries
 
 
-def extract_qualifications(text):
+def extract_qualifications(text, sections=None):
     """Extract qualifications and education history with enhanced format detection and section isolation."""
+    if sections is None:
+        sections = CVSections(text)
     qualifications = []
     
-    # First, identify employment sections to completely avoid
-    employment_section_patterns = [
-        r'(?:EXPERIENCE|WORK HISTORY|EMPLOYMENT|PROFESSIONAL BACKGROUND|JOB HISTORY|CAREER HISTORY|WORK EXPERIENCE)(?:\s*:)?(.*?)(?:EDUCATION|SKILLS|CERTIFICATIONS|ACHIEVEMENTS|\Z)',
-        r'(?:Experience|Work History|Employment|Professional Background|Job History|Career History|Work Experience)(?:\s*:)?(.*?)(?:Education|Skills|Certifications|Achievements|\Z)'
-    ]
-    
-    employment_sections = []
-    for pattern in employment_section_patterns:
-        matches = re.finditer(pattern, text, re.DOTALL | re.IGNORECASE)
-        for match in matches:
-            employment_sections.append((match.start(1), match.end(1), match.group(1)))
-    
-    # Helper function to check if a position is within an employment section
-    def is_in_employment_section(start_pos, end_pos):
-        for emp_start, emp_end, _ in employment_sections:
-            if start_pos >= emp_start and end_pos <= emp_end:
-                return True
-        return False
+    # Employment sections are avoided completely
+    is_in_employment_section = sections.in_employment_span
     
     # Common patterns indicating education sections
     section_indicators = [
@@ -1133,7 +1673,7 @@ def extract_qualifications(text):
     
     # Look for section headers in the text
     for indicator in section_indicators:
-        matches = list(re.finditer(r'\b' + indicator + r'\b', text, re.IGNORECASE))
+        matches = sections.find_all(r'\b' + indicator + r'\b')
         if matches:
             for match in matches:
                 # Check if this match is part of an employment section header (e.g., "Work Experience & Qualifications")
@@ -1149,28 +1689,9 @@ def extract_qualifications(text):
                 # Get text after the section header
                 section_start = match.end()
                 
-                # Look for the next major section header
-                next_section_patterns = [
-                    r'\n\s*[A-Z][A-Z\s]{4,}\s*(?::|$|\n)',  # All caps section header
-                    r'\n\s*(?:EXPERIENCE|EMPLOYMENT|SKILLS|PROFESSIONAL|CERTIFICATIONS|TRAINING|ACHIEVEMENTS|PROJECTS|LANGUAGES|REFERENCES)',
-                    r'\n\s*[A-Z][a-z]+\s*&\s*[A-Z][a-z]+\s*(?::|$|\n)'  # Title case with &
-                ]
-                
-                next_section_pos = len(text)
-                for pattern in next_section_patterns:
-                    next_matches = list(re.finditer(pattern, text[section_start:], re.IGNORECASE))
-                    if next_matches:
-                        pos = section_start + next_matches[0].start()
-                        if pos < next_section_pos:
-                            next_section_pos = pos
-                
-                # Extract the education section
-                section_end = next_section_pos
-                if next_section_pos < len(text):
-                    education_section = text[section_start:next_section_pos]
-                else:
-                    education_section = text[section_start:]
-                    section_end = len(text)
+                # The section runs to the next major section header
+                section_end = sections.section_end(section_start, ['caps_line', 'after_education', 'title_and_title'])
+                education_section = text[section_start:section_end]
                 
                 education_section_spans.append((section_start, section_end, education_section))
                 education_section_found = True
@@ -1211,27 +1732,27 @@ def extract_qualifications(text):
     # Enhanced patterns to identify education entries in various formats
     education_patterns = [
         # Degree, Institution, Year - strict pattern requiring degree keywords
-        r'((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^,\n]*),\s*([^,\n]*),\s*(\d{4}(?:[-–]\d{4}|[-–]Present)?)',
+        r'\b((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^,\n]*),\s*([^,\n]*),\s*(\d{4}(?:[-–]\d{4}|[-–]Present)?)',
         
         # Degree in Subject at Institution (Year) - strict pattern requiring degree keywords
-        r'((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^,\n]*)\s+in\s+([^,\n]*)\s+(?:at|from)\s+([^(]*)(?:\((\d{4}(?:[-–]\d{4}|[-–]Present)?)\))?',
+        r'\b((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^,\n]*)\s+in\s+([^,\n]*)\s+(?:at|from)\s+([^(\n]*)(?:\((\d{4}(?:[-–]\d{4}|[-–]Present)?)\))?',
         
         # Year: Degree from Institution - strict pattern requiring degree keywords
-        r'(\d{4}(?:[-–]\d{4}|[-–]Present)?):\s*((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^,\n]*)\s+from\s+([^\n]*)',
+        r'(?<!\d)(\d{4}(?:[-–]\d{4}|[-–]Present)?):\s*((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^,\n]*)\s+from\s+([^\n]*)',
         
         # Institution
         # Degree
         # Year - strict pattern requiring degree keywords
-        r'([^\n]{5,})\n\s*((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^\n]*)\n\s*(\d{4}(?:[-–]\d{4}|[-–]Present)?)',
+        r'^([^\n]{5,})\n\s*((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^\n]*)\n\s*(\d{4}(?:[-–]\d{4}|[-–]Present)?)',
         
         # Simple format: Degree from Institution - strict pattern requiring degree keywords
-        r'((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^,\n]*)\s+from\s+([^\n,]*)',
+        r'\b((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^,\n]*)\s+from\s+([^\n,]*)',
         
         # Another format: Institution, Degree (Year) - strict pattern requiring degree keywords
-        r'([^,\n]*),\s*((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^(]*)(?:\((\d{4}(?:[-–]\d{4}|[-–]Present)?)\))',
+        r'(?<![^,\n])([^,\n]*),\s*((?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Certificate|Diploma|Associate|Degree)[^(\n]*)(?:\((\d{4}(?:[-–]\d{4}|[-–]Present)?)\))',
         
         # Looser pattern only used when we're sure we're in the education section
-        r'([^-\n]*)(?:\s*[-–]\s*)([^-\n]*)(?:\s*[-–]\s*)(\d{4}(?:[-–]\d{4}|[-–]Present)?)'
+        r'(?<![^-\n])([^-\n]*)(?:\s*[-–]\s*)([^-\n]*)(?:\s*[-–]\s*)(\d{4}(?:[-–]\d{4}|[-–]Present)?)'
     ]
     
     qualifications_found = False
@@ -1239,6 +1760,7 @@ def extract_qualifications(text):
     # Process text across the whole CV, but with stronger validation
     # This ensures we catch education entries even if section detection failed
     for pattern in education_patterns[:6]:  # Only use strict patterns for whole CV search
+        check_deadline()
         matches = list(re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE))
         for match in matches:
             # Skip if this match is within an employment section
@@ -1398,6 +1920,7 @@ def extract_qualifications(text):
     for section_start, section_end, section_text in education_section_spans:
         # Apply all patterns to the education section with less strict filtering
         for pattern in education_patterns:
+            check_deadline()
             matches = list(re.finditer(pattern, section_text, re.IGNORECASE | re.MULTILINE))
             for match in matches:
                 try:
@@ -1498,8 +2021,7 @@ def extract_qualifications(text):
         ]
         
         for indicator in certification_indicators:
-            cert_matches = list(re.finditer(indicator, text, re.IGNORECASE))
-            for cert_match in cert_matches:
+            for cert_match in sections.find_all(indicator):
                 # Skip if this certification section is in an employment section
                 if is_in_employment_section(cert_match.start(), cert_match.end()):
                     continue
@@ -1507,9 +2029,8 @@ def extract_qualifications(text):
                 # Get text after the certification header
                 cert_start = cert_match.end()
                 
-                # Look for the next section
-                next_section = re.search(r'\n\s*[A-Z\s]{5,}\s*\n', text[cert_start:])
-                cert_section = text[cert_start:cert_start + next_section.start()] if next_section else text[cert_start:]
+                # The section runs to the next block of capitals
+                cert_section = text[cert_start:sections.section_end(cert_start, ['caps_block'])]
                 
                 # Process certification lines
                 cert_lines = cert_section.split('\n')
@@ -1616,36 +2137,26 @@ def determine_education_level(degree_text):
         return 'other'
 
 
-def extract_aviation_licenses(text):
+def extract_aviation_licenses(text, keyword_hits=None, sections=None):
     """
     Extract aviation licenses and certifications from CV text.
     
     Args:
         text (str): The full text content of the CV
+        keyword_hits (KeywordHits): Result of AVIATION_KEYWORD_MATCHER.scan(text), if already computed
+        sections (CVSections): Segmentation of text, if already computed
         
     Returns:
         list: List of dictionaries containing license details
     """
+    if keyword_hits is None:
+        keyword_hits = AVIATION_KEYWORD_MATCHER.scan(text)
+    if sections is None:
+        sections = CVSections(text)
     licenses = []
     
-    # First, identify employment sections to completely avoid
-    employment_section_patterns = [
-        r'(?:EXPERIENCE|WORK HISTORY|EMPLOYMENT|PROFESSIONAL BACKGROUND|JOB HISTORY|CAREER HISTORY|WORK EXPERIENCE)(?:\s*:)?(.*?)(?:EDUCATION|SKILLS|CERTIFICATIONS|ACHIEVEMENTS|\Z)',
-        r'(?:Experience|Work History|Employment|Professional Background|Job History|Career History|Work Experience)(?:\s*:)?(.*?)(?:Education|Skills|Certifications|Achievements|\Z)'
-    ]
-    
-    employment_sections = []
-    for pattern in employment_section_patterns:
-        matches = re.finditer(pattern, text, re.DOTALL | re.IGNORECASE)
-        for match in matches:
-            employment_sections.append((match.start(1), match.end(1), match.group(1)))
-    
-    # Helper function to check if a position is within an employment section
-    def is_in_employment_section(start_pos, end_pos):
-        for emp_start, emp_end, _ in employment_sections:
-            if start_pos >= emp_start and end_pos <= emp_end:
-                return True
-        return False
+    # Employment sections are avoided completely
+    is_in_employment_section = sections.in_employment_span
     
     # Look for license section headers
     license_section_headers = [
@@ -1660,35 +2171,16 @@ def extract_aviation_licenses(text):
     
     # Look for license section
     for header in license_section_headers:
-        matches = list(re.finditer(r'\b' + header + r'\b', text, re.IGNORECASE))
-        for match in matches:
+        for match in sections.find_all(r'\b' + header + r'\b'):
             # Skip if this section header is within an employment section
             if is_in_employment_section(match.start(), match.end()):
                 continue
                 
             section_start = match.end()
             
-            # Look for the next major section header
-            next_section_patterns = [
-                r'\n\s*[A-Z][A-Z\s]{4,}\s*(?::|$|\n)',
-                r'\n\s*(?:EDUCATION|EXPERIENCE|EMPLOYMENT|SKILLS|PROFESSIONAL|TRAINING|PROJECTS|LANGUAGES|REFERENCES)',
-            ]
-            
-            next_section_pos = len(text)
-            for pattern in next_section_patterns:
-                next_matches = list(re.finditer(pattern, text[section_start:], re.IGNORECASE))
-                if next_matches:
-                    pos = section_start + next_matches[0].start()
-                    if pos < next_section_pos:
-                        next_section_pos = pos
-            
-            # Extract the license section
-            section_end = next_section_pos
-            if next_section_pos < len(text):
-                license_section = text[section_start:next_section_pos]
-            else:
-                license_section = text[section_start:]
-                section_end = len(text)
+            # The section runs to the next major section header
+            section_end = sections.section_end(section_start, ['caps_line', 'after_licenses'])
+            license_section = text[section_start:section_end]
                 
             license_sections.append((section_start, section_end, license_section))
             license_section_found = True
@@ -1696,11 +2188,11 @@ def extract_aviation_licenses(text):
     # Process identified license sections first
     license_patterns = [
         # License Type (Year)
-        r'((?:ATPL|CPL|PPL|Type Rating|[A-Z]+\s+License).*?)(?:\((\d{4})\)|\s+(\d{4}))',
+        r'\b((?:ATPL|CPL|PPL|Type Rating|[A-Z]+\s+License).*?)(?:\((\d{4})\)|\s+(\d{4}))',
         # License Type: Details
-        r'((?:ATPL|CPL|PPL|Type Rating|[A-Z]+\s+License).*?):\s*(.*?)(?:\n|$)',
+        r'\b((?:ATPL|CPL|PPL|Type Rating|[A-Z]+\s+License).*?):\s*(.*?)(?:\n|$)',
         # General aviation certification pattern
-        r'((?:EASA|FAA|ICAO|DGCA|CAA).*?(?:License|Rating|Certificate))(?:\s+-\s+|\s*:\s*)(.*?)(?:\n|$)',
+        r'\b((?:EASA|FAA|ICAO|DGCA|CAA).*?(?:License|Rating|Certificate))(?:\s+-\s+|\s*:\s*)(.*?)(?:\n|$)',
         # Bullet point license format
         r'[•\*\-]\s*((?:ATPL|CPL|PPL|Type Rating|[A-Z]+\s+License|EASA|FAA|ICAO|DGCA|CAA).*?)(?:\((\d{4})\)|\s+(\d{4})|\n|$)'
     ]
@@ -1708,6 +2200,7 @@ def extract_aviation_licenses(text):
     # Process each license section first
     for section_start, section_end, license_section in license_sections:
         for pattern in license_patterns:
+            check_deadline()
             matches = list(re.finditer(pattern, license_section, re.IGNORECASE))
             for match in matches:
                 try:
@@ -1734,6 +2227,7 @@ def extract_aviation_licenses(text):
     # search for license patterns in the entire text but exclude employment sections
     if not license_section_found or not licenses:
         for pattern in license_patterns:
+            check_deadline()
             matches = list(re.finditer(pattern, text, re.IGNORECASE))
             for match in matches:
                 # Skip if this match is within an employment section
@@ -1781,10 +2275,10 @@ def extract_aviation_licenses(text):
     
     # Look for aircraft type ratings - but exclude those in employment sections
     for aircraft in AIRCRAFT_TYPES:
-        if re.search(r'\b' + re.escape(aircraft) + r'\b', text, re.IGNORECASE):
+        if keyword_hits.contains(aircraft):
             # First check for explicit type rating mentions
             type_rating_matches = list(re.finditer(
-                r'\b' + re.escape(aircraft) + r'[^\.,:;]*(?:Type Rating|Rating|Qualified|Certified)', 
+                r'\b' + re.escape(aircraft) + r'[^\.,:;\n]*(?:Type Rating|Rating|Qualified|Certified)', 
                 text, re.IGNORECASE
             ))
             
@@ -1890,16 +2384,19 @@ def categorize_aviation_license(license_text):
         return 'other_aviation_qualification'
 
 
-def extract_aviation_experience(text):
+def extract_aviation_experience(text, keyword_hits=None):
     """
     Extract aviation-specific experience metrics like flight hours.
     
     Args:
         text (str): The full text content of the CV
+        keyword_hits (KeywordHits): Result of AVIATION_KEYWORD_MATCHER.scan(text), if already computed
         
     Returns:
         dict: Dictionary containing aviation experience data
     """
+    if keyword_hits is None:
+        keyword_hits = AVIATION_KEYWORD_MATCHER.scan(text)
     aviation_experience = {}
     
     # Pattern for flight hours extraction
@@ -1933,7 +2430,7 @@ def extract_aviation_experience(text):
          'simulator_hours'),
         
         # Generic format with label and hours
-        (r'(\w+(?:\s+\w+)?)\s+hours[:\s]+(\d{1,6}(?:,\d{3})*(?:\.\d+)?)',
+        (r'\b(\w+(?:\s+\w+)?)\s+hours[:\s]+(\d{1,6}(?:,\d{3})*(?:\.\d+)?)',
          'other_hours')
     ]
     
@@ -1982,8 +2479,7 @@ def extract_aviation_experience(text):
     
     # Check for specific aircraft types from our predefined list
     for aircraft in AIRCRAFT_TYPES:
-        aircraft_regex = r'\b' + re.escape(aircraft) + r'\b'
-        if re.search(aircraft_regex, text, re.IGNORECASE) and aircraft not in aircraft_types_flown:
+        if keyword_hits.contains(aircraft) and aircraft not in aircraft_types_flown:
             aircraft_types_flown.append(aircraft)
     
     if aircraft_types_flown:
@@ -1992,16 +2488,23 @@ def extract_aviation_experience(text):
     return aviation_experience
 
 
-def extract_aviation_skills(text):
+def extract_aviation_skills(text, keyword_hits=None, sections=None):
     """
     Extract aviation-specific technical and operational skills.
     
     Args:
         text (str): The full text content of the CV
+        keyword_hits (KeywordHits): Result of AVIATION_KEYWORD_MATCHER.scan(text), if already computed
+        sections (CVSections): Segmentation of text, if already computed
         
     Returns:
         dict: Dictionary containing aviation skills data
     """
+    if keyword_hits is None:
+        keyword_hits = AVIATION_KEYWORD_MATCHER.scan(text)
+    if sections is None:
+        sections = CVSections(text)
+    
     aviation_skills = {
         'technical_skills': [],
         'operational_skills': [],
@@ -2020,30 +2523,13 @@ def extract_aviation_skills(text):
     
     # Locate skills section
     for header in skills_section_headers:
-        matches = list(re.finditer(r'\b' + header + r'\b', text, re.IGNORECASE))
+        matches = sections.find_all(r'\b' + header + r'\b')
         if matches:
             match = matches[0]
             section_start = match.end()
             
-            # Look for the next major section header
-            next_section_patterns = [
-                r'\n\s*[A-Z][A-Z\s]{4,}\s*(?::|$|\n)',
-                r'\n\s*(?:EDUCATION|EXPERIENCE|EMPLOYMENT|LICENSES|CERTIFICATIONS|TRAINING|PROJECTS|LANGUAGES|REFERENCES)',
-            ]
-            
-            next_section_pos = len(text)
-            for pattern in next_section_patterns:
-                next_matches = list(re.finditer(pattern, text[section_start:], re.IGNORECASE))
-                if next_matches:
-                    pos = section_start + next_matches[0].start()
-                    if pos < next_section_pos:
-                        next_section_pos = pos
-            
-            # Extract the skills section
-            if next_section_pos < len(text):
-                skills_section = text[section_start:next_section_pos]
-            else:
-                skills_section = text[section_start:]
+            # The section runs to the next major section header
+            skills_section = text[section_start:sections.section_end(section_start, ['caps_line', 'after_skills'])]
                 
             skills_section_found = True
             break
@@ -2092,14 +2578,16 @@ def extract_aviation_skills(text):
     
     # Also check for specific keywords in the entire CV
     for keyword in AVIATION_TECHNICAL_SKILLS:
-        if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-            context = extract_keyword_context(text, keyword)
+        span = keyword_hits.first(keyword)
+        if span:
+            context = _context_around(text, *span)
             if context and context not in aviation_skills['technical_skills']:
                 aviation_skills['technical_skills'].append(context)
     
     for keyword in AVIATION_COMPLIANCE_KEYWORDS:
-        if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-            context = extract_keyword_context(text, keyword)
+        span = keyword_hits.first(keyword)
+        if span:
+            context = _context_around(text, *span)
             if context and context not in aviation_skills['compliance_knowledge']:
                 aviation_skills['compliance_knowledge'].append(context)
     
@@ -2125,21 +2613,31 @@ def extract_keyword_context(text, keyword, context_chars=50):
     """
     match = re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE)
     if match:
-        start = max(0, match.start() - context_chars)
-        end = min(len(text), match.end() + context_chars)
-        
-        # Expand to complete sentences or phrases
-        context = text[start:end]
-        
-        # Try to start at beginning of sentence/phrase
-        sentence_start = re.search(r'[.!?]\s+[A-Z]', context)
-        if sentence_start and sentence_start.end() < len(context) - 10:  # Ensure we're not just getting the end
-            context = context[sentence_start.end()-1:]
-        
-        # Try to end at end of sentence/phrase
-        sentence_end = re.search(r'[.!?]\s+', context)
-        if sentence_end:
-            context = context[:sentence_end.end()-1]
-            
-        return context.strip()
+        return _context_around(text, match.start(), match.end(), context_chars)
     return None
+
+
+SENTENCE_START_RE = re.compile(r'[.!?]\s+[A-Z]')
+SENTENCE_END_RE = re.compile(r'[.!?]\s+')
+
+
+def _context_around(text, match_start, match_end, context_chars=50):
+    """Context of a keyword occurrence at text[match_start:match_end], trimmed to sentence boundaries."""
+    start = max(0, match_start - context_chars)
+    end = min(len(text), match_end + context_chars)
+    
+    # Expand to complete sentences or phrases
+    context = text[start:end]
+    
+    # Try to start at beginning of sentence/phrase
+    sentence_start = SENTENCE_START_RE.search(context)
+    if sentence_start and sentence_start.end() < len(context) - 10:  # Ensure we're not just getting the end
+        context = context[sentence_start.end()-1:]
+    
+    # Try to end at end of sentence/phrase
+    sentence_end = SENTENCE_END_RE.search(context)
+    if sentence_end:
+        context = context[:sentence_end.end()-1]
+        
+    return context.strip()
+
@@ -0,0 +1,277 @@
+"""
+Database-backed queue for CV processing.
+
+The upload endpoint stores the CV and enqueues a ``CVProcessingJob``; workers
+started with ``manage.py process_cv_queue`` claim jobs with
+``SELECT ... FOR UPDATE SKIP LOCKED`` so several workers can poll the same table
+without blocking each other or picking the same job, and no broker is needed.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import (
+    CVProcessingJob,
+    EmploymentHistory,
+    ProfessionalExperience,
+    ProfessionalPersonalInfo,
+    Qualifications,
+)
+from .cv_processing_logic import extract_cv_information
+from .cv_sandbox import extract_cv_information_sandboxed
+
+logger = logging.getLogger(__name__)
+
+# A job still 'processing' after this long belongs to a worker that died
+STALE_JOB_TIMEOUT = timedelta(minutes=15)
+MAX_ATTEMPTS = 3
+
+
+# Profile sections filled in field by field, and the fields that identify an
+# entry of the list sections, which are only ever added to
+PROFILE_SECTIONS = (('personal_info', ProfessionalPersonalInfo), ('experience', ProfessionalExperience))
+PROFILE_ENTRIES = (
+    ('qualifications', Qualifications, ('institution', 'course_of_study')),
+    ('employment_history', EmploymentHistory, ('company_name', 'job_title')),
+)
+
+
+def _new_entry(model, user, entry_data):
+    entry = model(user=user)
+    for field, value in entry_data.items():
+        if hasattr(entry, field) and value:
+            setattr(entry, field, value)
+    return entry
+
+
+def plan_profile_updates(profiles):
+    """
+    Work out what extracted CV data changes on a set of profiles.
+
+    The current profiles are read in one query per model, whatever the number
+    of users and entries; nothing is written.
+
+    Args:
+        profiles (list): (user, extracted_data) pairs, one per CV
+
+    Returns:
+        tuple: (changes, writes). ``changes`` has one dict per pair with the
+        fields that would be filled in 'personal_info' and 'experience' and
+        the entries that would be added to 'qualifications' and
+        'employment_history'. ``writes`` maps each model to the instances to
+        create and to (instances, fields) to update.
+    """
+    user_ids = [user.pk for user, _ in profiles]
+    changes = [
+        {'personal_info': {}, 'experience': {}, 'qualifications': [], 'employment_history': []}
+        for _ in profiles
+    ]
+    writes = {}
+
+    for key, model in PROFILE_SECTIONS:
+        if not any(extracted_data.get(key) for _, extracted_data in profiles):
+            continue
+        current = {instance.user_id: instance for instance in model.objects.filter(user_id__in=user_ids)}
+        created, updated, updated_fields = [], [], set()
+        for (user, extracted_data), profile_changes in zip(profiles, changes):
+            if not extracted_data.get(key):
+                continue
+            instance = current.get(user.pk)
+            if instance is None:
+                instance = current[user.pk] = model(user=user)
+                created.append(instance)
+            # Only fields that are currently empty are filled in
+            filled = {
+                field: value for field, value in extracted_data[key].items()
+                if hasattr(instance, field) and value and not getattr(instance, field)
+            }
+            for field, value in filled.items():
+                setattr(instance, field, value)
+            profile_changes[key] = filled
+            if filled and instance.pk:
+                updated.append(instance)
+                updated_fields.update(filled)
+        writes[model] = {'create': created, 'update': (updated, sorted(updated_fields))}
+
+    # Entries already on the profile, or earlier in the same CV, are skipped
+    for key, model, identity in PROFILE_ENTRIES:
+        if not any(extracted_data.get(key) for _, extracted_data in profiles):
+            continue
+        existing = set(model.objects.filter(user_id__in=user_ids).values_list('user_id', *identity))
+        created = []
+        for (user, extracted_data), profile_changes in zip(profiles, changes):
+            for entry_data in extracted_data.get(key) or []:
+                entry_key = (user.pk, *(entry_data.get(field, '') for field in identity))
+                if entry_key not in existing:
+                    existing.add(entry_key)
+                    profile_changes[key].append(entry_data)
+                    created.append(_new_entry(model, user, entry_data))
+        writes[model] = {'create': created, 'update': ([], [])}
+    return changes, writes
+
+
+def update_user_profiles(profiles):
+    """
+    Update profiles with information extracted from their CVs, in one transaction.
+
+    Reads one query per model and writes with one bulk_create and one
+    bulk_update per model, so the number of queries does not grow with the
+    number of CVs or entries.
+
+    Args:
+        profiles (list): (user, extracted_data) pairs, one per CV
+
+    Returns:
+        list: Changes made to each profile, as planned by plan_profile_updates
+    """
+    with transaction.atomic():
+        changes, writes = plan_profile_updates(profiles)
+        for model, model_writes in writes.items():
+            if model_writes['create']:
+                model.objects.bulk_create(model_writes['create'])
+            updated, fields = model_writes['update']
+            if updated:
+                model.objects.bulk_update(updated, fields)
+    return changes
+
+
+def update_user_profile(user, extracted_data):
+    """Update user profile with information extracted from CV"""
+    return update_user_profiles([(user, extracted_data)])[0]
+
+
+def diff_user_profile(user, extracted_data):
+    """
+    Changes update_user_profile would make to a profile, without making them.
+
+    Args:
+        user (User): Professional the CV belongs to
+        extracted_data (dict): Result of extract_cv_information
+
+    Returns:
+        dict: Fields that would be filled in 'personal_info' and 'experience',
+        and the entries that would be added to 'qualifications' and
+        'employment_history'
+    """
+    return plan_profile_updates([(user, extracted_data)])[0][0]
+
+
+def enqueue_cv_job(user, cv_name, sections=None):
+    """
+    Queue a stored CV for processing.
+
+    Args:
+        user (User): Professional who uploaded the CV
+        cv_name (str): Storage name of the already saved CV file
+        sections (list): CV sections to extract (see cv_processing_logic.CV_SECTIONS); all by default
+
+    Returns:
+        CVProcessingJob: The queued job
+    """
+    return CVProcessingJob.objects.create(user=user, cv=cv_name, sections=list(sections or []))
+
+
+def claim_next_job(worker_id):
+    """
+    Claim the oldest queued job, skipping rows other workers have locked.
+
+    Returns:
+        CVProcessingJob or None if the queue is empty
+    """
+    with transaction.atomic():
+        job = (
+            CVProcessingJob.objects.select_for_update(skip_locked=True)
+            .filter(status='queued')
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = 'processing'
+        job.stage = 'extracting'
+        job.progress = 10
+        job.attempts += 1
+        job.worker = worker_id
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'stage', 'progress', 'attempts', 'worker', 'started_at'])
+    return job
+
+
+def requeue_stale_jobs():
+    """Return jobs abandoned by dead workers to the queue, or fail them after MAX_ATTEMPTS."""
+    cutoff = timezone.now() - STALE_JOB_TIMEOUT
+    stale = CVProcessingJob.objects.filter(status='processing', started_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status='failed', error='Processing did not finish', finished_at=timezone.now()
+    )
+    requeued = stale.filter(attempts__lt=MAX_ATTEMPTS).update(status='queued', stage='', progress=0)
+    if failed or requeued:
+        logger.warning(f"Stale CV jobs: {requeued} requeued, {failed} failed")
+
+
+def _set_progress(job, stage, progress):
+    CVProcessingJob.objects.filter(pk=job.pk).update(stage=stage, progress=progress)
+
+
+def process_job(job):
+    """
+    Extract information from the job's CV and update the user's profile.
+
+    The CV is extracted in the sandbox pool when CV_SANDBOX_ENABLED is on: a CV
+    going over its memory, CPU or time limit fails the job, not the worker.
+    """
+    job.metrics = {}
+    extract = extract_cv_information_sandboxed if settings.CV_SANDBOX_ENABLED else extract_cv_information
+    try:
+        extracted_data = extract(job.cv, metrics=job.metrics, sections=job.sections or None)
+
+        if extracted_data:
+            _set_progress(job, 'updating_profile', 80)
+            update_user_profile(job.user, extracted_data)
+            job.status = 'completed'
+        else:
+            job.status = 'partial'
+        job.result = extracted_data
+    except Exception as e:
+        logger.error(f"Error processing CV job {job.id}: {str(e)}")
+        job.status = 'failed'
+        job.error = str(e)
+
+    job.stage = ''
+    job.progress = 100
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'stage', 'progress', 'result', 'error', 'metrics', 'finished_at'])
+    return job
+
+
+def run_worker(worker_id, poll_interval=2.0, stop_when_empty=False):
+    """
+    Process queued jobs until stopped.
+
+    Args:
+        worker_id (str): Name recorded on claimed jobs
+        poll_interval (float): Seconds to sleep when the queue is empty
+        stop_when_empty (bool): Return once no queued job is left
+    """
+    last_stale_check = 0
+    while True:
+        close_old_connections()
+
+        if time.monotonic() - last_stale_check > 60:
+            requeue_stale_jobs()
+            last_stale_check = time.monotonic()
+
+        job = claim_next_job(worker_id)
+        if job is None:
+            if stop_when_empty:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        logger.info(f"Worker {worker_id} processing CV job {job.id}")
+        process_job(job)
@@ -0,0 +1,333 @@
+"""
+CV extraction in sandboxed worker processes.
+
+A malformed or hostile PDF can keep PyPDF2 or tesseract busy, or growing, for
+as long as it likes; in the process calling ``extract_cv_information`` only
+the gunicorn timeout would stop it, killing the whole worker.
+
+``extract_cv_information_sandboxed`` runs the extraction in a process of a
+small, reused pool instead, and gets the result back over a pipe. Each worker:
+
+* runs in its own process group, so it can be killed together with the
+  poppler, tesseract and OCR pool processes it started;
+* has its address space limited to ``CV_SANDBOX_MEMORY_MB`` (``RLIMIT_AS``,
+  inherited by the processes it starts); running out raises ``MemoryError``
+  in the worker, or kills it;
+* gets ``CV_SANDBOX_CPU_SECONDS`` of CPU time per CV (``RLIMIT_CPU``, raised
+  before each CV by what the worker has used so far); the kernel kills a
+  worker that goes over;
+* is killed when a CV takes longer than ``CV_SANDBOX_TIMEOUT`` seconds of
+  wall-clock time;
+* is replaced after ``CV_SANDBOX_MAX_TASKS`` CVs, and after any of the above.
+
+A CV that hits a limit raises ``CVSandboxError`` with what happened; the
+calling process carries on. Workers are forked, so they start with the
+settings and modules already loaded, and drop the database connections they
+inherit.
+"""
+import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import resource
+import signal
+import tempfile
+import threading
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# How often an idle worker checks that the process that started it is still there
+PARENT_CHECK_SECONDS = 5
+
+
+class CVSandboxError(Exception):
+    """A CV could not be extracted within the sandbox limits."""
+
+
+class CVSandboxTimeout(CVSandboxError):
+    pass
+
+
+class CVSandboxMemoryError(CVSandboxError):
+    pass
+
+
+class CVSandboxCPUError(CVSandboxError):
+    pass
+
+
+class _LocalFile:
+    """A CV on the worker's disk, as open_cv_source expects a stored file."""
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        self.size = os.path.getsize(path)
+
+
+def _set_limits(memory_bytes):
+    os.setpgrp()
+    if memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    # SIGXCPU kills the worker, its default; the parent reports it
+    signal.signal(signal.SIGXCPU, signal.SIG_DFL)
+    # The parent handles Ctrl+C and stops the workers itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _allow_cpu_seconds(seconds):
+    """Let this process use ``seconds`` more CPU time from now on."""
+    if not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    soft = used + int(seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_bytes):
+    """Extract the CVs sent over ``conn`` until it closes."""
+    # Connections inherited from the parent are dropped, not closed: closing
+    # would end the parent's session. The worker opens its own when needed.
+    for connection in connections.all(initialized_only=True):
+        connection.connection = None
+    _set_limits(memory_bytes)
+    from .cv_processing_logic import extract_cv_information
+    parent_pid = os.getppid()
+
+    while True:
+        try:
+            # Workers forked later hold copies of this pipe, so it may never
+            # close when the parent is killed; its pid changing tells instead
+            if not conn.poll(PARENT_CHECK_SECONDS):
+                if os.getppid() != parent_pid:
+                    return
+                continue
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        kind, payload, name, use_cache, sections, cpu_seconds = request
+        _allow_cpu_seconds(cpu_seconds)
+        cv_file = _LocalFile(payload, name) if kind == 'path' else ContentFile(payload, name=name)
+        metrics = {}
+        try:
+            result = ('ok', extract_cv_information(cv_file, use_cache, metrics, sections), metrics)
+        except MemoryError:
+            result = ('memory', None, metrics)
+        except Exception as e:
+            result = ('error', f"{type(e).__name__}: {e}", metrics)
+        try:
+            conn.send(result)
+        except MemoryError:
+            conn.send(('memory', None, {}))
+        if result[0] == 'memory':
+            # Whatever was half-built when memory ran out is not worth keeping
+            return
+
+
+class _Worker:
+    def __init__(self, context, memory_bytes):
+        self.conn, child_conn = context.Pipe()
+        # Not daemonic: OCR starts a process pool of its own, which daemonic
+        # processes may not do. kill() and stop() end the worker instead, and
+        # it exits by itself when its parent dies (see _worker_main)
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_bytes), daemon=False)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def kill(self):
+        """Kill the worker and every process it started."""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            self.process.kill()
+        except (ProcessLookupError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+
+class SandboxPool:
+    """
+    Reused worker processes extracting one CV at a time each.
+
+    Args:
+        workers (int): Workers at most, CV_SANDBOX_WORKERS by default
+        memory_mb (int): Address space of each worker, CV_SANDBOX_MEMORY_MB by default; 0 for no limit
+        cpu_seconds (int): CPU time per CV, CV_SANDBOX_CPU_SECONDS by default; 0 for no limit
+        timeout (float): Wall-clock seconds per CV, CV_SANDBOX_TIMEOUT by default
+        max_tasks (int): CVs a worker extracts before it is replaced, CV_SANDBOX_MAX_TASKS by default
+    """
+
+    def __init__(self, workers=None, memory_mb=None, cpu_seconds=None, timeout=None, max_tasks=None):
+        self.workers = workers or settings.CV_SANDBOX_WORKERS
+        memory_mb = settings.CV_SANDBOX_MEMORY_MB if memory_mb is None else memory_mb
+        self.memory_bytes = memory_mb * 2 ** 20
+        self.cpu_seconds = settings.CV_SANDBOX_CPU_SECONDS if cpu_seconds is None else cpu_seconds
+        self.timeout = timeout or settings.CV_SANDBOX_TIMEOUT
+        self.max_tasks = max_tasks or settings.CV_SANDBOX_MAX_TASKS
+        self.context = multiprocessing.get_context('fork')
+        self.pid = os.getpid()
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers)
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+                worker.stop()
+        return _Worker(self.context, self.memory_bytes)
+
+    def _checkin(self, worker):
+        if worker.tasks >= self.max_tasks or not worker.alive():
+            worker.stop()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def run(self, kind, payload, name, use_cache=True, sections=None):
+        """
+        Extract one CV in a worker.
+
+        Args:
+            kind (str): 'path' if payload is the path of the CV, 'bytes' if it is its contents
+            payload (str or bytes): The CV
+            name (str): File name of the CV, for its extension
+            use_cache (bool): Passed on to extract_cv_information
+            sections (tuple): Passed on to extract_cv_information
+
+        Returns:
+            tuple: (extracted data, metrics)
+
+        Raises:
+            CVSandboxError: The CV went over a limit or crashed the worker
+        """
+        with self._slots:
+            worker = self._checkout()
+            worker.tasks += 1
+            try:
+                worker.conn.send((kind, payload, name, use_cache, sections, self.cpu_seconds))
+                if not worker.conn.poll(self.timeout):
+                    worker.kill()
+                    raise CVSandboxTimeout(f"CV extraction took longer than {self.timeout:g} s and was stopped")
+                status, result, metrics = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.kill()
+                error = self._died(worker.process.exitcode)
+                logger.warning(f"Sandboxed extraction of CV {name} failed: {error}")
+                raise error
+            except CVSandboxTimeout as e:
+                logger.warning(f"Sandboxed extraction of CV {name} failed: {e}")
+                raise
+            except BaseException:
+                worker.kill()
+                raise
+            if status == 'memory':
+                # The worker exits after running out of memory
+                worker.stop()
+            else:
+                self._checkin(worker)
+
+        if status == 'memory':
+            error = CVSandboxMemoryError(
+                f"CV extraction ran out of its {self.memory_bytes // 2 ** 20} MB memory limit and was stopped"
+            )
+            logger.warning(f"Sandboxed extraction of CV {name} failed: {error}")
+            raise error
+        if status == 'error':
+            raise CVSandboxError(f"CV extraction failed: {result}")
+        return result, metrics
+
+    def _died(self, exitcode):
+        if exitcode == -signal.SIGXCPU:
+            return CVSandboxCPUError(f"CV extraction used more than {self.cpu_seconds} s of CPU time and was stopped")
+        if exitcode in (-signal.SIGKILL, -signal.SIGSEGV, -signal.SIGABRT, -signal.SIGBUS) and self.memory_bytes:
+            # Allocation failures in C code abort, or get the worker killed
+            return CVSandboxMemoryError(
+                f"CV extraction process died (exit code {exitcode}), most likely out of its "
+                f"{self.memory_bytes // 2 ** 20} MB memory limit"
+            )
+        return CVSandboxError(f"CV extraction process died (exit code {exitcode})")
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The pool of this process, started on first use; a forked process gets its own."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = SandboxPool()
+            # Closed when this process exits, before multiprocessing waits for
+            # its non-daemonic children: atexit handlers do not run in
+            # processes started by multiprocessing, and would run too late
+            multiprocessing.util.Finalize(None, _close_pool, exitpriority=10)
+        return _pool
+
+
+def _close_pool():
+    if _pool is not None and _pool.pid == os.getpid():
+        _pool.close()
+
+
+def extract_cv_information_sandboxed(cv_file, use_cache=True, metrics=None, sections=None, pool=None):
+    """
+    extract_cv_information in a sandboxed worker; takes the same arguments.
+
+    The CV is handed over by path when it is on local disk, as its contents
+    when it is small, and by the path of a temporary copy otherwise.
+
+    Raises:
+        CVSandboxError: The CV went over the memory, CPU or time limit, or
+            crashed the worker; the message says which
+        ValueError: sections names an unknown section
+    """
+    from .cv_processing_logic import CV_IN_MEMORY_MAX_BYTES, _local_path, parse_sections
+
+    # Checked here, so a bad choice is not reported as a failed extraction
+    sections = parse_sections(sections)
+    pool = pool or get_pool()
+    path = _local_path(cv_file)
+    if path:
+        result, worker_metrics = pool.run('path', path, cv_file.name, use_cache, sections)
+    elif cv_file.size is not None and cv_file.size <= CV_IN_MEMORY_MAX_BYTES:
+        result, worker_metrics = pool.run('bytes', b''.join(cv_file.chunks()), cv_file.name, use_cache, sections)
+    else:
+        with tempfile.NamedTemporaryFile(suffix=os.path.splitext(cv_file.name)[1]) as temp_file:
+            for chunk in cv_file.chunks():
+                temp_file.write(chunk)
+            temp_file.flush()
+            result, worker_metrics = pool.run('path', temp_file.name, cv_file.name, use_cache, sections)
+    if metrics is not None:
+        metrics.update(worker_metrics)
+    return result
@@ -0,0 +1,128 @@
+r"""
+Section segmentation shared by the CV extractors.
+
+The section-based extractors each used to look for their headers with their own
+``re.finditer`` loops, and found the end of every section with
+``list(re.finditer(pattern, text[section_start:]))``: a copy of the rest of the
+text and a scan of all of it for every header they matched.
+
+``CVSections`` is built once per CV and handed to every extractor. Header
+matches are found once per pattern and shared. Section ends are searched in the
+text itself, stop at the first boundary, and are remembered: every boundary
+pattern starts with ``\n``, so once the next boundary after a position is known,
+any later lookup from between the two is a bisect, with exactly the result the
+slice scan gave. Each extractor keeps its own set of boundaries (named in
+``BOUNDARIES``) so its sections are unchanged.
+"""
+import re
+from bisect import bisect_left, bisect_right
+
+# Patterns that end a section, by name. Each one must start with '\n'. Only
+# where they start is used: the caps patterns check what follows in a lazy
+# lookahead that stops at the first line end, where a greedy [A-Z\s]{n,} ran
+# over every following caps line and backtracked from there.
+BOUNDARIES = {
+    'caps_line': (r'\n\s*[A-Z](?=[A-Z\s]{4}[A-Z\s]*?(?::|$|\n))', re.IGNORECASE),
+    'title_and_title': (r'\n\s*[A-Z][a-z]+\s*&\s*[A-Z][a-z]+\s*(?::|$|\n)', re.IGNORECASE),
+    'caps_block': (r'\n(?=[A-Z\s]{5}[A-Z\s]*?\n)', 0),
+    'after_experience': (
+        r'\n\s*(?:EDUCATION|QUALIFICATIONS|SKILLS|CERTIFICATIONS|TRAINING|ACHIEVEMENTS|PROJECTS|LANGUAGES|REFERENCES)',
+        re.IGNORECASE
+    ),
+    'after_education': (
+        r'\n\s*(?:EXPERIENCE|EMPLOYMENT|SKILLS|PROFESSIONAL|CERTIFICATIONS|TRAINING|ACHIEVEMENTS|PROJECTS|LANGUAGES|REFERENCES)',
+        re.IGNORECASE
+    ),
+    'after_licenses': (
+        r'\n\s*(?:EDUCATION|EXPERIENCE|EMPLOYMENT|SKILLS|PROFESSIONAL|TRAINING|PROJECTS|LANGUAGES|REFERENCES)',
+        re.IGNORECASE
+    ),
+    'after_skills': (
+        r'\n\s*(?:EDUCATION|EXPERIENCE|EMPLOYMENT|LICENSES|CERTIFICATIONS|TRAINING|PROJECTS|LANGUAGES|REFERENCES)',
+        re.IGNORECASE
+    ),
+}
+_BOUNDARY_RES = {name: re.compile(pattern, flags) for name, (pattern, flags) in BOUNDARIES.items()}
+
+# Stretches of the CV that belong to work experience; education and license
+# headers found inside them are job details, not sections of their own.
+# FLIGHT EXPERIENCE is a section of its own, not the start of one of them.
+EMPLOYMENT_SPAN_PATTERNS = [
+    r'(?<!FLIGHT )(?<!FLYING )(?:EXPERIENCE|WORK HISTORY|EMPLOYMENT|PROFESSIONAL BACKGROUND|JOB HISTORY|CAREER HISTORY|WORK EXPERIENCE)(?:\s*:)?(.*?)(?:EDUCATION|SKILLS|CERTIFICATIONS|ACHIEVEMENTS|\Z)',
+    r'(?<!Flight )(?<!Flying )(?:Experience|Work History|Employment|Professional Background|Job History|Career History|Work Experience)(?:\s*:)?(.*?)(?:Education|Skills|Certifications|Achievements|\Z)'
+]
+
+
+class CVSections:
+    """Section headers and boundaries of one CV text, found once and shared by the extractors."""
+
+    def __init__(self, text):
+        self.text = text
+        # Per boundary: sorted starts found so far, and for each the lowest
+        # position already known to have it as its next boundary
+        self._boundary_starts = {name: [] for name in _BOUNDARY_RES}
+        self._searched_from = {name: [] for name in _BOUNDARY_RES}
+        self._matches = {}
+        self._employment_spans = None
+        self._span_reach = None
+
+    def find_all(self, pattern, flags=re.IGNORECASE):
+        """All matches of ``pattern`` in the text; computed once per pattern and shared."""
+        key = (pattern, flags)
+        if key not in self._matches:
+            self._matches[key] = list(re.finditer(pattern, self.text, flags))
+        return self._matches[key]
+
+    def section_end(self, section_start, boundaries):
+        """
+        Position of the first boundary at or after ``section_start``.
+
+        Args:
+            section_start (int): Offset just after a section header
+            boundaries (list): Names from BOUNDARIES that end this kind of section
+
+        Returns:
+            int: Offset of the next boundary, or len(text) if there is none
+        """
+        return min(self._next_boundary(name, section_start) for name in boundaries)
+
+    def _next_boundary(self, name, position):
+        starts = self._boundary_starts[name]
+        searched_from = self._searched_from[name]
+        index = bisect_left(starts, position)
+        if index < len(starts) and searched_from[index] <= position:
+            return starts[index]
+
+        # Nothing known between position and the next recorded start: search
+        # that stretch once, stopping at the first boundary
+        match = _BOUNDARY_RES[name].search(self.text, position)
+        start = match.start() if match else len(self.text)
+        if index < len(starts) and starts[index] == start:
+            searched_from[index] = position
+        else:
+            starts.insert(index, start)
+            searched_from.insert(index, position)
+        return start
+
+    def employment_spans(self):
+        """(start, end, text) of every stretch of work experience."""
+        if self._employment_spans is None:
+            self._employment_spans = []
+            for pattern in EMPLOYMENT_SPAN_PATTERNS:
+                for match in re.finditer(pattern, self.text, re.DOTALL | re.IGNORECASE):
+                    self._employment_spans.append((match.start(1), match.end(1), match.group(1)))
+        return self._employment_spans
+
+    def in_employment_span(self, start_pos, end_pos):
+        # Spans sorted by start, with the furthest end reached by any span
+        # starting at or before each one: one bisect per check
+        if self._span_reach is None:
+            spans = sorted(self.employment_spans())
+            reach, furthest = [], -1
+            for _, emp_end, _ in spans:
+                furthest = max(furthest, emp_end)
+                reach.append(furthest)
+            self._span_reach = ([emp_start for emp_start, _, _ in spans], reach)
+        starts, reach = self._span_reach
+        index = bisect_right(starts, start_pos) - 1
+        return index >= 0 and reach[index] >= end_pos
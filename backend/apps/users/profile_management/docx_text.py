@@ -0,0 +1,135 @@
+"""
+Streaming text extraction from DOCX files.
+
+python-docx builds an object model of the whole document, and its
+``Document.paragraphs`` leaves out tables, where many CVs keep their employment
+history and licences, and headers, where they keep their contact details.
+
+``stream_docx_lines`` reads the parts of the zip directly with ``iterparse``:
+the headers, ``word/document.xml``, then the footers. Paragraphs, table cells
+and text boxes come out in document order, and each top-level element is
+dropped once its text is out, so memory does not grow with the document.
+
+Table rows whose cells each hold one line come out as one line, the cells
+joined with a tab as Word's own table-to-text conversion does; the
+extractors read a "Total hours" cell next to a "3727" cell as they read
+"Total hours 3727". The lines of other rows come out cell by cell. Text box
+content is read once: the fallback copy Word writes for older readers
+(``mc:Fallback``) is skipped, as are deleted revisions and field codes.
+"""
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+CELL_SEPARATOR = '\t'
+_HEADER_PART_RE = re.compile(r'word/header(\d*)\.xml$')
+_FOOTER_PART_RE = re.compile(r'word/footer(\d*)\.xml$')
+
+# Run content read as text, and what it stands for
+_TEXT_TAGS = {W + 't'}
+_CHARACTER_TAGS = {W + 'tab': '\t', W + 'br': '\n', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+
+def _numbered_parts(names, pattern):
+    parts = [(match.group(1), name) for name in names for match in [pattern.match(name)] if match]
+    return [name for _, name in sorted(parts, key=lambda part: int(part[0] or 0))]
+
+
+def _part_lines(stream):
+    """Lines of one WordprocessingML part, in document order."""
+    paragraphs = []  # text pieces of each open paragraph; text boxes nest them
+    cells = []       # lines of each open table cell
+    rows = []        # cells of each open table row
+    skip_depth = 0
+    parents = []
+
+    for event, element in iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if skip_depth or tag == MC_FALLBACK:
+                skip_depth += 1
+            elif tag == W + 'p':
+                paragraphs.append([])
+            elif tag == W + 'tr':
+                rows.append([])
+            elif tag == W + 'tc':
+                cells.append([])
+            parents.append(element)
+            continue
+
+        parents.pop()
+        if skip_depth:
+            skip_depth -= 1
+        elif tag in _TEXT_TAGS:
+            if paragraphs and element.text:
+                paragraphs[-1].append(element.text)
+        elif tag in _CHARACTER_TAGS:
+            if paragraphs:
+                paragraphs[-1].append(_CHARACTER_TAGS[tag])
+        elif tag == W + 'p':
+            # A paragraph of a text box ends inside the paragraph anchoring the
+            # box, and comes out before the rest of that one
+            lines = ''.join(paragraphs.pop()).split('\n')
+            if cells:
+                cells[-1].extend(lines)
+            else:
+                yield from lines
+        elif tag == W + 'tc':
+            cell = cells.pop()
+            if rows:
+                rows[-1].append(cell)
+        elif tag == W + 'tr':
+            row = [cell for cell in rows.pop() if any(line.strip() for line in cell)]
+            if all(len(cell) == 1 for cell in row):
+                lines = [CELL_SEPARATOR.join(cell[0].strip() for cell in row)] if row else []
+            else:
+                lines = [line for cell in row for line in cell]
+            # A table nested in a cell belongs to that cell
+            if cells:
+                cells[-1].extend(lines)
+            else:
+                yield from lines
+
+        # Outside any paragraph or table, or at the end of a table row, the
+        # siblings before this element and the element itself have all been
+        # read: drop them
+        if parents and (tag == W + 'tr' or not (paragraphs or cells or rows or skip_depth)):
+            parents[-1].clear()
+
+
+def stream_docx_lines(source):
+    """
+    Text lines of a DOCX file: headers, body, then footers, tables included.
+
+    Args:
+        source (str or file): Path of the DOCX, or a binary file object
+
+    Yields:
+        str: One line of text per paragraph, table row or line break
+
+    Raises:
+        zipfile.BadZipFile, KeyError, xml.etree.ElementTree.ParseError: The file is not a readable DOCX
+    """
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        seen = set()
+        for name in _numbered_parts(names, _HEADER_PART_RE):
+            # First page, even page and default headers often repeat each other
+            with archive.open(name) as part:
+                lines = [line for line in _part_lines(part) if line.strip()]
+            if lines and tuple(lines) not in seen:
+                seen.add(tuple(lines))
+                yield from lines
+
+        with archive.open('word/document.xml') as part:
+            yield from _part_lines(part)
+
+        for name in _numbered_parts(names, _FOOTER_PART_RE):
+            with archive.open(name) as part:
+                lines = [line for line in _part_lines(part) if line.strip()]
+            if lines and tuple(lines) not in seen:
+                seen.add(tuple(lines))
+                yield from lines
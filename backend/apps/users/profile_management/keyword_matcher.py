@@ -0,0 +1,101 @@
+r"""
+Single-pass keyword scanning for CV text.
+
+Scanning for each keyword with its own ``re.findall(r'\b' + keyword + r'\b')``
+walks the whole CV once per keyword. ``KeywordMatcher`` compiles every keyword
+of every family into one case-insensitive regex shaped like a trie (shared
+prefixes are matched once), finds every position where some keyword starts in
+a single pass, and then confirms which keywords match there.
+
+Hits are reported exactly like the per-keyword scans: whole-word,
+case-insensitive, non-overlapping per keyword, while different keywords may
+overlap (e.g. "Flight Hours" inside "Total flight hours").
+"""
+import re
+
+
+def _trie_pattern(keywords):
+    """Build a regex alternation for ``keywords`` with common prefixes factored out."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordHits:
+    """Keyword occurrences found in one text, ordered by position."""
+
+    def __init__(self, hits):
+        # (start, end, keyword) tuples
+        self.hits = hits
+        self._by_keyword = {}
+        for start, end, keyword in hits:
+            self._by_keyword.setdefault(keyword.lower(), []).append((start, end))
+
+    def count(self, keyword):
+        """Number of non-overlapping occurrences of ``keyword``."""
+        return len(self._by_keyword.get(keyword.lower(), ()))
+
+    def count_all(self, keywords):
+        """Total occurrences of ``keywords``; duplicated entries are counted each time."""
+        return sum(self.count(keyword) for keyword in keywords)
+
+    def contains(self, keyword):
+        return keyword.lower() in self._by_keyword
+
+    def first(self, keyword):
+        """(start, end) of the first occurrence of ``keyword``, or None."""
+        spans = self._by_keyword.get(keyword.lower())
+        return spans[0] if spans else None
+
+
+class KeywordMatcher:
+    """Finds all keywords of several families in one pass over a text."""
+
+    def __init__(self, families):
+        """
+        Args:
+            families (dict): Family name -> list of keywords
+        """
+        self.families = {name: list(keywords) for name, keywords in families.items()}
+        keywords = list(dict.fromkeys(
+            keyword.lower() for family in self.families.values() for keyword in family
+        ))
+
+        self._scanner = re.compile(r'\b(?=' + _trie_pattern(keywords) + r'\b)', re.IGNORECASE)
+        # Keywords that can start at a position, bucketed by their first character
+        self._candidates = {}
+        for keyword in keywords:
+            pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
+            self._candidates.setdefault(keyword[0], []).append((keyword, pattern))
+
+    def scan(self, text):
+        """
+        Find every keyword occurrence in ``text``.
+
+        Returns:
+            KeywordHits: All hits, usable by every extractor that needs them
+        """
+        hits = []
+        last_end = {}
+        for match in self._scanner.finditer(text):
+            position = match.start()
+            for keyword, pattern in self._candidates.get(text[position].lower(), ()):
+                if position < last_end.get(keyword, 0):
+                    continue
+                keyword_match = pattern.match(text, position)
+                if keyword_match:
+                    last_end[keyword] = keyword_match.end()
+                    hits.append((position, keyword_match.end(), keyword))
+        return KeywordHits(hits)
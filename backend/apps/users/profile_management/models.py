@@ -1,4 +1,8 @@
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
@@ -761,3 +765,141 @@ class UserVerificationStatus(models.Model):
                   self.identity_verified, self.licenses_verified]
         verified_count = sum(1 for field in fields if field)
         return (verified_count / len(fields)) * 100 if fields else 0
+
+
+class CVProcessingJob(models.Model):
+    """Queued CV extraction for a professional, processed by the process_cv_queue workers."""
+    STATUS_CHOICES = [
+        ('queued', _('Queued')),
+        ('processing', _('Processing')),
+        ('completed', _('Completed')),
+        ('partial', _('Partially Completed')),
+        ('failed', _('Failed')),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='cv_processing_jobs')
+    cv = models.FileField(upload_to='professional_documents/cvs/', max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    stage = models.CharField(max_length=50, blank=True, default='')
+    progress = models.PositiveSmallIntegerField(default=0, help_text=_('Progress in percent'))
+    attempts = models.PositiveSmallIntegerField(default=0)
+    result = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder, help_text=_('Extracted CV information'))
+    error = models.TextField(blank=True, default='')
+    metrics = models.JSONField(blank=True, null=True, help_text=_('Stage timings of the extraction'))
+    sections = models.JSONField(default=list, blank=True, help_text=_('CV sections to extract; all when empty'))
+    worker = models.CharField(max_length=100, blank=True, default='', help_text=_('Worker that claimed the job'))
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.email} - CV job {self.id} ({self.status})"
+
+    class Meta:
+        verbose_name = _('CV Processing Job')
+        verbose_name_plural = _('CV Processing Jobs')
+        ordering = ['-created_at']
+        indexes = [
+            # Workers claim the oldest queued job
+            models.Index(fields=['status', 'created_at'], name='cvjob_status_created_idx'),
+        ]
+
+
+class CVExtractionCache(models.Model):
+    """
+    Cached CV extraction, keyed by the SHA-256 of the file bytes.
+
+    The raw text is reused while text_version matches; the structured result
+    only while parser_version matches, otherwise it is rebuilt from the text.
+    """
+    content_hash = models.CharField(max_length=64, primary_key=True)
+    file_extension = models.CharField(max_length=10, blank=True, default='')
+    text = models.TextField(blank=True, default='')
+    text_version = models.CharField(max_length=20)
+    result = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    parser_version = models.CharField(max_length=20, blank=True, default='')
+    size = models.PositiveIntegerField(default=0, help_text=_('Bytes of cached text and result'))
+    text_hits = models.PositiveIntegerField(default=0)
+    result_hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.file_extension}, parser {self.parser_version or '-'})"
+
+    class Meta:
+        verbose_name = _('CV Extraction Cache Entry')
+        verbose_name_plural = _('CV Extraction Cache')
+        indexes = [
+            # Eviction removes the least recently used entries first
+            models.Index(fields=['last_used_at'], name='cvcache_last_used_idx'),
+        ]
+
+
+class CVExtractionCacheStats(models.Model):
+    """Daily CV extraction cache hits and misses per layer."""
+    day = models.DateField(unique=True)
+    text_hits = models.PositiveIntegerField(default=0)
+    text_misses = models.PositiveIntegerField(default=0)
+    result_hits = models.PositiveIntegerField(default=0)
+    result_misses = models.PositiveIntegerField(default=0)
+    page_hits = models.PositiveIntegerField(default=0)
+    page_misses = models.PositiveIntegerField(default=0)
+    evictions = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"CV cache stats {self.day}"
+
+    class Meta:
+        verbose_name = _('CV Extraction Cache Stats')
+        verbose_name_plural = _('CV Extraction Cache Stats')
+        ordering = ['-day']
+
+
+class CVPageOCRCache(models.Model):
+    """
+    OCR text of one scanned PDF page, keyed by the SHA-256 of the page content.
+
+    A CV re-exported with a new cover page, or one page of it rescanned, only
+    needs the changed pages OCRed again.
+    """
+    page_hash = models.CharField(max_length=64, primary_key=True)
+    text = models.TextField(blank=True, default='')
+    ocr_version = models.CharField(max_length=20)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.page_hash[:12]} (OCR {self.ocr_version})"
+
+    class Meta:
+        verbose_name = _('CV Page OCR Cache Entry')
+        verbose_name_plural = _('CV Page OCR Cache')
+        indexes = [
+            models.Index(fields=['last_used_at'], name='cvpagecache_last_used_idx'),
+        ]
+
+
+class CVExtractionMetrics(models.Model):
+    """Stage durations and counts of one CV extraction (see cv_metrics)."""
+    created_at = models.DateTimeField(auto_now_add=True)
+    file_extension = models.CharField(max_length=10, blank=True, default='')
+    total_seconds = models.FloatField()
+    text_length = models.PositiveIntegerField(default=0)
+    page_count = models.PositiveIntegerField(default=0)
+    ocr_pages = models.PositiveIntegerField(default=0)
+    cache = models.CharField(max_length=10, blank=True, default='', help_text=_('Cache layer that served the CV, if any'))
+    stages = models.JSONField(default=dict, help_text=_('Seconds by stage'))
+
+    def __str__(self):
+        return f"CV extraction {self.created_at:%Y-%m-%d %H:%M:%S} ({self.file_extension}, {self.total_seconds * 1000:.0f} ms)"
+
+    class Meta:
+        verbose_name = _('CV Extraction Metrics')
+        verbose_name_plural = _('CV Extraction Metrics')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='cvmetrics_created_idx'),
+        ]
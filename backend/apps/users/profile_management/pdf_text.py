@@ -0,0 +1,330 @@
+"""
+Pluggable readers for the text layer of PDF CVs.
+
+PyPDF2 is slow on large PDFs and garbles the text of some fonts: words run
+together, characters come out as ``(cid:12)`` or replacement characters, or a
+page with text comes out nearly empty and is sent to OCR. Other parsers get
+those PDFs right, and are faster, when they are installed:
+
+* ``pymupdf``: PyMuPDF (``fitz``), the fastest;
+* ``pdftotext``: the poppler command line tool, installed with the
+  poppler-utils that pdf2image needs for OCR;
+* ``pypdf2``: always available;
+* ``pdfminer``: pdfminer.six, slow but careful with unusual encodings.
+
+``PdfText`` picks a backend per document: the available ones are tried on the
+first page in ``CV_PDF_BACKENDS`` order, and the first whose text scores at
+least ``CV_PDF_MIN_TEXT_QUALITY`` on ``text_quality`` reads the whole
+document; the others are not tried. If none does, the best scoring one is
+used. A page that still comes out with too little text is tried with the other
+backends before it is left to OCR, again stopping at the first with enough. A
+page with no text at all has no text layer, as the scanned pages of a CV: it is
+left to OCR without trying the other backends.
+"""
+import abc
+import io
+import logging
+import re
+import shutil
+import subprocess
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Characters that only appear in text a parser failed to decode
+_GARBAGE_RE = re.compile(r'\(cid:\d+\)|�|[\x00-\x08\x0b\x0e-\x1f]')
+_TOKEN_RE = re.compile(r'\S+')
+# Words run together: a lower-case word followed by a capitalised one, as in "OfficeratAcme"
+_GLUED_RE = re.compile(r'[a-z]{3}[A-Z][a-z]{3}')
+# Longer tokens are words run together, unless they are addresses
+MAX_WORD_LENGTH = 20
+_PUNCTUATION = '()[]{}<>.,:;!?"\'*•-–—&/'
+
+
+def _is_word(token):
+    token = token.strip(_PUNCTUATION)
+    if '@' in token or '://' in token:
+        return True
+    return len(token) <= MAX_WORD_LENGTH and not _GLUED_RE.search(token)
+
+
+def _is_bytes(source):
+    return isinstance(source, (bytes, bytearray))
+
+
+def text_quality(text):
+    """
+    How much ``text`` looks like decoded prose, between 0 and 1.
+
+    The share of characters that are not decoding debris, times the share of
+    tokens that are not words run together: text whose spaces were lost, or
+    that came out as glyph codes, scores low.
+    """
+    if not text or not text.strip():
+        return 0.0
+    garbage = sum(len(match) for match in _GARBAGE_RE.findall(text))
+    clean_share = 1 - garbage / len(text)
+    tokens = _TOKEN_RE.findall(text)
+    word_share = sum(1 for token in tokens if _is_word(token)) / len(tokens)
+    return clean_share * word_share
+
+
+class PdfTextBackend(abc.ABC):
+    """Text of the pages of one PDF; subclasses wrap one parser each."""
+    name = None
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def __init__(self, source):
+        self.source = source
+
+    @abc.abstractmethod
+    def page_count(self):
+        pass
+
+    @abc.abstractmethod
+    def page_text(self, index):
+        """Text of page ``index``, counted from 0."""
+
+    def close(self):
+        pass
+
+
+class PyPDF2Backend(PdfTextBackend):
+    name = 'pypdf2'
+
+    def __init__(self, source, reader=None):
+        super().__init__(source)
+        import PyPDF2
+        self._file = None
+        if reader is None:
+            self._file = io.BytesIO(source) if _is_bytes(source) else open(source, 'rb')
+            reader = PyPDF2.PdfReader(self._file)
+        self.reader = reader
+
+    def page_count(self):
+        return len(self.reader.pages)
+
+    def page_text(self, index):
+        return self.reader.pages[index].extract_text() or ""
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class PyMuPDFBackend(PdfTextBackend):
+    name = 'pymupdf'
+
+    @classmethod
+    def available(cls):
+        try:
+            import fitz  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def __init__(self, source):
+        super().__init__(source)
+        import fitz
+        self.document = fitz.open(stream=bytes(source), filetype='pdf') if _is_bytes(source) else fitz.open(source)
+
+    def page_count(self):
+        return self.document.page_count
+
+    def page_text(self, index):
+        return self.document[index].get_text()
+
+    def close(self):
+        self.document.close()
+
+
+class PdftotextBackend(PdfTextBackend):
+    name = 'pdftotext'
+
+    @classmethod
+    def available(cls):
+        return shutil.which('pdftotext') is not None
+
+    def __init__(self, source):
+        super().__init__(source)
+        self._page_count = None
+
+    def _run(self, *args):
+        # '-' reads the PDF from stdin and writes the text to stdout
+        path = '-' if _is_bytes(self.source) else self.source
+        completed = subprocess.run(
+            ['pdftotext', '-q', '-enc', 'UTF-8', *args, path, '-'],
+            input=bytes(self.source) if _is_bytes(self.source) else None,
+            capture_output=True, timeout=settings.CV_OCR_PAGE_TIMEOUT, check=True,
+        )
+        return completed.stdout.decode('utf-8', errors='replace')
+
+    def page_count(self):
+        if self._page_count is None:
+            from .cv_ocr import pdf_page_count
+            self._page_count = pdf_page_count(self.source)
+        return self._page_count
+
+    def page_text(self, index):
+        return self._run('-f', str(index + 1), '-l', str(index + 1)).rstrip('\f')
+
+
+class PdfminerBackend(PdfTextBackend):
+    name = 'pdfminer'
+
+    @classmethod
+    def available(cls):
+        try:
+            import pdfminer  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def __init__(self, source):
+        super().__init__(source)
+        self._file = io.BytesIO(source) if _is_bytes(source) else open(source, 'rb')
+        self._page_count = None
+
+    def page_count(self):
+        if self._page_count is None:
+            from pdfminer.pdfpage import PDFPage
+            self._file.seek(0)
+            self._page_count = sum(1 for _ in PDFPage.get_pages(self._file))
+        return self._page_count
+
+    def page_text(self, index):
+        from pdfminer.high_level import extract_text
+        self._file.seek(0)
+        return extract_text(self._file, page_numbers=[index])
+
+    def close(self):
+        self._file.close()
+
+
+BACKENDS = {backend.name: backend for backend in (PyMuPDFBackend, PdftotextBackend, PyPDF2Backend, PdfminerBackend)}
+
+
+def available_backends(names=None):
+    """
+    Installed backends, in preference order.
+
+    Args:
+        names (list): Backend names, CV_PDF_BACKENDS by default; unknown names are ignored
+
+    Returns:
+        list: Backend classes
+    """
+    names = names or settings.CV_PDF_BACKENDS
+    return [BACKENDS[name] for name in names if name in BACKENDS and BACKENDS[name].available()]
+
+
+class PdfText:
+    """
+    Text of one PDF, read with the backend that suits it.
+
+    Args:
+        source (str or bytes): Path of the PDF, or its contents
+        reader (PdfReader): An already open PyPDF2 reader of the same PDF, reused by the pypdf2 backend
+        backends (list): Backend names to choose from, CV_PDF_BACKENDS by default
+        min_quality (float): text_quality a backend needs on the first page to be chosen
+    """
+
+    def __init__(self, source, reader=None, backends=None, min_quality=None):
+        self.source = source
+        self.reader = reader
+        self.candidates = available_backends(backends)
+        self.min_quality = settings.CV_PDF_MIN_TEXT_QUALITY if min_quality is None else min_quality
+        self._open = {}
+        self._first_page = {}
+        self.backend = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for backend in self._open.values():
+            try:
+                backend.close()
+            except Exception:
+                pass
+        self._open = {}
+
+    def _backend(self, backend_class):
+        if backend_class.name not in self._open:
+            if backend_class is PyPDF2Backend:
+                self._open[backend_class.name] = PyPDF2Backend(self.source, reader=self.reader)
+            else:
+                self._open[backend_class.name] = backend_class(self.source)
+        return self._open[backend_class.name]
+
+    def _try(self, backend_class, index):
+        try:
+            return self._backend(backend_class).page_text(index)
+        except MemoryError:
+            raise
+        except Exception as e:
+            logger.warning(f"PDF backend {backend_class.name} failed on page {index + 1}: {str(e)}")
+            return None
+
+    def choose(self):
+        """Pick the backend for this document from its first page; returns its name."""
+        if self.backend is not None:
+            return self.backend.name
+        best, best_quality = None, -1.0
+        for backend_class in self.candidates:
+            text = self._try(backend_class, 0)
+            if text is None:
+                continue
+            self._first_page[backend_class.name] = text
+            quality = text_quality(text)
+            if quality > best_quality:
+                best, best_quality = backend_class, quality
+            if quality >= self.min_quality:
+                break
+        self.backend = self._backend(best) if best else None
+        return best.name if best else None
+
+    def page_count(self):
+        self.choose()
+        if self.reader is not None:
+            return len(self.reader.pages)
+        return self.backend.page_count() if self.backend else 0
+
+    def page_text(self, index, min_chars=None):
+        """
+        Text of page ``index``, counted from 0.
+
+        Args:
+            index (int): Page number from 0
+            min_chars (int): If the chosen backend finds fewer characters, but
+                some, the others are tried in turn until one finds that many
+
+        Returns:
+            str: The page text; the longest found when none has min_chars
+        """
+        self.choose()
+        if self.backend is None:
+            return ""
+        text = self._first_page.get(self.backend.name) if index == 0 else None
+        if text is None:
+            text = self._try(type(self.backend), index) or ""
+        # No text at all: a scanned page, which the other backends would not read either
+        if min_chars is None or len(text.strip()) >= min_chars or not text.strip():
+            return text
+
+        for backend_class in self.candidates:
+            if backend_class.name == self.backend.name:
+                continue
+            other = (self._first_page.get(backend_class.name) if index == 0 else None) or self._try(backend_class, index)
+            if other and len(other.strip()) > len(text.strip()) and text_quality(other) >= self.min_quality:
+                text = other
+                if len(text.strip()) >= min_chars:
+                    break
+        return text
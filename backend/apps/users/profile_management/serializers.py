@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.utils.translation import gettext_lazy as _
 import base64
@@ -21,7 +22,8 @@ from .models import (
     RegulatoryBody,
     # OrganizationProfile,
     EmploymentHistory,
-    UploadedFile
+    UploadedFile,
+    CVProcessingJob
 )
 
 User = get_user_model()
@@ -502,6 +504,23 @@ class CVUploadSerializer(serializers.Serializer):
         return value
 
 
+class CVProcessingJobSerializer(serializers.ModelSerializer):
+    """Serializer for the status of a queued CV processing job; stage timings are only shown in DEBUG."""
+    extracted_fields = serializers.JSONField(source='result', read_only=True)
+    
+    class Meta:
+        model = CVProcessingJob
+        fields = ('id', 'status', 'stage', 'progress', 'sections', 'extracted_fields', 'error', 'metrics',
+                  'created_at', 'started_at', 'finished_at')
+        read_only_fields = fields
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        if not settings.DEBUG:
+            fields.pop('metrics')
+        return fields
+
+
 class RecruiterProfileSerializer(serializers.ModelSerializer):
     """Serializer for the recruiter user profile with all related info."""
     email = serializers.EmailField(read_only=True)
@@ -287,6 +287,12 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # CV extraction, its metrics included
+        'apps.users.profile_management': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -295,6 +301,65 @@ logs_dir = BASE_DIR / 'logs'
 if not logs_dir.exists():
     logs_dir.mkdir(parents=True, exist_ok=True)
 
+# Memory-mapped snapshot of active job features shared by all gunicorn workers
+JOB_FEATURE_SNAPSHOT_PATH = os.getenv(
+    "JOB_FEATURE_SNAPSHOT_PATH", str(BASE_DIR / "snapshots" / "active_jobs.snapshot")
+)
+# Posting changes are gathered for this long and then rebuild the snapshot once, in the background
+JOB_FEATURE_SNAPSHOT_REBUILD_SECONDS = float(os.getenv("JOB_FEATURE_SNAPSHOT_REBUILD_SECONDS", 30))
+
+# Job posting views are buffered per process and written in batches (0 writes every view at once)
+JOB_VIEW_BUFFER_SIZE = int(os.getenv("JOB_VIEW_BUFFER_SIZE", 500))
+JOB_VIEW_FLUSH_SECONDS = float(os.getenv("JOB_VIEW_FLUSH_SECONDS", 5))
+
+# Content-addressed cache of CV extraction (raw text and structured result)
+CV_CACHE_ENABLED = os.getenv("CV_CACHE_ENABLED", "True") == "True"
+CV_CACHE_MAX_ENTRIES = int(os.getenv("CV_CACHE_MAX_ENTRIES", 5000))
+CV_CACHE_MAX_BYTES = int(os.getenv("CV_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+CV_CACHE_MAX_ENTRY_BYTES = int(os.getenv("CV_CACHE_MAX_ENTRY_BYTES", 2 * 1024 * 1024))
+CV_CACHE_MAX_PAGE_ENTRIES = int(os.getenv("CV_CACHE_MAX_PAGE_ENTRIES", 20000))
+
+# Page-parallel OCR of scanned PDF CVs
+CV_OCR_WORKERS = int(os.getenv("CV_OCR_WORKERS", min(4, os.cpu_count() or 1)))
+CV_OCR_MAX_PAGES = int(os.getenv("CV_OCR_MAX_PAGES", 10))
+CV_OCR_PAGE_TIMEOUT = int(os.getenv("CV_OCR_PAGE_TIMEOUT", 30))
+CV_OCR_DEADLINE = int(os.getenv("CV_OCR_DEADLINE", 120))
+# Peak memory allowed for the pages being OCRed at once; DPI is lowered down to
+# CV_OCR_MIN_DPI to stay within it, then fewer pages run at once, then OCR stops
+CV_OCR_MEMORY_BUDGET_MB = int(os.getenv("CV_OCR_MEMORY_BUDGET_MB", 512))
+CV_OCR_MIN_DPI = int(os.getenv("CV_OCR_MIN_DPI", 150))
+# Image preprocessing before OCR: "fast" or "accurate" (see ocr_preprocessing.OCR_PRESETS)
+CV_OCR_PRESET = os.getenv("CV_OCR_PRESET", "accurate")
+# PDF pages whose text layer has fewer characters than this are OCRed
+CV_OCR_PAGE_MIN_CHARS = int(os.getenv("CV_OCR_PAGE_MIN_CHARS", 50))
+
+# PDF text layer parsers, in order of preference; those not installed are
+# skipped (see apps.users.profile_management.pdf_text)
+CV_PDF_BACKENDS = [
+    name.strip() for name in os.getenv("CV_PDF_BACKENDS", "pymupdf,pdftotext,pypdf2,pdfminer").split(",") if name.strip()
+]
+# text_quality of its first page at which a backend is used for the whole PDF
+CV_PDF_MIN_TEXT_QUALITY = float(os.getenv("CV_PDF_MIN_TEXT_QUALITY", 0.85))
+
+# Seconds the field extractors may spend on one CV's text before giving up
+# with what they have; 0 for no limit
+CV_EXTRACTION_DEADLINE = float(os.getenv("CV_EXTRACTION_DEADLINE", 20))
+
+# CV extraction runs in a pool of worker processes with these limits per CV
+# (see apps.users.profile_management.cv_sandbox); memory and CPU 0 for no limit
+CV_SANDBOX_ENABLED = os.getenv("CV_SANDBOX_ENABLED", "True") == "True"
+CV_SANDBOX_WORKERS = int(os.getenv("CV_SANDBOX_WORKERS", 2))
+CV_SANDBOX_MEMORY_MB = int(os.getenv("CV_SANDBOX_MEMORY_MB", 1024))
+CV_SANDBOX_CPU_SECONDS = int(os.getenv("CV_SANDBOX_CPU_SECONDS", 60))
+CV_SANDBOX_TIMEOUT = float(os.getenv("CV_SANDBOX_TIMEOUT", 180))
+CV_SANDBOX_MAX_TASKS = int(os.getenv("CV_SANDBOX_MAX_TASKS", 100))
+
+# Per-stage timing of CV extraction, logged and kept for the metrics endpoint
+CV_METRICS_ENABLED = os.getenv("CV_METRICS_ENABLED", "True") == "True"
+CV_METRICS_RETENTION_DAYS = int(os.getenv("CV_METRICS_RETENTION_DAYS", 14))
+# About one extraction in this many deletes the expired metrics; 0 leaves it to the prune_cv_metrics command
+CV_METRICS_PRUNE_EVERY = int(os.getenv("CV_METRICS_PRUNE_EVERY", 100))
+
 # Swagger Settings
 SWAGGER_SETTINGS = {
     "SECURITY_DEFINITIONS": {
@@ -22,4 +22,13 @@ proc_name = "winguport-backend"
 # Server mechanics
 preload_app = True
 max_requests = 1000
-max_requests_jitter = 50
\ No newline at end of file
+max_requests_jitter = 50
+
+def when_ready(server):
+    """Build the shared active jobs snapshot before workers are forked."""
+    from django.db import connections
+    from apps.jobs_search.Job_matching.feature_snapshot import rebuild_active_jobs_snapshot
+
+    rebuild_active_jobs_snapshot()
+    # Workers must not inherit the master's database connection
+    connections.close_all()